@@ -0,0 +1,40 @@
+import argparse
+import json
+import sys
+from src.benchmark_suite import BenchmarkSuite
+
+
+parser = argparse.ArgumentParser(description='Benchmarks do sistema de inferência e do pipeline de dados.')
+parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 100000, 1000000], help='Tamanhos dos conjuntos sintéticos.')
+parser.add_argument('--repeat', type=int, default=3, help='Repetições de cada medida (é registrada a melhor).')
+parser.add_argument('--output', default='benchmark_results.json', help='Arquivo JSON com os resultados.')
+parser.add_argument('--baseline', help='Arquivo JSON de linha de base para detectar regressões.')
+parser.add_argument('--threshold', type=float, default=0.2, help='Aumento relativo de tempo considerado regressão.')
+args = parser.parse_args()
+
+# Executando os benchmarks e as verificações de equivalência
+suite = BenchmarkSuite(sizes=args.sizes, repeat=args.repeat)
+results = suite.run()
+BenchmarkSuite.save(results, args.output)
+
+for name, stats in results['benchmarks'].items():
+    print(f"{name:45s} {stats['seconds']:10.4f} s")
+
+for name, stats in results['cold_start'].items():
+    rss = f"{stats['max_rss_mb']:.0f} MB" if stats['max_rss_mb'] is not None else 'n/d'
+    print(f"partida a frio {name:30s} {stats['ready_seconds']:10.4f} s  RSS {rss}  {', '.join(stats['modules'])}")
+
+failed_checks = [name for name, check in results['checks'].items() if not check['passed']]
+for name, check in results['checks'].items():
+    print(f"check {name:39s} erro máximo {check['max_error']:.2e} ({'ok' if check['passed'] else 'FALHOU'})")
+
+# Comparando com a linha de base, se informada
+regressions = []
+if args.baseline:
+    with open(args.baseline) as file:
+        regressions = BenchmarkSuite.compare(results, json.load(file), threshold=args.threshold)
+    for regression in regressions:
+        print(f"Regressão em {regression['benchmark']}: {regression['baseline_seconds']:.4f} s -> "
+              f"{regression['current_seconds']:.4f} s ({regression['change']:+.0%})")
+
+sys.exit(1 if failed_checks or regressions else 0)
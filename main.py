@@ -10,21 +10,11 @@ balanced_data = generator.load_and_process_data()
 # Criação do sistema de controle de ultrapassagem de veículos
 overtake_system = VehicleOvertakeSystem()
 
-# Executando a simulação para os dados balanceados
-results = []
-for _, row in balanced_data.iterrows():
-    inputs = {
-        'distance': row['distance'],
-        'relative_speed': row['relative_speed'],
-        'permission': row['permission'],
-        'road': row['road'],
-        'visibility': row['visibility']
-    }
-    # Executando a simulação
-    result = overtake_system.simulate(inputs)
-    results.append(result)
+# Executando a simulação vetorizada para todos os dados balanceados de uma só vez
+results = overtake_system.simulate_batch(balanced_data)
 
-# Avaliando os resultados usando dados balanceados
+# Avaliando os resultados usando dados balanceados; a matriz de confusão é salva em arquivo,
+# sem abrir uma janela que bloquearia o script
 evaluation = EvaluationMetrics(balanced_data['target'], results)
-evaluation.evaluate()
+evaluation.evaluate(save_path='graph/matrizbalanceadamenor.png')
 
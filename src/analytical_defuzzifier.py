@@ -0,0 +1,162 @@
+import itertools
+import numpy as np
+
+
+class AnalyticalDefuzzifier:
+    """
+    Centroide exato da saída agregada para termos de saída triangulares (trimf) ou trapezoidais (trapmf).
+
+    Cada termo cortado no seu nível de ativação é linear por partes, e o máximo entre eles
+    também é. Os pontos em que a forma agregada muda de inclinação são os vértices de cada
+    trapézio, os pontos em que cada aresta atinge o nível de corte de algum termo e as
+    interseções entre as arestas de termos diferentes. Entre dois desses pontos a forma é uma
+    reta, então a área e o momento são integrados em forma fechada. O custo depende apenas da
+    quantidade de termos, e não da resolução do universo.
+
+    O resultado é o centroide das funções de pertinência contínuas, restritas ao intervalo do
+    universo. O skfuzzy interpola as funções amostradas no universo, e por isso difere quando os
+    vértices não caem sobre pontos da amostragem (por exemplo, 'sim' = trimf [0.51, 1, 1] no
+    universo de passo 0.1 começa, amostrado, em 0.5).
+    """
+
+    SHAPES = ('trimf', 'trapmf')
+
+    def __init__(self, universe, shapes):
+        """
+        :param universe: Universo de discurso da variável de saída (define o intervalo de integração).
+        :param shapes: Lista de (tipo, parâmetros) de cada termo, na ordem dos termos de saída,
+                       com tipo 'trimf' ([a, b, c]) ou 'trapmf' ([a, b, c, d]).
+        """
+        self._low, self._high = float(universe[0]), float(universe[-1])
+        corners = []
+        for kind, params in shapes:
+            params = [float(value) for value in params]
+            if kind == 'trimf' and len(params) == 3:
+                params = [params[0], params[1], params[1], params[2]]
+            elif kind != 'trapmf' or len(params) != 4:
+                raise ValueError(f"Termo não suportado na defuzzificação analítica: {kind} {params}. "
+                                 f"Use 'trimf' com 3 parâmetros ou 'trapmf' com 4.")
+            if params != sorted(params):
+                raise ValueError(f"Os parâmetros do termo devem estar em ordem crescente: {params}")
+            corners.append(params)
+        self._corners = np.array(corners, dtype=np.float64)
+        self._corner_list = [tuple(params) for params in corners]
+        # Pontos fixos distintos, limitados ao universo e incluindo os seus extremos
+        self._kinks = np.unique(np.clip(np.append(self._fixed_breakpoints(self._corners), (self._low, self._high)),
+                                        self._low, self._high))
+
+    @staticmethod
+    def _fixed_breakpoints(corners):
+        """
+        Pontos que não dependem das ativações: os vértices de cada trapézio e as interseções entre
+        as arestas inclinadas (retas y = slope * x + intercept) de termos diferentes.
+        """
+        edges = []
+        for a, b, c, d in corners:
+            if b > a:
+                edges.append((1 / (b - a), -a / (b - a)))
+            if d > c:
+                edges.append((-1 / (d - c), d / (d - c)))
+        points = list(corners.ravel())
+        for (slope1, intercept1), (slope2, intercept2) in itertools.combinations(edges, 2):
+            if slope1 != slope2:
+                points.append((intercept2 - intercept1) / (slope1 - slope2))
+        return np.array(points, dtype=np.float64)
+
+    @property
+    def terms(self):
+        return len(self._corners)
+
+    def membership(self, x, term):
+        """
+        Pertinência exata de um termo.
+
+        :param x: Array de pontos.
+        :param term: Índice do termo.
+        :return: Array com a pertinência do termo em cada ponto.
+        """
+        a, b, c, d = self._corners[term]
+        x = np.asarray(x, dtype=np.float64)
+        rise = (x - a) / (b - a) if b > a else (x >= a).astype(np.float64)
+        fall = (d - x) / (d - c) if d > c else (x <= d).astype(np.float64)
+        np.minimum(rise, fall, out=rise)
+        return np.clip(rise, 0.0, 1.0, out=rise)
+
+    def centroid(self, cuts, terms=None):
+        """
+        Centroide exato da união dos termos cortados nos seus níveis de ativação.
+
+        :param cuts: Array (termos, linhas) com o nível de ativação de cada termo de saída.
+        :param terms: Índices dos termos correspondentes às linhas de `cuts` (todos, se None).
+        :return: Array com o centroide de cada linha (NaN quando a área é nula).
+        """
+        cuts = np.atleast_2d(np.asarray(cuts, dtype=np.float64))
+        terms = range(len(self._corners)) if terms is None else terms
+        rows = cuts.shape[1]
+
+        # Pontos em que uma aresta atinge o nível de corte de algum termo
+        levels = []
+        for a, b, c, d in self._corners[list(terms)]:
+            levels.append(a + (b - a) * cuts)
+            levels.append(d - (d - c) * cuts)
+        points = np.concatenate([
+            np.broadcast_to(self._kinks, (rows, len(self._kinks))),
+            np.clip(np.concatenate(levels).T, self._low, self._high) if levels else np.empty((rows, 0))
+        ], axis=1)
+        points.sort(axis=1)
+
+        # Em cada trecho a forma é uma reta: avaliada em 1/3 e 2/3 do trecho, é estendida até os
+        # extremos, o que evita os saltos das arestas verticais exatamente sobre os vértices
+        x0, x1 = points[:, :-1], points[:, 1:]
+        width = x1 - x0
+        inner = np.stack([x0 + width / 3, x0 + 2 * width / 3])
+        heights = np.zeros_like(inner)
+        for row, term in enumerate(terms):
+            np.fmax(heights, np.fmin(self.membership(inner, term), cuts[row][:, np.newaxis]), out=heights)
+        left = 2 * heights[0] - heights[1]
+        right = 2 * heights[1] - heights[0]
+
+        area = 0.5 * width * (left + right)
+        moment = width * (left * (2 * x0 + x1) + right * (x0 + 2 * x1)) / 6
+        total_area = area.sum(axis=1)
+        total_moment = moment.sum(axis=1)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(total_area > 0, total_moment / total_area, np.nan)
+
+    def centroid_single(self, cuts):
+        """
+        Mesmo cálculo de `centroid` para uma única entrada, em Python puro, sem o custo fixo das
+        operações do NumPy sobre arrays pequenos (usado por `simulate`).
+
+        :param cuts: Sequência com o nível de ativação de cada termo de saída.
+        :return: Centroide (NaN quando a área é nula).
+        """
+        low, high = self._low, self._high
+        shapes = [(cut, *corners) for cut, corners in zip(cuts, self._corner_list) if cut > 0]
+        points = self._kinks.tolist()
+        # Como em `centroid`, cada aresta é cortada no nível de todos os termos ativos, e não só no seu
+        for _, a, b, c, d in shapes:
+            for cut, *_ in shapes:
+                points.append(min(max(a + (b - a) * cut, low), high))
+                points.append(min(max(d - (d - c) * cut, low), high))
+        points.sort()
+
+        def height(x):
+            value = 0.0
+            for cut, a, b, c, d in shapes:
+                rise = (x - a) / (b - a) if b > a else float(x >= a)
+                fall = (d - x) / (d - c) if d > c else float(x <= d)
+                value = max(value, min(cut, rise, fall))
+            return value
+
+        total_area = total_moment = 0.0
+        for x0, x1 in zip(points, points[1:]):
+            width = x1 - x0
+            if width <= 0:
+                continue
+            first, second = height(x0 + width / 3), height(x0 + 2 * width / 3)
+            left, right = 2 * first - second, 2 * second - first
+            total_area += 0.5 * width * (left + right)
+            total_moment += width * (left * (2 * x0 + x1) + right * (x0 + 2 * x1)) / 6
+        return total_moment / total_area if total_area > 0 else float('nan')
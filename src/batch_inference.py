@@ -0,0 +1,376 @@
+import time
+import numpy as np
+from src.rule_index import RuleIndex
+
+
+class BatchInferenceEngine:
+    """
+    Avalia o sistema nebuloso de Mamdani sobre colunas inteiras de entradas.
+
+    Reproduz as mesmas etapas do `ControlSystemSimulation` do skfuzzy (fuzzificação por
+    interpolação linear nos universos amostrados, AND = mínimo, OR = máximo, acumulação
+    por máximo e defuzzificação pelo centroide), mas como operações de arrays do NumPy.
+    Os resultados coincidem com `VehicleOvertakeSystem.simulate` com tolerância absoluta
+    de `TOLERANCE` (diferenças apenas de arredondamento em ponto flutuante).
+    """
+
+    TOLERANCE = 1e-9
+
+    def __init__(self, antecedents, consequent, rules):
+        """
+        Compila as variáveis linguísticas e as regras do skfuzzy em arrays.
+
+        :param antecedents: Lista de variáveis linguísticas de entrada.
+        :param consequent: Variável linguística de saída.
+        :param rules: Lista de regras (`ctrl.Rule`), como retornada por `create_rules()`.
+        """
+        if consequent.variable.defuzzify_method != 'centroid':
+            raise ValueError("Apenas a defuzzificação pelo centroide é suportada no modo em lote.")
+        self._setup({variable.name: (variable.universe, variable.terms) for variable in antecedents},
+                    consequent.name, consequent.universe, consequent.terms)
+        self._set_rules([self._compile_rule(rule) for rule in rules])
+
+    @classmethod
+    def from_rule_base(cls, rule_base):
+        """
+        Constrói o motor diretamente das matrizes de uma `CompiledRuleBase`, sem criar os objetos
+        do skfuzzy. O resultado é o mesmo de compilar as regras criadas a partir da mesma configuração.
+
+        :param rule_base: `CompiledRuleBase` (ver `src.fuzzy_config`).
+        :return: `BatchInferenceEngine`.
+        """
+        if rule_base.defuzzify_method != 'centroid':
+            raise ValueError("Apenas a defuzzificação pelo centroide é suportada no modo em lote.")
+        engine = cls.__new__(cls)
+        engine._setup({name: rule_base.variable(name) for name in rule_base.input_names},
+                      rule_base.output_name, *rule_base.variable(rule_base.output_name))
+        engine._set_rules(rule_base.rules())
+        return engine
+
+    def _setup(self, antecedents, output_name, output_universe, output_terms):
+        """
+        :param antecedents: Dicionário {variável: (universo, {termo: pertinência})}.
+        :param output_name: Nome da variável de saída.
+        :param output_universe: Universo da variável de saída.
+        :param output_terms: Dicionário {termo de saída: pertinência}.
+        """
+        self._antecedents = {}
+        for name, (universe, terms) in antecedents.items():
+            universe = np.asarray(universe, dtype=np.float64)
+            terms = {label: np.asarray(mf, dtype=np.float64) for label, mf in terms.items()}
+            self._antecedents[name] = (universe, terms)
+
+        self._output_name = output_name
+        self._output_universe = np.asarray(output_universe, dtype=np.float64)
+        self._output_terms = list(output_terms)
+        self._output_mfs = np.array([output_terms[label] for label in self._output_terms], dtype=np.float64)
+
+    def _set_rules(self, rules):
+        """
+        :param rules: Lista de (antecedente compilado, lista de (índice do termo de saída, peso)).
+        """
+        self._rules = rules
+        self._rule_terms = [self._antecedent_terms(antecedent) for antecedent, _ in self._rules]
+        self._rule_index = RuleIndex.build(self._antecedents, [antecedent for antecedent, _ in self._rules])
+
+    @property
+    def input_names(self):
+        return list(self._antecedents)
+
+    @property
+    def rule_index(self):
+        """
+        `RuleIndex` com as regras que podem ser ativadas em cada região das entradas, ou None quando o
+        índice não é viável para esta base de regras (ver `RuleIndex.build`); nesse caso todas as
+        regras são avaliadas.
+        """
+        return self._rule_index
+
+    def _compile_rule(self, rule):
+        """
+        Converte uma regra do skfuzzy em uma árvore de tuplas e na lista de consequentes.
+
+        :param rule: Regra (`ctrl.Rule`).
+        :return: Tupla (antecedente compilado, lista de (índice do termo de saída, peso)).
+        """
+        consequents = []
+        for weighted_term in rule.consequent:
+            term = weighted_term.term
+            if term.parent.label != self._output_name:
+                raise ValueError(f"Consequente desconhecido na regra: {term.full_label}")
+            consequents.append((self._output_terms.index(term.label), weighted_term.weight))
+        return self._compile_antecedent(rule.antecedent), consequents
+
+    def _compile_antecedent(self, node):
+        # Importado só na compilação: o motor compilado (e o `InferenceModel` que o carrega) não
+        # depende do skfuzzy.control, que carrega o matplotlib e o networkx
+        from skfuzzy.control.term import Term, TermAggregate
+
+        if isinstance(node, TermAggregate):
+            if node.kind == 'not':
+                return ('not', self._compile_antecedent(node.term1))
+            return (node.kind, self._compile_antecedent(node.term1), self._compile_antecedent(node.term2))
+        if isinstance(node, Term):
+            if node.parent.label not in self._antecedents:
+                raise ValueError(f"Antecedente desconhecido na regra: {node.full_label}")
+            return ('term', node.parent.label, node.label)
+        raise ValueError(f"Elemento de regra não suportado: {node!r}")
+
+    def _antecedent_terms(self, node):
+        if node[0] == 'term':
+            return {(node[1], node[2])}
+        return set().union(*(self._antecedent_terms(child) for child in node[1:]))
+
+    def compute(self, inputs, out_of_range='clip', chunk_size=65536, profiler=None, skip_inactive_rules=True,
+                defuzzifier=None):
+        """
+        Calcula a decisão de ultrapassagem para todas as linhas de entrada.
+
+        :param inputs: DataFrame ou dicionário de arrays com uma coluna por variável de entrada.
+        :param out_of_range: 'clip' limita os valores fora do universo aos seus extremos
+                             (mesmo comportamento do skfuzzy); 'nan' retorna NaN para essas linhas.
+        :param chunk_size: Quantidade de linhas avaliadas por vez, limitando a memória intermediária.
+        :param profiler: `InferenceProfiler` que recebe o tempo das etapas e a ativação das regras
+                         de cada bloco (opcional).
+        :param skip_inactive_rules: Se True, usa o `rule_index` para avaliar em cada linha apenas as
+                                    regras que podem ser ativadas e agregar apenas os termos de saída
+                                    que elas atingem. O resultado é o mesmo da avaliação completa.
+        :param defuzzifier: Defuzzificador alternativo com o método `centroid(cuts, terms)`, como o
+                            `AnalyticalDefuzzifier`; None usa o centroide amostrado do skfuzzy.
+        :return: Array com a decisão de cada linha. Linhas com entradas NaN, ou em que nenhuma
+                 regra é ativada, resultam em NaN.
+        """
+        if out_of_range not in ('clip', 'nan'):
+            raise ValueError("Opção inválida para 'out_of_range'. Escolha 'clip' ou 'nan'.")
+
+        columns = {}
+        for name in self._antecedents:
+            columns[name] = np.atleast_1d(np.asarray(inputs[name], dtype=np.float64))
+        lengths = {len(column) for column in columns.values()}
+        if len(lengths) != 1:
+            raise ValueError("Todas as colunas de entrada devem ter o mesmo tamanho.")
+
+        size = lengths.pop()
+        output = np.empty(size, dtype=np.float64)
+        for start in range(0, size, chunk_size):
+            chunk = {name: column[start:start + chunk_size] for name, column in columns.items()}
+            output[start:start + chunk_size] = self._compute_chunk(
+                chunk, out_of_range, profiler, skip_inactive_rules, defuzzifier)
+        return output
+
+    def fuzzify(self, inputs, chunk_size=65536):
+        """
+        Pertinência de todos os termos de entrada em cada linha, com os valores limitados aos universos.
+
+        :param inputs: DataFrame ou dicionário de arrays com uma coluna por variável de entrada.
+        :param chunk_size: Quantidade de linhas fuzzificadas por vez, como em `compute`.
+        :return: Dicionário {(variável, termo): array de pertinências}.
+        """
+        memberships = {}
+        for name, (universe, terms) in self._antecedents.items():
+            column = np.atleast_1d(np.asarray(inputs[name], dtype=np.float64))
+            outputs = {label: np.empty(len(column), dtype=np.float64) for label in terms}
+            for start in range(0, len(column), chunk_size):
+                values = np.clip(column[start:start + chunk_size], universe[0], universe[-1])
+                for label, mf in terms.items():
+                    outputs[label][start:start + chunk_size] = np.interp(values, universe, mf)
+            memberships.update(((name, label), output) for label, output in outputs.items())
+        return memberships
+
+    def compute_fuzzified(self, memberships, defuzzifier=None, chunk_size=65536):
+        """
+        Conclui a inferência a partir de pertinências já calculadas (por exemplo, com `fuzzify`),
+        avaliando todas as regras. Permite reaproveitar a fuzzificação das variáveis que não mudam
+        entre avaliações, como no ajuste das funções de pertinência. As entradas NaN não são tratadas.
+
+        :param memberships: Dicionário {(variável, termo): array}, com todos os termos usados nas regras.
+        :param defuzzifier: Defuzzificador alternativo, como em `compute`.
+        :param chunk_size: Quantidade de linhas avaliadas por vez, limitando a memória intermediária.
+        :return: Array com a decisão de cada linha.
+        """
+        rows = len(next(iter(memberships.values())))
+        timings = dict.fromkeys(('fuzzification', 'rule_evaluation', 'aggregation', 'defuzzification'), 0.0)
+        centroid = self._centroid if defuzzifier is None else defuzzifier.centroid
+        all_rules = range(len(self._rules))
+        decisions = np.empty(rows, dtype=np.float64)
+        for start in range(0, rows, chunk_size):
+            chunk = {key: values[start:start + chunk_size] for key, values in memberships.items()}
+            decisions[start:start + chunk_size], _ = self._infer(
+                chunk, all_rules, min(chunk_size, rows - start), timings, centroid)
+        return decisions
+
+    def _compute_chunk(self, columns, out_of_range, profiler=None, skip_inactive_rules=True, defuzzifier=None):
+        start_time = time.perf_counter()
+        rows = len(next(iter(columns.values())))
+        invalid = np.zeros(rows, dtype=bool)
+        clipped = {}
+        for name, (universe, _) in self._antecedents.items():
+            values = columns[name]
+            invalid |= np.isnan(values)
+            if out_of_range == 'nan':
+                invalid |= (values < universe[0]) | (values > universe[-1])
+            clipped[name] = np.clip(values, universe[0], universe[-1])
+        timings = {'fuzzification': time.perf_counter() - start_time, 'rule_evaluation': 0.0,
+                   'aggregation': 0.0, 'defuzzification': 0.0}
+
+        centroid = self._centroid if defuzzifier is None else defuzzifier.centroid
+        all_rules = range(len(self._rules))
+        if not skip_inactive_rules or self._rule_index is None:
+            decisions, firings = self._compute_rules(clipped, all_rules, timings, centroid)
+        else:
+            # As linhas são agrupadas pela máscara de regras possíveis; cada grupo avalia só as suas
+            indexed = time.perf_counter()
+            masks, inverse = np.unique(self._rule_index.masks(clipped), return_inverse=True)
+            order = np.argsort(inverse, kind='stable')
+            bounds = np.concatenate(([0], np.cumsum(np.bincount(inverse, minlength=len(masks)))))
+            timings['rule_evaluation'] += time.perf_counter() - indexed
+
+            decisions = np.empty(rows, dtype=np.float64)
+            firings = np.zeros((len(self._rules), rows), dtype=np.float64) if profiler is not None else None
+            for group, mask in enumerate(masks):
+                group_rows = order[bounds[group]:bounds[group + 1]]
+                rules = self._rule_index.rules_for_mask(mask)
+                if len(masks) == 1:
+                    group_columns = clipped
+                else:
+                    group_columns = {name: values[group_rows] for name, values in clipped.items()}
+                group_decisions, group_firings = self._compute_rules(group_columns, rules, timings, centroid)
+                decisions[group_rows] = group_decisions
+                if firings is not None and rules:
+                    firings[np.ix_(rules, group_rows)] = group_firings
+
+        decisions[invalid] = np.nan
+        if profiler is not None:
+            profiler.record(timings, firings, rows=rows)
+        return decisions
+
+    def _compute_rules(self, columns, rules, timings, centroid):
+        """
+        Avalia um subconjunto de regras sobre as linhas informadas, acumulando o tempo de cada etapa.
+
+        :param columns: Dicionário com as entradas já limitadas aos universos.
+        :param rules: Índices das regras a avaliar; as demais são consideradas com ativação nula.
+        :param timings: Dicionário com o tempo acumulado de cada etapa.
+        :param centroid: Função de defuzzificação, com a assinatura de `_centroid`.
+        :return: Tupla (decisões, lista com o grau de ativação de cada regra avaliada).
+        """
+        start_time = time.perf_counter()
+        memberships = {}
+        for name, label in set().union(*(self._rule_terms[index] for index in rules)):
+            universe, terms = self._antecedents[name]
+            memberships[(name, label)] = np.interp(columns[name], universe, terms[label])
+        timings['fuzzification'] += time.perf_counter() - start_time
+        return self._infer(memberships, rules, len(next(iter(columns.values()))), timings, centroid)
+
+    def _infer(self, memberships, rules, rows, timings, centroid):
+        """
+        Avalia as regras, agrega e defuzzifica a partir das pertinências já calculadas.
+
+        :param memberships: Dicionário {(variável, termo): pertinência em cada linha}.
+        :param rules: Índices das regras a avaliar.
+        :param rows: Quantidade de linhas.
+        :param timings: Dicionário com o tempo acumulado de cada etapa.
+        :param centroid: Função de defuzzificação, com a assinatura de `_centroid`.
+        :return: Tupla (decisões, lista com o grau de ativação de cada regra avaliada).
+        """
+        start_time = time.perf_counter()
+        firings = [self._evaluate(self._rules[index][0], memberships) for index in rules]
+        evaluated = time.perf_counter()
+
+        # Ativação de cada termo de saída: máximo das regras que apontam para ele.
+        # Termos que nenhuma regra avaliada atinge não contribuem e ficam fora da agregação.
+        terms = sorted({term_index for index in rules for term_index, _ in self._rules[index][1]})
+        position = {term_index: row for row, term_index in enumerate(terms)}
+        cuts = np.zeros((len(terms), rows), dtype=np.float64)
+        for firing, index in zip(firings, rules):
+            for term_index, weight in self._rules[index][1]:
+                cut = cuts[position[term_index]]
+                np.fmax(cut, firing * weight, out=cut)
+        aggregated = time.perf_counter()
+
+        if terms:
+            # Linhas com os mesmos níveis de corte têm o mesmo centroide: cada combinação distinta é
+            # defuzzificada uma única vez (com entradas de 2 casas decimais, são poucas)
+            distinct, inverse = self._distinct_columns(cuts)
+            decisions = centroid(distinct, terms)[inverse]
+        else:
+            decisions = np.full(rows, np.nan)
+
+        timings['rule_evaluation'] += evaluated - start_time
+        timings['aggregation'] += aggregated - evaluated
+        timings['defuzzification'] += time.perf_counter() - aggregated
+        return decisions, firings
+
+    @staticmethod
+    def _distinct_columns(values):
+        """
+        :param values: Array (termos, linhas).
+        :return: Tupla (colunas distintas, índice da coluna distinta de cada linha).
+        """
+        if values.shape[1] < 2:
+            return values, np.zeros(values.shape[1], dtype=np.intp)
+        order = np.lexsort(values[::-1])
+        ordered = values[:, order]
+        starts = np.empty(len(order), dtype=bool)
+        starts[0] = True
+        np.any(ordered[:, 1:] != ordered[:, :-1], axis=0, out=starts[1:])
+        inverse = np.empty(len(order), dtype=np.intp)
+        inverse[order] = np.cumsum(starts) - 1
+        return ordered[:, starts], inverse
+
+    def _evaluate(self, node, memberships):
+        kind = node[0]
+        if kind == 'term':
+            return memberships[(node[1], node[2])]
+        if kind == 'not':
+            return 1.0 - self._evaluate(node[1], memberships)
+        left = self._evaluate(node[1], memberships)
+        right = self._evaluate(node[2], memberships)
+        return np.fmin(left, right) if kind == 'and' else np.fmax(left, right)
+
+    def _centroid(self, cuts, terms=None):
+        """
+        Centroide da saída agregada, calculado da mesma forma que o skfuzzy: em cada segmento
+        do universo são inseridos os pontos em que cada termo cruza o seu nível de corte, e a
+        área sob a curva linear por partes é integrada exatamente (trapézios).
+
+        :param cuts: Array (termos, linhas) com o nível de ativação de cada termo de saída.
+        :param terms: Índices dos termos de saída correspondentes às linhas de `cuts` (todos, se None).
+        :return: Array com o centroide de cada linha (NaN quando a área é nula).
+        """
+        universe = self._output_universe
+        mfs = self._output_mfs if terms is None else self._output_mfs[terms]
+        x0, x1 = universe[:-1], universe[1:]
+        y0, y1 = mfs[:, :-1], mfs[:, 1:]
+        slope = (y1 - y0) / (x1 - x0)
+
+        # Pontos de cada segmento: extremos mais os cruzamentos de cada termo com o seu corte.
+        # Quando não há cruzamento o ponto é repetido em x0, gerando um trecho de largura nula.
+        cut = cuts[:, :, np.newaxis]
+        crosses = (y0[:, np.newaxis, :] - cut) * (y1[:, np.newaxis, :] - cut) < 0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            crossing = x0 + (cut - y0[:, np.newaxis, :]) / slope[:, np.newaxis, :]
+        crossing = np.where(crosses, crossing, x0)
+
+        rows = cuts.shape[1]
+        points = np.empty((rows, len(x0), len(mfs) + 2), dtype=np.float64)
+        points[:, :, 0] = x0
+        points[:, :, 1:-1] = np.moveaxis(crossing, 0, -1)
+        points[:, :, -1] = x1
+        points.sort(axis=-1)
+
+        offset = points - x0[:, np.newaxis]
+        heights = np.zeros_like(points)
+        for index in range(len(mfs)):
+            term = y0[index][:, np.newaxis] + offset * slope[index][:, np.newaxis]
+            np.fmax(heights, np.fmin(term, cuts[index][:, np.newaxis, np.newaxis]), out=heights)
+
+        width = np.diff(points, axis=-1)
+        left, right = heights[..., :-1], heights[..., 1:]
+        area = 0.5 * width * (left + right)
+        moment = area * points[..., :-1] + width ** 2 * (left + 2 * right) / 6
+        total_area = area.sum(axis=(1, 2))
+        total_moment = moment.sum(axis=(1, 2))
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(total_area > 0, total_moment / total_area, np.nan)
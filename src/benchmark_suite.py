@@ -0,0 +1,449 @@
+import asyncio
+import contextlib
+import glob
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from skfuzzy import control as ctrl
+from src.data_generator import TestDataGenerator
+from src.decision_service import LoadGenerator, OvertakeDecisionService
+from src.evaluation_metrics import EvaluationMetrics
+from src.inference import InferenceModel
+from src.lookup_table import DecisionLookupTable
+from src.mf_tuner import MembershipTuner
+from src.parallel_runner import ParallelEvaluationRunner
+from src.stratified_balancer import StratifiedBalancer
+from src.streaming_pipeline import StreamingInferencePipeline
+from src.traffic_simulator import TrafficScenarioSimulator
+from src.vehicle_over_system import VehicleOvertakeSystem
+
+# Executado em um processo Python novo para medir a partida a frio de um worker
+_COLD_START_SCRIPT = '''
+import json, sys, time
+start = time.perf_counter()
+{imports}
+imported = time.perf_counter()
+{setup}
+ready = time.perf_counter()
+# VmHWM (Linux) é o pico de RSS do próprio processo; o ru_maxrss pode herdar o pico do processo pai
+try:
+    with open('/proc/self/status') as status:
+        max_rss_mb = next(int(line.split()[1]) for line in status if line.startswith('VmHWM')) / 1024
+except (OSError, StopIteration):
+    max_rss_mb = None
+print(json.dumps({{
+    'import_seconds': imported - start,
+    'ready_seconds': ready - start,
+    'max_rss_mb': max_rss_mb,
+    'modules': [name for name in {modules!r} if name in sys.modules]
+}}))
+'''
+
+
+class BenchmarkSuite:
+    # Erro máximo aceito para cada caminho rápido em relação à referência do skfuzzy
+    TOLERANCES = {
+        'simulate': 1e-9,
+        'simulate_batch': 1e-9,
+        'decision_cache': 1e-9,
+        'parallel_runner': 1e-9,
+        'streaming_pipeline': 1e-9,
+        'inference_model': 1e-9,
+        'decision_service': 1e-9,
+        # Decisões usadas pela simulação de tráfego nas entradas que ela própria gera
+        'traffic_simulator': 1e-9,
+        # F1-score informado pelo ajuste (configuração original e ajustada) em relação a
+        # `EvaluationMetrics` sobre as decisões do skfuzzy e do sistema com a configuração exportada
+        'mf_tuner': 1e-9,
+        # Centroide contínuo: o termo 'sim' amostrado começa em 0.5, e não em 0.51
+        'analytical_defuzzifier': 5e-3,
+        # Colunas float32: os valores de 2 casas decimais mudam em no máximo 4e-6
+        'columnar_dataset': 1e-5,
+        # Grade padrão: o erro máximo medido nos CSVs de `data/` é 0.155
+        'lookup_table': 0.16,
+        # Balanceamento em blocos: diferença nas contagens por classe em relação ao imblearn mais
+        # linhas que não existem nos dados de entrada
+        'stratified_balancer_undersample': 0,
+        'stratified_balancer_oversample': 0
+    }
+
+    # Bibliotecas cuja presença é registrada na medida de partida a frio
+    COLD_START_MODULES = ('numpy', 'pandas', 'scipy', 'networkx', 'skfuzzy', 'skfuzzy.control',
+                          'matplotlib', 'seaborn', 'imblearn', 'sklearn')
+
+    # Passos de cada medida da simulação de tráfego
+    TRAFFIC_TICKS = 5
+
+    def __init__(self, sizes=(1000, 100000, 1000000), repeat=3, latency_calls=200, data_dir='data', seed=0):
+        """
+        Suíte de benchmarks do sistema de inferência e do pipeline de dados.
+
+        :param sizes: Quantidades de linhas dos conjuntos sintéticos ampliados.
+        :param repeat: Quantidade de repetições de cada medida (é registrada a melhor).
+        :param latency_calls: Quantidade de chamadas de `simulate` na medida de latência.
+        :param data_dir: Diretório com os CSVs de referência (`data/*.csv`).
+        :param seed: Semente dos dados sintéticos.
+        """
+        self._sizes = list(sizes)
+        self._repeat = repeat
+        self._latency_calls = latency_calls
+        self._csv_paths = sorted(glob.glob(os.path.join(data_dir, '*.csv')))
+        self._seed = seed
+        self._system = VehicleOvertakeSystem()
+        if not self._csv_paths:
+            raise ValueError(f"Nenhum CSV encontrado em '{data_dir}'.")
+        self._reference_data = pd.concat(
+            [TestDataGenerator(csv_path=path).load_and_process_data() for path in self._csv_paths], ignore_index=True)
+
+    def run(self):
+        """
+        Executa todos os benchmarks e as verificações de equivalência.
+
+        :return: Dicionário com metadados, resultados de cada benchmark e verificações.
+        """
+        results = {
+            'metadata': {
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'python': platform.python_version(),
+                'numpy': np.__version__,
+                'pandas': pd.__version__,
+                'platform': platform.platform(),
+                'cpus': os.cpu_count(),
+                'sizes': self._sizes,
+                'repeat': self._repeat
+            },
+            'benchmarks': {},
+            'checks': self.check_fast_paths(),
+            'rule_index': self._rule_index_savings(),
+            'cold_start': self.cold_start(repeat=self._repeat)
+        }
+        benchmarks = results['benchmarks']
+        benchmarks['simulate_latency'] = self._simulate_latency()
+        model = InferenceModel.from_config()
+        analytical_model = InferenceModel.from_config(analytical=True)
+
+        with tempfile.TemporaryDirectory() as directory:
+            for size in self._sizes:
+                data = self._scaled_data(size)
+                benchmarks[f'simulate_batch_{size}'] = self._measure(lambda: self._system.simulate_batch(data), size)
+                benchmarks[f'inference_model_{size}'] = self._measure(lambda: model.simulate_batch(data), size)
+                benchmarks[f'analytical_defuzzifier_{size}'] = self._measure(
+                    lambda: analytical_model.simulate_batch(data), size)
+                for generator_name in ('generate_data_for_fis', 'generate_complete_vehicle_data', 'generate_simple_vehicle_data'):
+                    benchmarks[f'{generator_name}_{size}'] = self._measure(
+                        lambda: getattr(TestDataGenerator(quantity=size, seed=self._seed), generator_name)(), size)
+
+                paths = {}
+                for schema, frame in (('fis', data), ('simple_vehicle', self._simple_vehicle_data(size))):
+                    paths[schema] = os.path.join(directory, f'{schema}_{size}.csv')
+                    frame.to_csv(paths[schema], index=False)
+                    benchmarks[f'load_and_process_data_{schema}_{size}'] = self._measure(
+                        lambda: TestDataGenerator(csv_path=paths[schema]).load_and_process_data(), size)
+
+                generator = TestDataGenerator(csv_path=paths['fis'], seed=self._seed)
+                generator.load_and_process_data()
+                for method in ('undersample', 'oversample'):
+                    benchmarks[f'balance_data_{method}_{size}'] = self._measure(
+                        lambda: generator.balance_data(method=method), size)
+                    benchmarks[f'balance_data_streaming_{method}_{size}'] = self._measure(
+                        lambda: generator.balance_data(method=method, streaming=True), size)
+
+                columnar_path = os.path.join(directory, f'columnar_{size}')
+                benchmarks[f'convert_to_columnar_{size}'] = self._measure(
+                    lambda: TestDataGenerator(csv_path=paths['fis']).convert_to_columnar(columnar_path), size)
+                benchmarks[f'columnar_simulate_batch_{size}'] = self._measure(
+                    lambda: self._system.simulate_batch(TestDataGenerator().load_columnar(columnar_path)), size)
+
+                load = LoadGenerator(vehicles=min(size, 1000), frames=size, seed=self._seed)
+                benchmarks[f'decision_service_{size}'] = self._measure(lambda: asyncio.run(self._serve(load)), size)
+                simulator = TrafficScenarioSimulator(size, system=self._system, seed=self._seed)
+                benchmarks[f'traffic_simulator_{size}'] = self._measure(
+                    lambda: simulator.run(self.TRAFFIC_TICKS), size * self.TRAFFIC_TICKS)
+                benchmarks[f'mf_tuner_{size}'] = self._measure(lambda: self._tuner(directory).tune(data), size)
+
+                decisions = self._system.simulate_batch(data)
+                benchmarks[f'evaluate_{size}'] = self._measure(
+                    lambda: EvaluationMetrics(data['target'], decisions).evaluate(plot=False), size)
+        return results
+
+    def _rule_index_savings(self):
+        """
+        Economia do índice de regras nos CSVs de `data/`, ou None quando o sistema não tem índice.
+        """
+        rule_index = self._system.rule_index
+        return rule_index.savings(self._reference_data) if rule_index is not None else None
+
+    def check_fast_paths(self):
+        """
+        Compara cada caminho rápido com a referência do skfuzzy (`ControlSystemSimulation.compute`
+        com todas as regras, linha a linha) nos CSVs de `data/`, e o balanceamento em blocos com o imblearn.
+
+        :return: Dicionário com o erro máximo, a tolerância e o resultado de cada verificação.
+        """
+        data = self._reference_data
+        inputs = data[['distance', 'relative_speed', 'permission', 'road', 'visibility']].to_dict('records')
+        simulation = ctrl.ControlSystemSimulation(ctrl.ControlSystem(self._system.create_rules()))
+        reference = self._skfuzzy_decisions(simulation, inputs)
+
+        cached_system = VehicleOvertakeSystem()
+        cached_system.enable_cache()
+        candidates = {
+            'simulate': np.array([self._system.simulate(row) for row in inputs]),
+            'simulate_batch': self._system.simulate_batch(data),
+            'decision_cache': np.array([cached_system.simulate(row) for row in inputs]),
+            'parallel_runner': ParallelEvaluationRunner(workers=2, chunk_size=max(1, len(data) // 4), model=self._system).run(data),
+            'inference_model': InferenceModel.from_config().simulate_batch(data),
+            'analytical_defuzzifier': InferenceModel.from_config(analytical=True).simulate_batch(data),
+            'lookup_table': DecisionLookupTable.build(self._system).lookup_batch(data),
+            'decision_service': asyncio.run(self._serve_inputs(inputs))
+        }
+        with tempfile.TemporaryDirectory() as directory:
+            input_path = os.path.join(directory, 'input.csv')
+            output_path = os.path.join(directory, 'output.csv')
+            data.to_csv(input_path, index=False)
+            StreamingInferencePipeline(self._system, chunk_size=500).run(input_path, output_path, include_inputs=False)
+            candidates['streaming_pipeline'] = pd.read_csv(output_path)['overtake_decision'].to_numpy()
+
+            columnar_path = os.path.join(directory, 'columnar')
+            TestDataGenerator(csv_path=input_path).convert_to_columnar(columnar_path)
+            candidates['columnar_dataset'] = self._system.simulate_batch(TestDataGenerator().load_columnar(columnar_path))
+
+        errors = {name: float(np.max(np.abs(values - reference))) for name, values in candidates.items()}
+        errors['traffic_simulator'] = self._check_traffic_simulator(simulation)
+        errors['mf_tuner'] = self._check_tuner(data, reference)
+        errors.update(self._check_balancer(data))
+        checks = {}
+        for name, error in errors.items():
+            checks[name] = {'max_error': error, 'tolerance': self.TOLERANCES[name], 'passed': error <= self.TOLERANCES[name]}
+        return checks
+
+    @staticmethod
+    def _skfuzzy_decisions(simulation, inputs):
+        """
+        Decisões de referência, linha a linha, com `ControlSystemSimulation.compute`.
+
+        :param simulation: `ControlSystemSimulation` com todas as regras.
+        :param inputs: Lista de dicionários com as entradas de cada linha.
+        """
+        decisions = []
+        for row in inputs:
+            for name, value in row.items():
+                simulation.input[name] = value
+            simulation.compute()
+            decisions.append(simulation.output['overtake_decision'])
+        return np.array(decisions)
+
+    async def _serve(self, load):
+        service = OvertakeDecisionService(self._system)
+        await service.start()
+        try:
+            await load.run(service)
+        finally:
+            await service.stop()
+
+    async def _serve_inputs(self, inputs):
+        """
+        Decisões do `OvertakeDecisionService` para as entradas informadas. Cada linha vira o quadro
+        de um veículo próprio em que o carro da frente está parado, para que a velocidade relativa
+        calculada pelo serviço seja exatamente a da linha.
+        """
+        service = OvertakeDecisionService(self._system)
+        await service.start()
+        try:
+            frames = [{'vehicle_id': index, 'current_timestamp': 0, 'next_timestamp': 1,
+                       'initial_distance': row['distance'], 'final_distance': row['distance'],
+                       'speed': row['relative_speed'], 'permission': row['permission'], 'road': row['road'],
+                       'visibility': row['visibility']} for index, row in enumerate(inputs)]
+            return np.array(await asyncio.gather(*(service.submit(frame) for frame in frames)))
+        finally:
+            await service.stop()
+
+    def _check_traffic_simulator(self, simulation, vehicles=50):
+        """
+        Compara as decisões usadas pela `TrafficScenarioSimulator` em `TRAFFIC_TICKS` passos com a
+        referência do skfuzzy sobre as entradas geradas em cada passo.
+
+        :return: Erro máximo.
+        """
+        calls = []
+        system = self._system
+
+        class _Recorder:
+            @staticmethod
+            def simulate_batch(inputs):
+                decisions = system.simulate_batch(inputs)
+                calls.append((pd.DataFrame(inputs).to_dict('records'), decisions))
+                return decisions
+
+        TrafficScenarioSimulator(vehicles, system=_Recorder(), seed=self._seed).run(self.TRAFFIC_TICKS)
+        return max(float(np.max(np.abs(decisions - self._skfuzzy_decisions(simulation, inputs)), initial=0.0))
+                   for inputs, decisions in calls)
+
+    def _tuner(self, cache_dir):
+        return MembershipTuner(cache_dir=cache_dir, workers=1, population=4, max_generations=3, seed=self._seed)
+
+    def _check_tuner(self, data, reference):
+        """
+        Compara o F1-score informado pelo `MembershipTuner` com o de `EvaluationMetrics`: o da
+        configuração original sobre as decisões do skfuzzy e o da configuração ajustada sobre as
+        decisões de um sistema criado a partir da configuração exportada.
+
+        :return: Maior diferença entre os F1-scores.
+        """
+        def f1(decisions):
+            with contextlib.redirect_stdout(io.StringIO()):
+                return EvaluationMetrics(data['target'], decisions).evaluate(plot=False)[4]
+
+        with tempfile.TemporaryDirectory() as directory:
+            tuner = self._tuner(directory)
+            result = tuner.tune(data)
+            config_path = os.path.join(directory, 'tuned.json')
+            tuner.export_config(config_path)
+            tuned = VehicleOvertakeSystem(config_path=config_path, cache_dir=directory).simulate_batch(data)
+        return max(abs(result['baseline_f1'] - f1(reference)), abs(result['f1'] - f1(tuned)))
+
+    def _check_balancer(self, data):
+        """
+        Compara o `StratifiedBalancer`, em blocos, com os amostradores do imblearn: as contagens por
+        classe devem ser as mesmas, e todas as linhas devem existir nos dados de entrada.
+
+        :return: Dicionário com o erro de cada método.
+        """
+        from imblearn.over_sampling import RandomOverSampler
+        from imblearn.under_sampling import RandomUnderSampler
+
+        samplers = {'undersample': RandomUnderSampler(random_state=self._seed),
+                    'oversample': RandomOverSampler(random_state=self._seed)}
+        size = max(1, len(data) // 4)
+        source = set(data.itertuples(index=False, name=None))
+        errors = {}
+        for method, sampler in samplers.items():
+            _, expected = sampler.fit_resample(data.drop(columns=['target']), data['target'])
+            balanced = StratifiedBalancer(method, seed=self._seed).balance(
+                lambda: (data.iloc[start:start + size] for start in range(0, len(data), size)))
+            counts = balanced['target'].value_counts().sub(expected.value_counts(), fill_value=0).abs()
+            missing = sum(row not in source for row in balanced[data.columns].itertuples(index=False, name=None))
+            errors[f'stratified_balancer_{method}'] = float(counts.max() + missing)
+        return errors
+
+    @classmethod
+    def cold_start(cls, repeat=3):
+        """
+        Mede a partida a frio de um worker em processos Python novos: tempo de importação, tempo até
+        a primeira decisão, memória residente máxima (RSS) e bibliotecas pesadas carregadas.
+
+        Cenários: o interpretador vazio (referência), o `VehicleOvertakeSystem` completo e o
+        `InferenceModel` compilado carregado do disco.
+
+        :param repeat: Quantidade de processos por cenário (é registrado o mais rápido).
+        :return: Dicionário com as medidas de cada cenário.
+        """
+        row = {'distance': [10.0], 'relative_speed': [30.0], 'permission': [1.0], 'road': [1.0], 'visibility': [1.0]}
+        with tempfile.TemporaryDirectory() as directory:
+            model_path = os.path.join(directory, 'model.pkl')
+            VehicleOvertakeSystem().to_inference_model().save(model_path)
+            scenarios = {
+                'interpreter': ('pass', 'pass'),
+                'full_system': ('from src.vehicle_over_system import VehicleOvertakeSystem',
+                                f'VehicleOvertakeSystem().simulate_batch({row!r})'),
+                'inference_model': ('from src.inference import InferenceModel',
+                                    f'InferenceModel.load({model_path!r}).simulate_batch({row!r})')
+            }
+            root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            report = {}
+            for name, (imports, setup) in scenarios.items():
+                script = _COLD_START_SCRIPT.format(imports=imports, setup=setup, modules=cls.COLD_START_MODULES)
+                runs = []
+                for _ in range(repeat):
+                    start_time = time.perf_counter()
+                    output = subprocess.run([sys.executable, '-c', script], cwd=root, check=True,
+                                            capture_output=True, text=True).stdout
+                    stats = json.loads(output)
+                    stats['process_seconds'] = time.perf_counter() - start_time
+                    runs.append(stats)
+                report[name] = min(runs, key=lambda stats: stats['ready_seconds'])
+        return report
+
+    def _simulate_latency(self):
+        inputs = self._reference_data.head(self._latency_calls).to_dict('records')
+        latencies = []
+        for row in inputs:
+            start_time = time.perf_counter()
+            self._system.simulate(row)
+            latencies.append(time.perf_counter() - start_time)
+        latencies = np.array(latencies) * 1e6
+        return {
+            'calls': len(latencies),
+            'seconds': float(latencies.sum() / 1e6),
+            'mean_us': float(latencies.mean()),
+            'p50_us': float(np.percentile(latencies, 50)),
+            'p95_us': float(np.percentile(latencies, 95))
+        }
+
+    def _measure(self, function, rows):
+        timings = []
+        for _ in range(self._repeat):
+            start_time = time.perf_counter()
+            # As métricas e o balanceamento imprimem resultados; a saída é descartada na medida
+            with contextlib.redirect_stdout(io.StringIO()):
+                function()
+            timings.append(time.perf_counter() - start_time)
+        best = min(timings)
+        return {'rows': rows, 'seconds': best, 'rows_per_sec': rows / best if best > 0 else float('inf')}
+
+    def _scaled_data(self, size):
+        """
+        Amplia os CSVs de referência até `size` linhas, repetindo-os com um pequeno ruído nas entradas.
+        """
+        rng = np.random.default_rng(self._seed)
+        index = rng.integers(0, len(self._reference_data), size)
+        data = self._reference_data.iloc[index].reset_index(drop=True)
+        for column, scale in (('distance', 0.5), ('relative_speed', 0.5)):
+            data[column] = np.round(data[column] + rng.normal(0, scale, size), 2)
+        return data
+
+    def _simple_vehicle_data(self, size):
+        return TestDataGenerator(quantity=size, seed=self._seed).generate_simple_vehicle_data()
+
+    @staticmethod
+    def save(results, path):
+        """
+        Salva os resultados em JSON.
+
+        :param results: Dicionário retornado por `run`.
+        :param path: Caminho do arquivo JSON.
+        """
+        with open(path, 'w') as file:
+            json.dump(results, file, indent=2)
+
+    @staticmethod
+    def compare(results, baseline, threshold=0.2):
+        """
+        Compara os tempos com uma linha de base salva anteriormente.
+
+        :param results: Dicionário retornado por `run`.
+        :param baseline: Dicionário de resultados usado como linha de base.
+        :param threshold: Aumento relativo de tempo a partir do qual há regressão (0.2 = 20%).
+        :return: Lista de dicionários com as regressões encontradas (nome, base, atual, variação).
+        """
+        regressions = []
+        for name, current in results['benchmarks'].items():
+            previous = baseline.get('benchmarks', {}).get(name)
+            if previous is None or previous['seconds'] <= 0:
+                continue
+            change = current['seconds'] / previous['seconds'] - 1
+            if change > threshold:
+                regressions.append({
+                    'benchmark': name,
+                    'baseline_seconds': previous['seconds'],
+                    'current_seconds': current['seconds'],
+                    'change': change
+                })
+        return regressions
@@ -0,0 +1,143 @@
+import json
+import os
+import shutil
+import tempfile
+import numpy as np
+
+FORMAT_VERSION = 1
+MANIFEST = 'manifest.json'
+
+
+def column_dtype(name, values):
+    """
+    Tipo de armazenamento de uma coluna: uint8 para o `target`, int64/float64 para os timestamps,
+    int32 para os demais inteiros (int64 se os valores não couberem no int32) e float32 para as
+    demais. Os dados de teste têm 2 casas decimais, que o float32 representa com folga.
+
+    :param name: Nome da coluna.
+    :param values: Valores de um bloco da coluna.
+    :return: dtype do NumPy.
+    """
+    if name == 'target':
+        return np.dtype(np.uint8)
+    integer = np.issubdtype(values.dtype, np.integer) or values.dtype == np.bool_
+    if 'timestamp' in name:
+        # Timestamps (por exemplo, em milissegundos) não cabem no int32 nem no float32 sem perda
+        return np.dtype(np.int64 if integer else np.float64)
+    if integer:
+        return np.dtype(np.int32 if _fits(values, np.int32) else np.int64)
+    return np.dtype(np.float32)
+
+
+def _fits(values, dtype):
+    """
+    Indica se todos os valores estão no intervalo do tipo inteiro informado.
+    """
+    if not len(values):
+        return True
+    info = np.iinfo(dtype)
+    return bool(np.nanmin(values) >= info.min and np.nanmax(values) <= info.max)
+
+
+def _widen(raw_path, dtype, wider):
+    """
+    Regrava os valores em bruto de uma coluna em um tipo inteiro mais largo.
+    """
+    np.fromfile(raw_path, dtype=dtype).astype(wider).tofile(raw_path)
+
+
+def write_columnar(chunks, path, source=None):
+    """
+    Grava uma sequência de DataFrames como um conjunto de dados colunar: um `.npy` por coluna e um
+    `manifest.json` com a quantidade de linhas, a ordem e o tipo das colunas. Os blocos são
+    gravados um de cada vez, de modo que o arquivo de origem pode ser maior que a memória.
+
+    A gravação é feita em um diretório temporário renomeado ao final.
+
+    :param chunks: Iterável de DataFrames com as mesmas colunas.
+    :param path: Diretório de destino (substituído se já existir).
+    :param source: Descrição da origem dos dados, guardada no manifesto (opcional).
+    :return: Dicionário do manifesto gravado.
+    """
+    path = os.path.abspath(path)
+    parent = os.path.dirname(path)
+    os.makedirs(parent, exist_ok=True)
+    temporary = tempfile.mkdtemp(dir=parent)
+    files = {}
+    dtypes = {}
+    rows = 0
+    try:
+        # Os valores são gravados em bruto e recebem o cabeçalho .npy quando o total de linhas é conhecido
+        for chunk in chunks:
+            if not files:
+                for name in chunk.columns:
+                    dtypes[name] = column_dtype(name, chunk[name].to_numpy())
+                    files[name] = open(os.path.join(temporary, f'{name}.raw'), 'wb')
+            elif list(chunk.columns) != list(files):
+                raise ValueError("Todos os blocos devem ter as mesmas colunas, na mesma ordem.")
+            for name in list(files):
+                values = chunk[name].to_numpy()
+                if dtypes[name] == np.uint8 and not _fits(values, np.uint8):
+                    raise ValueError(f"A coluna '{name}' tem valores fora do intervalo de uint8.")
+                if dtypes[name] == np.int32 and not _fits(values, np.int32):
+                    # Um bloco posterior saiu do intervalo do int32: a coluna passa a ser int64
+                    raw_path = files[name].name
+                    files[name].close()
+                    _widen(raw_path, np.int32, np.int64)
+                    files[name] = open(raw_path, 'ab')
+                    dtypes[name] = np.dtype(np.int64)
+                files[name].write(np.ascontiguousarray(values, dtype=dtypes[name]).tobytes())
+            rows += len(chunk)
+        for file in files.values():
+            file.close()
+
+        for name, dtype in dtypes.items():
+            raw_path = os.path.join(temporary, f'{name}.raw')
+            with open(os.path.join(temporary, f'{name}.npy'), 'wb') as output, open(raw_path, 'rb') as raw:
+                header = {'descr': np.lib.format.dtype_to_descr(dtype), 'fortran_order': False, 'shape': (rows,)}
+                np.lib.format.write_array_header_1_0(output, header)
+                shutil.copyfileobj(raw, output, 1 << 24)
+            os.remove(raw_path)
+
+        manifest = {
+            'format': FORMAT_VERSION,
+            'rows': rows,
+            'columns': {name: dtype.str for name, dtype in dtypes.items()},
+            'source': source
+        }
+        with open(os.path.join(temporary, MANIFEST), 'w', encoding='utf-8') as file:
+            json.dump(manifest, file, indent=2, ensure_ascii=False)
+
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        os.replace(temporary, path)
+        return manifest
+    finally:
+        for file in files.values():
+            file.close()
+        shutil.rmtree(temporary, ignore_errors=True)
+
+
+def open_columnar(path, columns=None):
+    """
+    Abre um conjunto de dados colunar mapeando cada coluna em memória (somente leitura). Nada é
+    lido do disco até que os valores sejam usados, e processos que abrem o mesmo arquivo
+    compartilham as páginas do cache do sistema operacional.
+
+    :param path: Diretório gravado por `write_columnar`.
+    :param columns: Colunas a abrir (todas, se None).
+    :return: Tupla (manifesto, dicionário {coluna: array mapeado}).
+    """
+    with open(os.path.join(path, MANIFEST), encoding='utf-8') as file:
+        manifest = json.load(file)
+    if manifest.get('format') != FORMAT_VERSION:
+        raise ValueError(f"Versão de formato não suportada em '{path}': {manifest.get('format')}")
+    names = list(manifest['columns']) if columns is None else list(columns)
+    arrays = {}
+    for name in names:
+        if name not in manifest['columns']:
+            raise KeyError(f"Coluna inexistente no conjunto de dados: {name}")
+        arrays[name] = np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r')
+        if len(arrays[name]) != manifest['rows']:
+            raise ValueError(f"A coluna '{name}' não tem a quantidade de linhas do manifesto.")
+    return manifest, arrays
@@ -1,166 +1,295 @@
-import random
+import os
+import time
+import numpy as np
 import pandas as pd
-from imblearn.under_sampling import RandomUnderSampler
-from imblearn.over_sampling import RandomOverSampler
+from src.columnar_dataset import write_columnar, open_columnar
+from src.stratified_balancer import StratifiedBalancer
 
 
 class TestDataGenerator:
-    def __init__(self, quantity=None, csv_path=None):
+    def __init__(self, quantity=None, csv_path=None, seed=None):
+        """
+        :param quantity: Quantidade de linhas a serem geradas.
+        :param csv_path: Caminho do CSV a ser carregado.
+        :param seed: Semente do gerador aleatório, para gerar conjuntos reproduzíveis (opcional).
+        """
         self._quantity = quantity
         self._csv_path = csv_path
+        self._seed = seed
+        self._rng = np.random.default_rng(seed)
         self._data = None
+        self._stage_timings = None
     
     def generate_data_for_fis(self):
         """
         Gera dados prontos para passar diretamente ao Sistema de Inferência Nebulosa (SIN).
+        Todas as colunas são sorteadas de uma só vez como arrays do NumPy.
         
         :return: DataFrame com os dados gerados e o target.
         """
         if not self._quantity:
             raise ValueError("Defina a quantidade de dados a serem gerados.")
         
-        data = []
-        for _ in range(self._quantity):
-            distance = random.uniform(1, 50)  # Distância entre 1 e 50 metros
-            relative_speed = random.uniform(1, 56)  # Velocidade relativa entre 1 e 56 m/s
-            permission = random.uniform(0, 1)  # Permissão (0 a 1)
-            road = random.uniform(0, 1)  # Condições da pista (0 a 1)
-            visibility = random.uniform(0, 1)  # Visibilidade (0 a 1)
-            
-            # Definir uma regra simples para o target
-            if (distance < 20 and relative_speed > 30 and permission >= 0.5 and road >= 0.5 and visibility >= 0.5) or \
-            (20 <= distance <= 30 and 15 < relative_speed < 40 and permission >= 0.5 and road >= 0.5 and visibility >= 0.5) or \
-            (distance > 30 and relative_speed > 40 and permission >= 0.5 and road >= 0.5 and visibility >= 0.5):
-                target = 1  # Deve ultrapassar
-            else:
-                target = 0  # Não deve ultrapassar
-            
-            data.append({
-                'distance': round(distance, 2),
-                'relative_speed': round(relative_speed, 2),
-                'permission': round(permission, 2),
-                'road': round(road, 2),
-                'visibility': round(visibility, 2),
-                'target': target  # 1 para ultrapassagem, 0 para não
-            })
-        
-        self._data = pd.DataFrame(data)
+        n = self._quantity
+        distance = self._rng.uniform(1, 50, n)  # Distância entre 1 e 50 metros
+        relative_speed = self._rng.uniform(1, 56, n)  # Velocidade relativa entre 1 e 56 m/s
+        permission = self._rng.uniform(0, 1, n)  # Permissão (0 a 1)
+        road = self._rng.uniform(0, 1, n)  # Condições da pista (0 a 1)
+        visibility = self._rng.uniform(0, 1, n)  # Visibilidade (0 a 1)
+        
+        # Definir uma regra simples para o target (1 para ultrapassagem, 0 para não)
+        favorable = (permission >= 0.5) & (road >= 0.5) & (visibility >= 0.5)
+        target = favorable & (
+            ((distance < 20) & (relative_speed > 30)) |
+            ((distance >= 20) & (distance <= 30) & (relative_speed > 15) & (relative_speed < 40)) |
+            ((distance > 30) & (relative_speed > 40))
+        )
+        
+        self._data = pd.DataFrame({
+            'distance': self._round(distance),
+            'relative_speed': self._round(relative_speed),
+            'permission': self._round(permission),
+            'road': self._round(road),
+            'visibility': self._round(visibility),
+            'target': target.astype(np.int8)
+        })
         return self._data
 
     def generate_complete_vehicle_data(self):
         """
         Gera dados simulando um veículo com timestamp inicial, distância inicial, e outras variáveis.
+        Todas as colunas são sorteadas de uma só vez como arrays do NumPy.
         
         :return: DataFrame com os dados gerados.
         """
         if not self._quantity:
             raise ValueError("Defina a quantidade de dados a serem gerados.")
         
-        data = []
-        for _ in range(self._quantity):
-            current_timestamp = random.randint(100000, 200000)
-            next_timestamp = current_timestamp + random.randint(1, 5)  # Tempo depois
-            initial_distance = random.uniform(1, 50)  # Distância inicial (em metros)
-            final_distance = random.uniform(1, 50)  # Distância final (em metros)
-            speed = random.uniform(10, 30)  # Velocidade do carro (em m/s)
-            road = random.uniform(0, 1)  # Condições da pista (0 a 1)
-            visibility = random.uniform(0, 1)  # Visibilidade (0 a 1)
-            
-            # Calcula a velocidade do carro à frente
-            front_speed = (initial_distance - final_distance) / (next_timestamp - current_timestamp)
-            relative_speed = speed - front_speed
-            
-            permission = random.uniform(0, 1)  # Permissão (0 a 1)
-
-            data.append({
-                'current_timestamp': current_timestamp,
-                'next_timestamp': next_timestamp,
-                'initial_distance': round(initial_distance, 2),
-                'final_distance': round(final_distance, 2),
-                'speed': round(speed, 2),
-                'front_speed': round(front_speed, 2),
-                'relative_speed': round(relative_speed, 2),
-                'permission': round(permission, 2),
-                'road': round(road, 2),
-                'visibility': round(visibility, 2)
-            })
-
-        self._data = pd.DataFrame(data)
+        n = self._quantity
+        current_timestamp = self._rng.integers(100000, 200000, n, endpoint=True)
+        next_timestamp = current_timestamp + self._rng.integers(1, 5, n, endpoint=True)  # Tempo depois
+        initial_distance = self._rng.uniform(1, 50, n)  # Distância inicial (em metros)
+        final_distance = self._rng.uniform(1, 50, n)  # Distância final (em metros)
+        speed = self._rng.uniform(10, 30, n)  # Velocidade do carro (em m/s)
+        road = self._rng.uniform(0, 1, n)  # Condições da pista (0 a 1)
+        visibility = self._rng.uniform(0, 1, n)  # Visibilidade (0 a 1)
+        
+        # Calcula a velocidade do carro à frente
+        front_speed = (initial_distance - final_distance) / (next_timestamp - current_timestamp)
+        relative_speed = speed - front_speed
+        
+        permission = self._rng.uniform(0, 1, n)  # Permissão (0 a 1)
+
+        self._data = pd.DataFrame({
+            'current_timestamp': current_timestamp.astype(np.int32),
+            'next_timestamp': next_timestamp.astype(np.int32),
+            'initial_distance': self._round(initial_distance),
+            'final_distance': self._round(final_distance),
+            'speed': self._round(speed),
+            'front_speed': self._round(front_speed),
+            'relative_speed': self._round(relative_speed),
+            'permission': self._round(permission),
+            'road': self._round(road),
+            'visibility': self._round(visibility)
+        })
         return self._data
 
     def generate_simple_vehicle_data(self):
         """
         Gera dados simulando o cenário onde só temos distância do carro à frente e velocidade.
+        Todas as colunas são sorteadas de uma só vez como arrays do NumPy.
         
         :return: DataFrame com os dados gerados.
         """
         if not self._quantity:
             raise ValueError("Defina a quantidade de dados a serem gerados.")
         
-        data = []
-        for _ in range(self._quantity):
-            distance = random.uniform(1, 50)  # Distância do carro da frente (em metros)
-            speed = random.uniform(10, 30)  # Velocidade do carro (em m/s)
-            road = random.uniform(0, 1)  # Condições da pista (0 a 1)
-            visibility = random.uniform(0, 1)  # Visibilidade (0 a 1)
-            permission = random.uniform(0, 1)  # Permissão (0 a 1)
-            
-            data.append({
-                'distance': round(distance, 2),
-                'speed': round(speed, 2),
-                'permission': round(permission, 2),
-                'road': round(road, 2),
-                'visibility': round(visibility, 2)
-            })
-
-        self._data = pd.DataFrame(data)
+        n = self._quantity
+        distance = self._rng.uniform(1, 50, n)  # Distância do carro da frente (em metros)
+        speed = self._rng.uniform(10, 30, n)  # Velocidade do carro (em m/s)
+        road = self._rng.uniform(0, 1, n)  # Condições da pista (0 a 1)
+        visibility = self._rng.uniform(0, 1, n)  # Visibilidade (0 a 1)
+        permission = self._rng.uniform(0, 1, n)  # Permissão (0 a 1)
+        
+        self._data = pd.DataFrame({
+            'distance': self._round(distance),
+            'speed': self._round(speed),
+            'permission': self._round(permission),
+            'road': self._round(road),
+            'visibility': self._round(visibility)
+        })
         return self._data
 
-    def load_and_process_data(self):
+    @staticmethod
+    def _round(values):
+        """
+        Arredonda para 2 casas decimais e armazena em float32, reduzindo a memória pela metade.
+        
+        :param values: Array do NumPy.
+        :return: Array float32 arredondado.
+        """
+        return np.round(values, 2).astype(np.float32)
+
+    def load_and_process_data(self, downcast=False):
         """
         Carrega dados de um arquivo CSV e processa de acordo com o tipo de dados gerados.
         Pode ser do tipo já pronto para SIN ou do tipo que necessita de processamento.
+        O tempo de cada etapa fica disponível em `stage_timings`.
         
+        :param downcast: Se True, converte as colunas float64 para float32 ao final do processamento.
         :return: DataFrame processado, pronto para o SIN.
         """
         if not self._csv_path:
             raise ValueError("Caminho do CSV não fornecido.")
         
-        self._data = pd.read_csv(self._csv_path)
+        start_time = time.perf_counter()
+        data = pd.read_csv(self._csv_path)
+        self._stage_timings = {'read': time.perf_counter() - start_time}
+        self._data = self._process_data(data, downcast=downcast, timings=self._stage_timings)
+        
+        # Retorna o DataFrame processado
+        return self._data
+
+    def iter_processed_chunks(self, chunk_size=100000, downcast=False):
+        """
+        Lê o arquivo CSV em blocos e processa cada bloco como em `load_and_process_data`.
+        Permite percorrer arquivos maiores que a memória, mantendo apenas um bloco por vez.
+        
+        :param chunk_size: Quantidade de linhas lidas por bloco.
+        :param downcast: Se True, converte as colunas float64 para float32 em cada bloco.
+        :return: Gerador de DataFrames processados, prontos para o SIN.
+        """
+        if not self._csv_path:
+            raise ValueError("Caminho do CSV não fornecido.")
+        
+        # Os tempos de cada etapa são acumulados ao longo dos blocos
+        self._stage_timings = {'read': 0.0}
+        with pd.read_csv(self._csv_path, chunksize=chunk_size) as reader:
+            while True:
+                start_time = time.perf_counter()
+                chunk = next(reader, None)
+                self._stage_timings['read'] += time.perf_counter() - start_time
+                if chunk is None:
+                    break
+                yield self._process_data(chunk, downcast=downcast, timings=self._stage_timings)
+
+    def convert_to_columnar(self, output_path, chunk_size=100000, process=True):
+        """
+        Converte o arquivo CSV para o formato colunar binário (um `.npy` por coluna, em float32,
+        int32 ou uint8, mais um `manifest.json`), lendo o CSV em blocos.
+
+        :param output_path: Diretório de destino do conjunto de dados colunar.
+        :param chunk_size: Quantidade de linhas lidas por bloco.
+        :param process: Se True, cada bloco é processado como em `load_and_process_data`, e o
+                        conjunto gravado já fica pronto para o SIN; se False, as colunas do CSV são
+                        gravadas como estão.
+        :return: Dicionário do manifesto gravado.
+        """
+        if not self._csv_path:
+            raise ValueError("Caminho do CSV não fornecido.")
+
+        source = os.path.basename(self._csv_path)
+        if process:
+            return write_columnar(self.iter_processed_chunks(chunk_size=chunk_size), output_path, source=source)
+        with pd.read_csv(self._csv_path, chunksize=chunk_size) as reader:
+            return write_columnar(reader, output_path, source=source)
+
+    def load_columnar(self, path, columns=None):
+        """
+        Carrega um conjunto de dados gravado por `convert_to_columnar`, sem copiar os valores: as
+        colunas do DataFrame são os próprios arquivos mapeados em memória (somente leitura). O
+        carregamento é imediato, independentemente do tamanho, e processos que leem o mesmo conjunto
+        compartilham as páginas em memória.
+
+        :param path: Diretório do conjunto de dados colunar.
+        :param columns: Colunas a carregar (todas, se None).
+        :return: DataFrame com as colunas mapeadas.
+        """
+        start_time = time.perf_counter()
+        _, arrays = open_columnar(path, columns)
+        self._data = pd.DataFrame(arrays, copy=False)
+        self._stage_timings = {'read': time.perf_counter() - start_time}
+        return self._data
+
+    def _process_data(self, data, downcast=False, timings=None):
+        """
+        Detecta o tipo dos dados pelas colunas e calcula a velocidade relativa quando necessário.
+        Todas as etapas operam sobre colunas inteiras e alteram o DataFrame no próprio lugar.
+        
+        :param data: DataFrame lido do CSV (completo ou um bloco).
+        :param downcast: Se True, converte as colunas float64 para float32 ao final.
+        :param timings: Dicionário onde o tempo de cada etapa é acumulado (opcional).
+        :return: DataFrame processado, pronto para o SIN.
+        """
+        timings = timings if timings is not None else {}
+        start_time = time.perf_counter()
 
         # Verifica se os dados precisam de processamento (ou seja, são do tipo 2 ou 3)
-        if 'current_timestamp' in self._data.columns and 'next_timestamp' in self._data.columns:
+        if 'current_timestamp' in data.columns and 'next_timestamp' in data.columns:
             # Tipo 2: Processar para obter a velocidade relativa
-            self._data['front_speed'] = (self._data['initial_distance'] - self._data['final_distance']) / (self._data['next_timestamp'] - self._data['current_timestamp'])
-            self._data['relative_speed'] = self._data['speed'] - self._data['front_speed']
-            # Drop unnecessary columns
-            self._data = self._data.drop(columns=['current_timestamp', 'next_timestamp', 'initial_distance', 'final_distance', 'front_speed'])
-        elif 'distance' in self._data.columns and 'speed' in self._data.columns:
+            final_distance = data.pop('final_distance')
+            front_speed = (data.pop('initial_distance') - final_distance) / (data.pop('next_timestamp') - data.pop('current_timestamp'))
+            data['relative_speed'] = data['speed'] - front_speed
+            # A distância até o veículo da frente é a do último instante
+            data['distance'] = final_distance
+            # A coluna front_speed dos dados gerados não é mantida
+            if 'front_speed' in data.columns:
+                del data['front_speed']
+        elif 'distance' in data.columns and 'speed' in data.columns:
             # Tipo 3: Processar a velocidade relativa com base na distância segura
-            self._data['front_speed'] = self._data.apply(
-                lambda row: self._calculate_front_vehicle_speed_from_safe_distance(row['distance'], row['speed'] * 3.6), axis=1)
-            self._data['relative_speed'] = self._data['speed'] - (self._data['front_speed'] / 3.6)
-        
-        # Retorna o DataFrame processado
-        return self._data
+            data['front_speed'] = self._front_vehicle_speed_from_safe_distance(data['distance'].to_numpy(), data['speed'].to_numpy() * 3.6)
+            data['relative_speed'] = data['speed'] - (data['front_speed'] / 3.6)
+        timings['derive'] = timings.get('derive', 0.0) + time.perf_counter() - start_time
 
-    def balance_data(self, method="undersample"):
+        if downcast:
+            start_time = time.perf_counter()
+            for column in data.columns:
+                if data[column].dtype == np.float64:
+                    data[column] = data[column].astype(np.float32)
+            timings['downcast'] = timings.get('downcast', 0.0) + time.perf_counter() - start_time
+
+        return data
+
+    @property
+    def stage_timings(self):
+        """
+        Tempo (em segundos) de cada etapa do último carregamento: leitura, derivação e conversão de
+        tipos. No modo em blocos, os tempos são acumulados ao longo dos blocos já lidos.
+        """
+        return self._stage_timings
+
+    def balance_data(self, method="undersample", streaming=False, chunk_size=100000):
         """
         Aplica o balanceamento dos dados utilizando undersampling ou oversampling.
         
         :param method: Método de balanceamento ("undersample" ou "oversample").
+        :param streaming: Se True, usa o `StratifiedBalancer` em blocos de `chunk_size` linhas, com
+                          memória limitada ao tamanho do resultado, em vez do imblearn. Sem dados
+                          gerados ou carregados, os blocos são lidos do CSV (`csv_path`).
+        :param chunk_size: Quantidade de linhas por bloco no modo `streaming`.
         :return: DataFrame balanceado.
         """
+        if streaming:
+            balancer = StratifiedBalancer(method, seed=self._seed)
+            if self._data is not None:
+                data = self._data
+                return balancer.balance(lambda: (data.iloc[start:start + chunk_size] for start in range(0, len(data), chunk_size)))
+            if self._csv_path:
+                return balancer.balance(lambda: self.iter_processed_chunks(chunk_size=chunk_size))
+
         if self._data is None:
             raise ValueError("Os dados de teste ainda não foram gerados ou carregados. Chame 'generate_data_for_fis()' ou 'load_and_process_data()' antes de balancear.")
         
         X = self._data.drop(columns=['target'], errors='ignore')
         y = self._data['target'] if 'target' in self._data.columns else None
         
+        # O imblearn (e o scikit-learn) só é importado quando o balanceamento é usado
         if method == "undersample":
-            sampler = RandomUnderSampler()
+            from imblearn.under_sampling import RandomUnderSampler
+            sampler = RandomUnderSampler(random_state=self._seed)
         elif method == "oversample":
-            sampler = RandomOverSampler()
+            from imblearn.over_sampling import RandomOverSampler
+            sampler = RandomOverSampler(random_state=self._seed)
         else:
             raise ValueError("Método inválido. Escolha 'undersample' ou 'oversample'.")
         
@@ -205,4 +334,37 @@ class TestDataGenerator:
             # Se a distância é maior ou igual à distância segura, supomos que o carro da frente está na mesma velocidade
             front_car_speed_kmh = my_car_speed_kmh
         
-        return round(front_car_speed_kmh, 2)
\ No newline at end of file
+        return round(front_car_speed_kmh, 2)
+
+    @staticmethod
+    def _front_vehicle_speed_from_safe_distance(distance, my_car_speed_kmh):
+        """
+        Versão vetorizada de `_calculate_front_vehicle_speed_from_safe_distance`, com resultado idêntico.
+        
+        :param distance: Array com as distâncias até o carro da frente (em metros).
+        :param my_car_speed_kmh: Array com as velocidades do seu carro em km/h.
+        :return: Array com as velocidades estimadas do carro da frente em km/h.
+        """
+        # A distância segura é de 5 metros para cada 16 km/h de velocidade
+        safe_distance = 5 * (my_car_speed_kmh / 16)
+        
+        # Abaixo da distância segura o carro da frente está mais lento; acima, na mesma velocidade
+        front_car_speed_kmh = np.where(distance < safe_distance, (distance * 16) / 5, my_car_speed_kmh)
+        return TestDataGenerator._round_like_python(front_car_speed_kmh, 2)
+
+    @staticmethod
+    def _round_like_python(values, decimals):
+        """
+        Arredonda como o `round` do Python. O `np.round` pode divergir quando o valor está muito
+        próximo da metade da última casa, e somente esses casos são refeitos com `round`.
+        
+        :param values: Array do NumPy.
+        :param decimals: Quantidade de casas decimais.
+        :return: Array arredondado.
+        """
+        rounded = np.round(values, decimals)
+        scaled = values * 10 ** decimals
+        ambiguous = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+        if ambiguous.any():
+            rounded[ambiguous] = [round(value, decimals) for value in values[ambiguous].tolist()]
+        return rounded
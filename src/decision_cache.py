@@ -0,0 +1,106 @@
+import math
+import threading
+from collections import OrderedDict
+
+
+class DecisionCache:
+    """
+    Cache LRU limitado para as decisões de `VehicleOvertakeSystem.simulate`.
+
+    As entradas são quantizadas com um passo fixo antes de formar a chave, de modo que
+    valores que diferem apenas abaixo do passo compartilham o mesmo resultado. A decisão
+    armazenada é sempre a calculada para a entrada já quantizada.
+    """
+
+    def __init__(self, input_names, max_size=100000, step=0.01):
+        """
+        :param input_names: Nomes das entradas que compõem a chave, em ordem.
+        :param max_size: Quantidade máxima de decisões armazenadas.
+        :param step: Passo de quantização das entradas (0.01 equivale a arredondar para 2 casas).
+        """
+        if max_size <= 0:
+            raise ValueError("O tamanho máximo do cache deve ser positivo.")
+        if step <= 0:
+            raise ValueError("O passo de quantização deve ser positivo.")
+
+        self._input_names = list(input_names)
+        self._max_size = max_size
+        self._step = step
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def quantize(self, inputs):
+        """
+        Quantiza as entradas no passo configurado.
+
+        Entradas com algum valor NaN ou infinito não são quantizadas nem armazenadas: a chave é None
+        e as entradas são retornadas como estão, para serem avaliadas sem o cache.
+
+        :param inputs: Dicionário com um valor por entrada.
+        :return: Tupla (chave do cache ou None, dicionário com as entradas quantizadas).
+        """
+        values = [float(inputs[name]) for name in self._input_names]
+        if not all(map(math.isfinite, values)):
+            return None, inputs
+        key = tuple(int(round(value / self._step)) for value in values)
+        quantized = {name: index * self._step for name, index in zip(self._input_names, key)}
+        return key, quantized
+
+    def get(self, key):
+        """
+        Busca uma decisão no cache, atualizando os contadores e a ordem de uso.
+
+        :param key: Chave retornada por `quantize`.
+        :return: Tupla (encontrado, decisão).
+        """
+        with self._lock:
+            try:
+                value = self._entries[key]
+            except KeyError:
+                self._misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return True, value
+
+    def put(self, key, value):
+        """
+        Armazena uma decisão, removendo a menos usada recentemente se o cache estiver cheio.
+
+        :param key: Chave retornada por `quantize`.
+        :param value: Decisão calculada.
+        """
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self):
+        """
+        Invalida todas as decisões armazenadas (por exemplo, após mudança nas funções de pertinência ou nas regras).
+        """
+        with self._lock:
+            self._entries.clear()
+            self._invalidations += 1
+
+    @property
+    def stats(self):
+        """
+        Contadores do cache: acertos, faltas, remoções por LRU, invalidações e ocupação.
+        """
+        with self._lock:
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions,
+                'invalidations': self._invalidations,
+                'size': len(self._entries),
+                'max_size': self._max_size,
+                'step': self._step
+            }
@@ -0,0 +1,261 @@
+import asyncio
+import time
+from collections import OrderedDict, deque
+import numpy as np
+from src.data_generator import TestDataGenerator
+
+
+class OvertakeDecisionService:
+    def __init__(self, system, max_batch_size=1024, max_delay=0.005, latency_window=100000, max_tracks=100000,
+                 track_ttl=300.0):
+        """
+        Serviço assíncrono de decisões em tempo real sobre quadros de sensores com timestamp.
+
+        Os quadros pendentes são agrupados em micro-lotes e avaliados com uma única chamada de
+        `simulate_batch`. Um lote é enviado quando atinge `max_batch_size` quadros ou quando o
+        quadro mais antigo já esperou `max_delay` segundos.
+
+        :param system: Instância de `VehicleOvertakeSystem`.
+        :param max_batch_size: Quantidade máxima de quadros por lote.
+        :param max_delay: Tempo máximo (em segundos) que um quadro espera pela formação do lote.
+        :param latency_window: Quantidade de latências recentes usadas nos percentis.
+        :param max_tracks: Quantidade máxima de veículos acompanhados; acima dela, o estado do
+                           veículo atualizado há mais tempo é descartado.
+        :param track_ttl: Tempo (em segundos) sem novos quadros após o qual o estado de um veículo
+                          é descartado (None mantém o estado até `forget` ou o limite de `max_tracks`).
+        """
+        self._system = system
+        self._max_batch_size = max_batch_size
+        self._max_delay = max_delay
+        self._queue = None
+        self._worker = None
+        # Último (timestamp, distância, instante da atualização) de cada veículo acompanhado, do
+        # atualizado há mais tempo para o mais recente
+        self._tracks = OrderedDict()
+        self._max_tracks = max_tracks
+        self._track_ttl = track_ttl
+        self._latencies = deque(maxlen=latency_window)
+        self._batches = 0
+        self._frames = 0
+
+    async def start(self):
+        """
+        Inicia a tarefa que forma e avalia os micro-lotes.
+        """
+        if self._worker is not None:
+            raise RuntimeError("O serviço já foi iniciado.")
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """
+        Avalia os quadros ainda pendentes e encerra o serviço.
+        """
+        if self._worker is None:
+            return
+        await self._queue.put(None)
+        await self._worker
+        self._worker = None
+
+    async def submit(self, frame):
+        """
+        Envia um quadro e aguarda a decisão de ultrapassagem correspondente.
+
+        O quadro deve conter 'vehicle_id', 'next_timestamp', 'final_distance', 'speed', 'road',
+        'visibility' e 'permission'. Se trouxer também 'current_timestamp' e 'initial_distance',
+        a velocidade do carro da frente é calculada a partir deles, como em `load_and_process_data`;
+        caso contrário, é usada a última observação do mesmo veículo. No primeiro quadro de um
+        veículo sem histórico (ou com o histórico expirado), a velocidade do carro da frente é
+        estimada pela distância segura. Quadros atrasados, com timestamp igual ou anterior ao da
+        última observação, não alteram o histórico do veículo.
+
+        :param frame: Dicionário com os campos do quadro.
+        :return: Decisão de ultrapassagem.
+        """
+        if self._worker is None:
+            raise RuntimeError("O serviço não foi iniciado. Chame 'start()' antes de enviar quadros.")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((frame, future, time.perf_counter()))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is None:
+                break
+            batch = [item]
+            deadline = item[2] + self._max_delay
+            while len(batch) < self._max_batch_size:
+                timeout = deadline - time.perf_counter()
+                try:
+                    item = self._queue.get_nowait() if timeout <= 0 else await asyncio.wait_for(self._queue.get(), timeout)
+                except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            try:
+                inputs = self._build_inputs([frame for frame, _, _ in batch])
+                # A avaliação roda em uma thread para não bloquear o recebimento de novos quadros
+                decisions = await loop.run_in_executor(None, self._system.simulate_batch, inputs)
+            except Exception as error:
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(error)
+                continue
+
+            finished = time.perf_counter()
+            for (_, future, received), decision in zip(batch, decisions):
+                if not future.done():
+                    future.set_result(float(decision))
+                self._latencies.append(finished - received)
+            self._batches += 1
+            self._frames += len(batch)
+
+    def _build_inputs(self, frames):
+        """
+        Atualiza o estado de cada veículo e monta as colunas de entrada do sistema nebuloso.
+
+        :param frames: Lista de quadros na ordem de chegada.
+        :return: Dicionário de arrays com as entradas do sistema.
+        """
+        now = time.monotonic()
+        self._expire_tracks(now)
+        size = len(frames)
+        distance = np.empty(size)
+        speed = np.empty(size)
+        front_speed = np.full(size, np.nan)
+        for index, frame in enumerate(frames):
+            timestamp = frame['next_timestamp']
+            distance[index] = frame['final_distance']
+            speed[index] = frame['speed']
+            track = self._tracks.get(frame['vehicle_id'])
+            if 'initial_distance' in frame and 'current_timestamp' in frame:
+                previous = (frame['current_timestamp'], frame['initial_distance'])
+            else:
+                previous = track
+            if previous is not None and timestamp > previous[0]:
+                front_speed[index] = (previous[1] - distance[index]) / (timestamp - previous[0])
+            # Apenas quadros mais recentes que a última observação atualizam o histórico
+            if track is None or timestamp > track[0]:
+                self._tracks[frame['vehicle_id']] = (timestamp, distance[index], now)
+                self._tracks.move_to_end(frame['vehicle_id'])
+        while len(self._tracks) > self._max_tracks:
+            self._tracks.popitem(last=False)
+
+        # Sem histórico, estima a velocidade do carro da frente pela distância segura (em m/s)
+        unknown = np.isnan(front_speed)
+        if unknown.any():
+            front_speed[unknown] = TestDataGenerator._front_vehicle_speed_from_safe_distance(
+                distance[unknown], speed[unknown] * 3.6) / 3.6
+
+        return {
+            'distance': distance,
+            'relative_speed': speed - front_speed,
+            'permission': np.array([frame['permission'] for frame in frames], dtype=np.float64),
+            'road': np.array([frame['road'] for frame in frames], dtype=np.float64),
+            'visibility': np.array([frame['visibility'] for frame in frames], dtype=np.float64)
+        }
+
+    def _expire_tracks(self, now):
+        if self._track_ttl is None:
+            return
+        # Os veículos estão em ordem de atualização: os expirados ficam no início
+        while self._tracks and now - next(iter(self._tracks.values()))[2] > self._track_ttl:
+            self._tracks.popitem(last=False)
+
+    def forget(self, vehicle_id):
+        """
+        Remove o estado de um veículo que deixou de ser acompanhado.
+
+        :param vehicle_id: Identificador do veículo.
+        """
+        self._tracks.pop(vehicle_id, None)
+
+    @property
+    def stats(self):
+        """
+        Latência das decisões (p50/p95/p99/média/máxima, em milissegundos), lotes avaliados,
+        tamanho médio dos lotes e quantidade de veículos acompanhados.
+        """
+        stats = {
+            'frames': self._frames,
+            'batches': self._batches,
+            'mean_batch_size': self._frames / self._batches if self._batches else 0.0,
+            'tracked_vehicles': len(self._tracks)
+        }
+        if self._latencies:
+            latencies = np.array(self._latencies) * 1000
+            p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+            stats.update({
+                'p50_ms': float(p50),
+                'p95_ms': float(p95),
+                'p99_ms': float(p99),
+                'mean_ms': float(latencies.mean()),
+                'max_ms': float(latencies.max())
+            })
+        return stats
+
+
+class LoadGenerator:
+    def __init__(self, vehicles=100, frames=10000, seed=None):
+        """
+        Gerador de carga local para o `OvertakeDecisionService`, a partir de `TestDataGenerator`.
+
+        Cada linha de `generate_complete_vehicle_data` vira um quadro de um dos veículos, com
+        timestamps crescentes por veículo. Só o primeiro quadro de cada veículo traz
+        'current_timestamp' e 'initial_distance'; nos demais o serviço usa o estado do veículo.
+
+        :param vehicles: Quantidade de veículos acompanhados.
+        :param frames: Quantidade total de quadros.
+        :param seed: Semente do gerador de dados (opcional).
+        """
+        data = TestDataGenerator(quantity=frames, seed=seed).generate_complete_vehicle_data()
+        vehicle_id = np.arange(frames) % vehicles
+        step = (data['next_timestamp'] - data['current_timestamp']).to_numpy()
+        next_timestamp = data['current_timestamp'].to_numpy()[vehicle_id] + data.assign(step=step).groupby(vehicle_id)['step'].cumsum().to_numpy()
+
+        self._frames = []
+        for index, row in enumerate(data.to_dict('records')):
+            frame = {
+                'vehicle_id': int(vehicle_id[index]),
+                'next_timestamp': int(next_timestamp[index]),
+                'final_distance': row['final_distance'],
+                'speed': row['speed'],
+                'permission': row['permission'],
+                'road': row['road'],
+                'visibility': row['visibility']
+            }
+            if index < vehicles:
+                frame['current_timestamp'] = int(next_timestamp[index] - step[index])
+                frame['initial_distance'] = row['initial_distance']
+            self._frames.append(frame)
+
+    async def run(self, service, rate=None):
+        """
+        Envia todos os quadros ao serviço e aguarda as decisões.
+
+        :param service: `OvertakeDecisionService` já iniciado.
+        :param rate: Quadros por segundo; None envia todos os quadros o mais rápido possível.
+        :return: Dicionário com quadros, segundos, decisões/s e as estatísticas do serviço.
+        """
+        start_time = time.perf_counter()
+        tasks = []
+        for index, frame in enumerate(self._frames):
+            if rate:
+                delay = start_time + index / rate - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(service.submit(frame)))
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - start_time
+        return {
+            'frames': len(self._frames),
+            'seconds': elapsed,
+            'decisions_per_sec': len(self._frames) / elapsed if elapsed > 0 else float('inf'),
+            'service': service.stats
+        }
@@ -1,33 +1,141 @@
-import matplotlib.pyplot as plt
-import seaborn as sns
-from sklearn.metrics import confusion_matrix, accuracy_score, precision_score, recall_score, f1_score
+import numpy as np
+
+class MetricsAccumulator:
+    def __init__(self, threshold=0.5, keep_scores=True):
+        """
+        Acumula as métricas de classificação bloco a bloco, sem manter listas em Python.
+
+        A matriz de confusão no threshold fixo é mantida por contagens. Com `keep_scores`, as
+        predições contínuas também são guardadas (float64 + rótulo) para a varredura de thresholds.
+
+        :param threshold: Threshold usado para converter as predições contínuas em binárias.
+        :param keep_scores: Se True, guarda as predições para permitir `threshold_sweep()`.
+        """
+        self._threshold = threshold
+        self._keep_scores = keep_scores
+        self._counts = np.zeros(4, dtype=np.int64)  # tn, fp, fn, tp
+        self._scores = []
+        self._labels = []
+
+    def update(self, y_true, y_pred):
+        """
+        Acrescenta um bloco de valores verdadeiros e predições contínuas.
+
+        :param y_true: Valores verdadeiros (0 ou 1); outros valores geram `ValueError`.
+        :param y_pred: Predições contínuas do sistema; NaN é tratado como não ultrapassar.
+        """
+        y_true = np.asarray(y_true)
+        y_pred = np.asarray(y_pred, dtype=np.float64)
+        if y_true.shape != y_pred.shape:
+            raise ValueError("y_true e y_pred devem ter o mesmo tamanho.")
+        # Rótulos fora de {0, 1} sairiam da matriz de confusão sem aviso
+        invalid = ~np.isin(y_true, (0, 1))
+        if invalid.any():
+            raise ValueError(f"y_true deve conter apenas 0 e 1; valores encontrados: {np.unique(y_true[invalid])[:10].tolist()}")
+        y_true = y_true.astype(np.int64, copy=False)
+
+        y_pred_binary = y_pred >= self._threshold
+        self._counts += np.bincount(2 * y_true + y_pred_binary, minlength=4)[:4]
+        if self._keep_scores:
+            self._scores.append(np.nan_to_num(y_pred, nan=-np.inf))
+            self._labels.append(y_true.astype(bool))
+
+    def confusion_matrix(self):
+        """
+        :return: Matriz de confusão 2x2 no formato [[tn, fp], [fn, tp]].
+        """
+        return self._counts.reshape(2, 2).copy()
+
+    def metrics(self):
+        """
+        Calcula as métricas no threshold fixo a partir das contagens acumuladas.
+
+        :return: Matriz de confusão, acurácia, precisão, recall e F1-score.
+        """
+        tn, fp, fn, tp = (int(count) for count in self._counts)
+        total = tn + fp + fn + tp
+        accuracy = (tp + tn) / total if total else 0.0
+        precision = tp / (tp + fp) if tp + fp else 0.0
+        recall = tp / (tp + fn) if tp + fn else 0.0
+        f1 = 2 * tp / (2 * tp + fp + fn) if tp + fp + fn else 0.0
+        return self.confusion_matrix(), accuracy, precision, recall, f1
+
+    def threshold_sweep(self):
+        """
+        Calcula precisão, recall, F1-score e acurácia em todos os thresholds em uma única passada:
+        as predições são ordenadas uma vez e as contagens saem de somas acumuladas. Cada threshold
+        é um valor distinto de predição (prediz 1 quando a predição é maior ou igual a ele).
+
+        :return: Dicionário de arrays: thresholds, tp, fp, fn, tn, precision, recall, f1 e accuracy.
+        """
+        if not self._keep_scores:
+            raise ValueError("A varredura de thresholds requer keep_scores=True.")
+        scores = np.concatenate(self._scores) if self._scores else np.empty(0, dtype=np.float64)
+        labels = np.concatenate(self._labels) if self._labels else np.empty(0, dtype=bool)
+        finite = np.isfinite(scores)
+        positives = int(labels.sum())
+        negatives = len(labels) - positives
+
+        order = np.argsort(-scores[finite], kind='stable')
+        sorted_scores = scores[finite][order]
+        sorted_labels = labels[finite][order]
+        tp_cumulative = np.cumsum(sorted_labels)
+        fp_cumulative = np.cumsum(~sorted_labels)
+
+        # Último índice de cada valor distinto: ali estão todas as linhas com predição >= threshold
+        last = np.flatnonzero(np.diff(sorted_scores, append=-np.inf))
+        tp = tp_cumulative[last].astype(np.int64)
+        fp = fp_cumulative[last].astype(np.int64)
+        fn = positives - tp
+        tn = negatives - fp
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            precision = np.where(tp + fp > 0, tp / (tp + fp), 0.0)
+            recall = np.where(positives > 0, tp / max(positives, 1), 0.0)
+            f1 = np.where(2 * tp + fp + fn > 0, 2 * tp / (2 * tp + fp + fn), 0.0)
+        accuracy = (tp + tn) / len(labels) if len(labels) else np.zeros(len(tp))
+
+        return {
+            'thresholds': sorted_scores[last],
+            'tp': tp, 'fp': fp, 'fn': fn, 'tn': tn,
+            'precision': precision, 'recall': recall, 'f1': f1, 'accuracy': accuracy
+        }
+
+    def best_threshold(self, metric='f1'):
+        """
+        Threshold que maximiza uma métrica da varredura.
+
+        :param metric: 'f1', 'accuracy', 'precision' ou 'recall'.
+        :return: Tupla (threshold, valor da métrica).
+        """
+        sweep = self.threshold_sweep()
+        if len(sweep['thresholds']) == 0:
+            raise ValueError("Nenhuma predição acumulada.")
+        index = int(np.argmax(sweep[metric]))
+        return float(sweep['thresholds'][index]), float(sweep[metric][index])
 
 class EvaluationMetrics:
     def __init__(self, y_true, y_pred):
         self._y_true = y_true
         self._y_pred = y_pred
 
-    def evaluate(self):
+    def evaluate(self, plot=True, block=False, save_path=None):
         """
         Avalia as predições em relação aos valores verdadeiros utilizando várias métricas.
         Converte as predições contínuas para binárias e exibe a matriz de confusão, acurácia, precisão, recall e F1-score.
-        
+
+        :param plot: Se False, não gera o gráfico da matriz de confusão (útil em execuções em lote).
+        :param block: Se True, a exibição do gráfico bloqueia a execução até a janela ser fechada
+                      (padrão: False, não bloqueia).
+        :param save_path: Se informado, salva o gráfico nesse arquivo em vez de exibi-lo.
         :return: Matriz de confusão, acurácia, precisão, recall, e F1-score.
         """
-        # Limpeza e transformação dos dados
-        # Convertendo as predições contínuas para valores binários (0 ou 1) com base em um threshold de 0.5
-        y_pred_binary = [1 if pred >= 0.5 else 0 for pred in self._y_pred]
-        y_true_binary = [int(val) for val in self._y_true]  # Garantir que o y_true esteja em formato binário
-        
-        # Calcula a matriz de confusão
-        cm = confusion_matrix(y_true_binary, y_pred_binary)
-        
-        # Calcula as métricas de avaliação
-        accuracy = accuracy_score(y_true_binary, y_pred_binary)
-        precision = precision_score(y_true_binary, y_pred_binary, average='binary')
-        recall = recall_score(y_true_binary, y_pred_binary, average='binary')
-        f1 = f1_score(y_true_binary, y_pred_binary, average='binary')
-        
+        # Convertendo as predições contínuas para valores binários com base em um threshold de 0.5,
+        # em uma única passada vetorizada
+        accumulator = MetricsAccumulator(threshold=0.5, keep_scores=False)
+        accumulator.update(self._y_true, self._y_pred)
+        cm, accuracy, precision, recall, f1 = accumulator.metrics()
+
         # Exibe os resultados
         print("Confusion Matrix:")
         print(cm)
@@ -35,13 +143,43 @@ class EvaluationMetrics:
         print(f"Precision: {precision:.2f}")
         print(f"Recall: {recall:.2f}")
         print(f"F1-Score: {f1:.2f}")
-        
-        # Gerar o gráfico da matriz de confusão
+
+        if plot:
+            self.plot_confusion_matrix(cm, block=block, save_path=save_path)
+
+        return cm, accuracy, precision, recall, f1
+
+    def threshold_sweep(self):
+        """
+        Calcula as métricas em todos os thresholds distintos das predições.
+
+        :return: Dicionário de arrays, como em `MetricsAccumulator.threshold_sweep`.
+        """
+        accumulator = MetricsAccumulator()
+        accumulator.update(self._y_true, self._y_pred)
+        return accumulator.threshold_sweep()
+
+    @staticmethod
+    def plot_confusion_matrix(cm, block=False, save_path=None):
+        """
+        Gera o gráfico da matriz de confusão.
+
+        :param cm: Matriz de confusão 2x2.
+        :param block: Se True, a exibição do gráfico bloqueia a execução até a janela ser fechada
+                      (padrão: False, não bloqueia).
+        :param save_path: Se informado, salva o gráfico nesse arquivo em vez de exibi-lo.
+        """
+        # Importados apenas ao plotar, para que as métricas não carreguem as bibliotecas de gráficos
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+
         plt.figure(figsize=(6, 4))
         sns.heatmap(cm, annot=True, fmt='d', cmap='Blues', xticklabels=['Não', 'Sim'], yticklabels=['Não', 'Sim'])
         plt.title('Matriz de Confusão')
         plt.xlabel('Predito')
         plt.ylabel('Real')
-        plt.show()
-
-        return cm, accuracy, precision, recall, f1
\ No newline at end of file
+        if save_path is not None:
+            plt.savefig(save_path)
+            plt.close()
+        else:
+            plt.show(block=block)
@@ -0,0 +1,305 @@
+import functools
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import numpy as np
+
+DEFAULT_CONFIG = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'config', 'overtake_system.json')
+
+
+def load_config(path):
+    """
+    Lê o arquivo de configuração das variáveis, termos e regras.
+
+    :param path: Caminho de um arquivo JSON (.json) ou YAML (.yaml/.yml). O YAML requer o PyYAML.
+    :return: Dicionário com a configuração.
+    """
+    with open(path, encoding='utf-8') as file:
+        if os.path.splitext(path)[1].lower() in ('.yaml', '.yml'):
+            try:
+                import yaml
+            except ImportError:
+                raise ImportError("Instale o PyYAML para usar configurações em YAML (pip install pyyaml).") from None
+            return yaml.safe_load(file)
+        return json.load(file)
+
+
+class CompiledRuleBase:
+    """
+    Base de regras e funções de pertinência compiladas em matrizes densas do NumPy.
+
+    A configuração (ver `config/overtake_system.json`) define as variáveis de entrada, a variável
+    de saída, os termos de cada uma (nome da função de pertinência do skfuzzy e parâmetros) e as
+    regras. A compilação amostra cada termo no universo da variável e representa as regras por
+    matrizes:
+
+    - `mf.<variável>`: pertinência de cada termo (termos x pontos do universo);
+    - `rule_terms`: regras x termos de entrada, com a posição (a partir de 1) do termo no
+      antecedente da regra, negativa quando o termo é negado, e 0 quando não é usado;
+    - `rule_any`: True quando os termos da regra são combinados por OU (máximo), e não por E;
+    - `rule_outputs`: regras x termos de saída, com o peso de cada consequente.
+
+    O resultado é gravado em disco, um `.npy` por matriz mais um `manifest.json`, em um diretório
+    cujo nome é o hash do conteúdo da configuração. As cargas seguintes mapeiam os arquivos em
+    memória, sem amostrar os termos nem importar o skfuzzy.
+    """
+
+    FORMAT_VERSION = 1
+
+    def __init__(self, manifest, arrays):
+        """
+        :param manifest: Dicionário com os nomes das variáveis, termos e regras.
+        :param arrays: Dicionário {nome: array} com as matrizes compiladas.
+        """
+        self._manifest = manifest
+        self._arrays = arrays
+        self._term_keys = [(name, label) for name, labels in manifest['inputs'].items() for label in labels]
+
+    @staticmethod
+    def config_hash(config):
+        """
+        Hash do conteúdo da configuração, independente da formatação e do formato do arquivo.
+
+        :param config: Dicionário com a configuração.
+        :return: Texto hexadecimal SHA-256.
+        """
+        canonical = json.dumps({'format': CompiledRuleBase.FORMAT_VERSION, 'config': config},
+                               sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    @classmethod
+    def load(cls, config_path=None, cache_dir=None):
+        """
+        Carrega a base de regras compilada, compilando e gravando no cache se necessário.
+
+        :param config_path: Arquivo JSON/YAML da configuração (padrão: `DEFAULT_CONFIG`).
+        :param cache_dir: Diretório do cache (padrão: `.compiled` ao lado do arquivo de configuração).
+        :return: `CompiledRuleBase` com as matrizes mapeadas em memória (somente leitura).
+        """
+        config_path = config_path or DEFAULT_CONFIG
+        config = load_config(config_path)
+        cache_dir = cache_dir or os.path.join(os.path.dirname(os.path.abspath(config_path)), '.compiled')
+        directory = os.path.join(cache_dir, cls.config_hash(config))
+        if not os.path.exists(os.path.join(directory, 'manifest.json')):
+            cls.compile(config).save(directory)
+        return cls.open(directory)
+
+    @classmethod
+    def open(cls, directory):
+        """
+        Abre uma base de regras gravada com `save`, mapeando as matrizes em memória.
+
+        :param directory: Diretório com o `manifest.json` e os arquivos `.npy`.
+        :return: `CompiledRuleBase`.
+        """
+        with open(os.path.join(directory, 'manifest.json'), encoding='utf-8') as file:
+            manifest = json.load(file)
+        if manifest.get('format') != cls.FORMAT_VERSION:
+            raise ValueError(f"Versão de formato não suportada em '{directory}': {manifest.get('format')}")
+        cls._check_defuzzify(manifest['output']['name'], manifest['output']['defuzzify'])
+        arrays = {name: np.load(os.path.join(directory, f'{name}.npy'), mmap_mode='r') for name in manifest['arrays']}
+        return cls(manifest, arrays)
+
+    def save(self, directory):
+        """
+        Grava as matrizes e o manifesto. A gravação é feita em um diretório temporário renomeado ao
+        final, de modo que processos concorrentes nunca leem um cache incompleto.
+
+        :param directory: Diretório de destino.
+        """
+        parent = os.path.dirname(os.path.abspath(directory))
+        os.makedirs(parent, exist_ok=True)
+        temporary = tempfile.mkdtemp(dir=parent)
+        try:
+            for name, array in self._arrays.items():
+                np.save(os.path.join(temporary, f'{name}.npy'), np.asarray(array))
+            with open(os.path.join(temporary, 'manifest.json'), 'w', encoding='utf-8') as file:
+                json.dump(self._manifest, file, indent=2, ensure_ascii=False)
+            os.replace(temporary, directory)
+        except OSError:
+            # Outro processo gravou o mesmo cache primeiro
+            if not os.path.exists(os.path.join(directory, 'manifest.json')):
+                raise
+        finally:
+            shutil.rmtree(temporary, ignore_errors=True)
+
+    @classmethod
+    def compile(cls, config):
+        """
+        Compila a configuração em matrizes densas, amostrando os termos com as funções de
+        pertinência do skfuzzy.
+
+        :param config: Dicionário com a configuração (ver `load_config`).
+        :return: `CompiledRuleBase` em memória.
+        """
+        import skfuzzy.membership as membership
+
+        def sample(name, variable):
+            universe = np.arange(*variable['universe'], dtype=np.float64)
+            mfs = []
+            for label, (kind, params) in variable['terms'].items():
+                if kind not in membership.__all__:
+                    raise ValueError(f"Função de pertinência desconhecida em '{name}.{label}': {kind}")
+                mfs.append(getattr(membership, kind)(universe, params))
+            return universe, np.array(mfs, dtype=np.float64)
+
+        arrays = {}
+        inputs = {}
+        for name, variable in config['inputs'].items():
+            arrays[f'universe.{name}'], arrays[f'mf.{name}'] = sample(name, variable)
+            inputs[name] = list(variable['terms'])
+        output = config['output']
+        defuzzify = output.get('defuzzify', 'centroid')
+        cls._check_defuzzify(output['name'], defuzzify)
+        arrays['universe.output'], arrays['mf.output'] = sample(output['name'], output)
+        output_terms = list(output['terms'])
+
+        term_keys = [(name, label) for name, labels in inputs.items() for label in labels]
+        rules = config['rules']
+        rule_terms = np.zeros((len(rules), len(term_keys)), dtype=np.int8)
+        rule_any = np.zeros(len(rules), dtype=bool)
+        rule_outputs = np.zeros((len(rules), len(output_terms)), dtype=np.float64)
+        for index, rule in enumerate(rules):
+            condition = rule['if']
+            if isinstance(condition, dict) and ('all' in condition or 'any' in condition):
+                group, literals = cls._group(condition, index)
+                rule_any[index] = group == 'any'
+            else:
+                literals = [condition]
+            for position, literal in enumerate(literals, start=1):
+                negated = isinstance(literal, dict) and 'not' in literal
+                if negated and len(literal) != 1:
+                    raise ValueError(f"Condição não suportada na regra {index + 1}: {literal!r}.")
+                key = cls._literal_key(literal['not'] if negated else literal, index)
+                if key not in term_keys:
+                    raise ValueError(f"Termo desconhecido na regra {index + 1}: {key[0]}.{key[1]}")
+                column = term_keys.index(key)
+                if rule_terms[index, column]:
+                    # A matriz guarda uma única posição por termo e regra
+                    raise ValueError(f"Termo repetido na regra {index + 1}: {key[0]}.{key[1]}")
+                rule_terms[index, column] = -position if negated else position
+            then = rule['then']
+            for label, weight in ({then: 1.0} if isinstance(then, str) else then).items():
+                if label not in output_terms:
+                    raise ValueError(f"Termo de saída desconhecido na regra {index + 1}: {label}")
+                rule_outputs[index, output_terms.index(label)] = weight
+        arrays.update(rule_terms=rule_terms, rule_any=rule_any, rule_outputs=rule_outputs)
+
+        manifest = {
+            'format': cls.FORMAT_VERSION,
+            'hash': cls.config_hash(config),
+            'inputs': inputs,
+            'output': {
+                'name': output['name'],
+                'terms': output_terms,
+                'shapes': {label: [kind, list(params)] for label, (kind, params) in output['terms'].items()},
+                'defuzzify': defuzzify
+            },
+            'rule_descriptions': [rule.get('description', '') for rule in rules],
+            'arrays': list(arrays)
+        }
+        return cls(manifest, arrays)
+
+    @staticmethod
+    def _check_defuzzify(name, method):
+        # O motor em lote e o InferenceModel implementam apenas o centroide; aceitar outro método
+        # faria `simulate` ignorá-lo e `InferenceModel.from_config` recusá-lo
+        if method != 'centroid':
+            raise ValueError(f"Defuzzificação não suportada em '{name}': {method}. Apenas 'centroid' é suportada.")
+
+    @staticmethod
+    def _group(condition, index):
+        """
+        Combinação ('all' ou 'any') e lista de termos de uma condição com um único grupo, sem grupos aninhados.
+        """
+        group, literals = next(iter(condition.items()))
+        if len(condition) != 1 or not isinstance(literals, list) or not literals:
+            raise ValueError(f"Condição não suportada na regra {index + 1}: {condition!r}. Use uma única "
+                             f"lista 'all' ou 'any' de termos.")
+        return group, literals
+
+    @staticmethod
+    def _literal_key(literal, index):
+        if not isinstance(literal, dict) or len(literal) != 1 or {'all', 'any', 'not'} & set(literal):
+            raise ValueError(f"Condição não suportada na regra {index + 1}: {literal!r}. Use um termo "
+                             f"({{variável: termo}}), sua negação ({{'not': ...}}) ou uma lista 'all'/'any' de termos.")
+        (name, label), = literal.items()
+        return name, label
+
+    @property
+    def config_id(self):
+        """
+        Hash do conteúdo da configuração que originou a base compilada.
+        """
+        return self._manifest['hash']
+
+    @property
+    def input_names(self):
+        return list(self._manifest['inputs'])
+
+    @property
+    def output_name(self):
+        return self._manifest['output']['name']
+
+    @property
+    def output_shapes(self):
+        """
+        Dicionário {termo de saída: (tipo, parâmetros)}, como definido na configuração.
+        """
+        return {label: (kind, params) for label, (kind, params) in self._manifest['output']['shapes'].items()}
+
+    @property
+    def defuzzify_method(self):
+        return self._manifest['output']['defuzzify']
+
+    @property
+    def rule_descriptions(self):
+        return list(self._manifest['rule_descriptions'])
+
+    @property
+    def arrays(self):
+        return dict(self._arrays)
+
+    def variable(self, name):
+        """
+        Universo e pertinência de cada termo de uma variável de entrada ou da saída.
+
+        :param name: Nome da variável.
+        :return: Tupla (universo, {termo: pertinência}).
+        """
+        if name == self.output_name:
+            labels, key = self._manifest['output']['terms'], 'output'
+        else:
+            labels, key = self._manifest['inputs'][name], name
+        mfs = self._arrays[f'mf.{key}']
+        return self._arrays[f'universe.{key}'], {label: mfs[index] for index, label in enumerate(labels)}
+
+    def rules(self):
+        """
+        Regras na forma de árvore usada pelo `BatchInferenceEngine`: ('term', variável, termo),
+        ('not', nó) e ('and' | 'or', nó, nó), na ordem dos termos do arquivo de configuração.
+
+        :return: Lista de tuplas (antecedente, lista de (índice do termo de saída, peso)).
+        """
+        compiled = []
+        for positions, use_any, weights in zip(self._arrays['rule_terms'], self._arrays['rule_any'], self._arrays['rule_outputs']):
+            columns = sorted(np.flatnonzero(positions), key=lambda column: abs(positions[column]))
+            literals = []
+            for column in columns:
+                node = ('term',) + self._term_keys[column]
+                literals.append(node if positions[column] > 0 else ('not', node))
+            kind = 'or' if use_any else 'and'
+            antecedent = functools.reduce(lambda left, right: (kind, left, right), literals)
+            consequents = [(int(index), float(weights[index])) for index in np.flatnonzero(weights)]
+            compiled.append((antecedent, consequents))
+        return compiled
+
+    def to_engine(self):
+        """
+        :return: `BatchInferenceEngine` construído diretamente das matrizes, sem objetos do skfuzzy.
+        """
+        from src.batch_inference import BatchInferenceEngine
+
+        return BatchInferenceEngine.from_rule_base(self)
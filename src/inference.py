@@ -0,0 +1,100 @@
+import pickle
+
+
+class InferenceModel:
+    """
+    Modelo de inferência compilado, para processos que só precisam calcular decisões.
+
+    Guarda o `BatchInferenceEngine` (e o defuzzificador analítico, se estiver ativo) já compilado
+    a partir de um `VehicleOvertakeSystem`. Carregar o modelo importa apenas o NumPy e os módulos
+    do motor compilado: o skfuzzy.control (que carrega o matplotlib e o networkx), o pandas e as
+    bibliotecas de gráficos, métricas e balanceamento não são importados.
+    """
+
+    def __init__(self, engine, defuzzifier=None):
+        """
+        :param engine: `BatchInferenceEngine` compilado.
+        :param defuzzifier: `AnalyticalDefuzzifier` opcional; None usa o centroide amostrado.
+        """
+        self._engine = engine
+        self._defuzzifier = defuzzifier
+        self._source = None
+
+    @classmethod
+    def from_config(cls, config_path=None, cache_dir=None, analytical=False):
+        """
+        Cria o modelo diretamente da configuração compilada (ver `CompiledRuleBase.load`), sem
+        importar o skfuzzy quando o cache já existe.
+
+        Um modelo criado assim é serializado apenas pela referência à configuração: ao recebê-lo,
+        cada processo worker mapeia em memória as matrizes do cache, em vez de receber uma cópia.
+
+        :param config_path: Arquivo JSON/YAML da configuração (padrão: `config/overtake_system.json`).
+        :param cache_dir: Diretório do cache da configuração compilada.
+        :param analytical: Se True, usa a defuzzificação analítica com os formatos dos termos de saída.
+        :return: `InferenceModel`.
+        """
+        from src.fuzzy_config import CompiledRuleBase
+
+        rule_base = CompiledRuleBase.load(config_path, cache_dir)
+        defuzzifier = None
+        if analytical:
+            from src.analytical_defuzzifier import AnalyticalDefuzzifier
+
+            universe, _ = rule_base.variable(rule_base.output_name)
+            defuzzifier = AnalyticalDefuzzifier(universe, rule_base.output_shapes.values())
+        model = cls(rule_base.to_engine(), defuzzifier)
+        model._source = (config_path, cache_dir, analytical)
+        return model
+
+    def __reduce__(self):
+        if self._source is not None:
+            return type(self).from_config, self._source
+        return super().__reduce__()
+
+    @classmethod
+    def load(cls, path):
+        """
+        Carrega um modelo salvo com `save`.
+
+        :param path: Caminho do arquivo do modelo.
+        :return: `InferenceModel`.
+        """
+        with open(path, 'rb') as file:
+            model = pickle.load(file)
+        if not isinstance(model, cls):
+            raise ValueError(f"O arquivo '{path}' não contém um InferenceModel.")
+        return model
+
+    def save(self, path):
+        """
+        Salva o modelo compilado, com as matrizes completas (também para modelos de `from_config`).
+
+        :param path: Caminho do arquivo de destino.
+        """
+        model = type(self)(self._engine, self._defuzzifier)
+        with open(path, 'wb') as file:
+            pickle.dump(model, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @property
+    def input_names(self):
+        return self._engine.input_names
+
+    def simulate(self, inputs):
+        """
+        Calcula a decisão para uma única entrada.
+
+        :param inputs: Dicionário com um valor por variável de entrada.
+        :return: Decisão de ultrapassagem.
+        """
+        return float(self.simulate_batch({name: [inputs[name]] for name in self.input_names})[0])
+
+    def simulate_batch(self, inputs, out_of_range='clip'):
+        """
+        Calcula as decisões para várias entradas, como `VehicleOvertakeSystem.simulate_batch`.
+
+        :param inputs: DataFrame ou dicionário de arrays com uma coluna por variável de entrada.
+        :param out_of_range: 'clip' (padrão) ou 'nan', como em `BatchInferenceEngine.compute`.
+        :return: Array do NumPy com a decisão de cada linha.
+        """
+        return self._engine.compute(inputs, out_of_range=out_of_range, defuzzifier=self._defuzzifier)
@@ -0,0 +1,104 @@
+import json
+import threading
+import numpy as np
+
+
+class InferenceProfiler:
+    """
+    Acumula o tempo gasto em cada etapa da inferência e as estatísticas de ativação das regras.
+
+    As etapas são a fuzzificação das entradas, a avaliação das regras, a agregação dos
+    consequentes e a defuzzificação. Para cada regra são contadas as avaliações em que ela foi
+    ativada (grau maior que zero), a soma e o máximo do grau de ativação.
+    """
+
+    STAGES = ('fuzzification', 'rule_evaluation', 'aggregation', 'defuzzification')
+
+    def __init__(self, rule_descriptions):
+        """
+        :param rule_descriptions: Descrição de cada regra, na ordem de `create_rules()`.
+        """
+        self._rule_descriptions = list(rule_descriptions)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """
+        Zera todos os contadores.
+        """
+        with self._lock:
+            self._calls = 0
+            self._rows = 0
+            self._stage_seconds = dict.fromkeys(self.STAGES, 0.0)
+            size = len(self._rule_descriptions)
+            self._fired = np.zeros(size, dtype=np.int64)
+            self._strength_sum = np.zeros(size, dtype=np.float64)
+            self._strength_max = np.zeros(size, dtype=np.float64)
+
+    def record(self, stage_seconds, firings, rows=1):
+        """
+        Registra uma chamada do sistema (uma linha em `simulate` ou um bloco em `simulate_batch`).
+
+        :param stage_seconds: Dicionário com o tempo (em segundos) de cada etapa.
+        :param firings: Grau de ativação de cada regra (escalar ou array com um valor por linha).
+        :param rows: Quantidade de linhas avaliadas na chamada.
+        """
+        firings = np.nan_to_num(np.array([np.atleast_1d(firing) for firing in firings], dtype=np.float64))
+        with self._lock:
+            self._calls += 1
+            self._rows += rows
+            for stage, seconds in stage_seconds.items():
+                self._stage_seconds[stage] += seconds
+            self._fired += np.count_nonzero(firings > 0, axis=1)
+            self._strength_sum += firings.sum(axis=1)
+            np.maximum(self._strength_max, firings.max(axis=1, initial=0.0), out=self._strength_max)
+
+    def snapshot(self):
+        """
+        Retorna um retrato dos contadores, serializável em JSON.
+
+        :return: Dicionário com chamadas, linhas, tempo por etapa (total, por linha e fração do
+                 total), etapa dominante, estatísticas de cada regra e regras nunca ativadas.
+        """
+        with self._lock:
+            total = sum(self._stage_seconds.values())
+            stages = {
+                stage: {
+                    'seconds': seconds,
+                    'us_per_row': seconds / self._rows * 1e6 if self._rows else 0.0,
+                    'share': seconds / total if total > 0 else 0.0
+                }
+                for stage, seconds in self._stage_seconds.items()
+            }
+            rules = []
+            for index, description in enumerate(self._rule_descriptions):
+                fired = int(self._fired[index])
+                rules.append({
+                    'rule': index + 1,
+                    'description': description,
+                    'fired': fired,
+                    'fire_rate': fired / self._rows if self._rows else 0.0,
+                    'mean_strength': float(self._strength_sum[index] / fired) if fired else 0.0,
+                    'max_strength': float(self._strength_max[index])
+                })
+            return {
+                'calls': self._calls,
+                'rows': self._rows,
+                'stages': stages,
+                'dominant_stage': max(stages, key=lambda stage: stages[stage]['seconds']) if total > 0 else None,
+                'rules': rules,
+                'never_fired': [rule['rule'] for rule in rules if rule['fired'] == 0]
+            }
+
+    def to_json(self, path=None):
+        """
+        Exporta o retrato dos contadores em JSON.
+
+        :param path: Caminho do arquivo de destino (opcional).
+        :return: Texto JSON do retrato.
+        """
+        text = json.dumps(self.snapshot(), indent=2)
+        if path is not None:
+            with open(path, 'w') as file:
+                file.write(text)
+        return text
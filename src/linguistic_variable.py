@@ -1,19 +1,25 @@
-import matplotlib.pyplot as plt
+from types import MappingProxyType
+
 from skfuzzy import control as ctrl
 
 class LinguisticVariable:
-    def __init__(self, name, universe, terms):
+    def __init__(self, name, universe, terms, output=None):
         """
         Inicializa a variável linguística com seu nome, universo de discurso e termos fuzzy.
         
         :param name: Nome da variável linguística.
         :param universe: Universo de discurso da variável.
         :param terms: Dicionário contendo os termos fuzzy e suas funções de pertinência.
+        :param output: Se True, cria uma variável de saída (consequente). Por padrão, apenas
+                       'overtake_decision' é de saída.
         """
         self._name = name
         self._universe = universe
         self._terms = terms
-        self._variable = ctrl.Antecedent(universe, name) if name != 'overtake_decision' else ctrl.Consequent(universe, name)
+        self._listeners = []
+        if output is None:
+            output = name == 'overtake_decision'
+        self._variable = ctrl.Consequent(universe, name) if output else ctrl.Antecedent(universe, name)
         self._define_terms()
     
     def _define_terms(self):
@@ -23,6 +29,30 @@ class LinguisticVariable:
         for term_name, mf in self._terms.items():
             self._variable[term_name] = mf
 
+    def set_term(self, term_name, mf):
+        """
+        Substitui (ou adiciona) a função de pertinência de um termo.
+
+        As regras criadas antes da alteração continuam apontando para o termo antigo; por isso as
+        funções registradas com `add_listener` são chamadas em seguida, para que o sistema que usa
+        a variável recompile suas regras e descarte decisões em cache.
+
+        :param term_name: Nome do termo.
+        :param mf: Valores da função de pertinência sobre o universo da variável.
+        """
+        self._terms[term_name] = mf
+        self._variable[term_name] = mf
+        for listener in self._listeners:
+            listener()
+
+    def add_listener(self, listener):
+        """
+        Registra uma função, chamada sem argumentos, a cada alteração de termo feita por `set_term`.
+
+        :param listener: Função chamada após a alteração.
+        """
+        self._listeners.append(listener)
+
     def plot(self, input_value=None, output_value=None, medians=[]):
         """
         Plota a função de pertinência da variável linguística.
@@ -31,6 +61,9 @@ class LinguisticVariable:
         :param output_value: Valor de saída que será mostrado no gráfico (opcional).
         :param medians: Lista de valores medianos (opcional).
         """
+        # Importado apenas ao plotar, para não pesar nos processos que só fazem inferência
+        import matplotlib.pyplot as plt
+
         plt.figure(figsize=(8, 6))
         for label in self._terms:
             plt.plot(self._universe, self._variable[label].mf, label=label)
@@ -55,6 +88,25 @@ class LinguisticVariable:
 
 
 
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def universe(self):
+        return self._universe
+
+    @property
+    def terms(self):
+        """
+        Termos da variável, somente para leitura: as alterações devem passar por `set_term`.
+        """
+        return MappingProxyType(self._terms)
+
     @property
     def variable(self):
-        return self._variable
\ No newline at end of file
+        """
+        Objeto do skfuzzy por trás da variável. Alterá-lo diretamente não é detectado pelos
+        sistemas que usam a variável; use `set_term`.
+        """
+        return self._variable
@@ -0,0 +1,203 @@
+import bisect
+import itertools
+import math
+import numpy as np
+
+
+class DecisionLookupTable:
+    """
+    Tabela pré-calculada da superfície de decisão do sistema nebuloso.
+
+    A superfície 5-D é amostrada uma única vez sobre uma grade regular e as consultas são
+    respondidas por interpolação multilinear, sem avaliar o sistema nebuloso. A tabela pode
+    ser salva em disco e carregada novamente, de modo que os workers não precisem construir
+    o sistema de controle.
+    """
+
+    # (início, fim, quantidade de pontos) de cada eixo da grade
+    DEFAULT_GRID = {
+        'distance': (0, 50, 51),
+        'relative_speed': (0, 56, 57),
+        'permission': (0, 1, 11),
+        'road': (0, 1, 11),
+        'visibility': (0, 1, 11)
+    }
+
+    def __init__(self, axes, table):
+        """
+        :param axes: Dicionário ordenado com o nome de cada entrada e os pontos da grade no eixo.
+        :param table: Array com a decisão em cada ponto da grade, com um eixo por entrada.
+        """
+        self._names = list(axes)
+        self._axes = [np.asarray(axis, dtype=np.float64) for axis in axes.values()]
+        self._table = np.ascontiguousarray(table, dtype=np.float32)
+        if self._table.shape != tuple(len(axis) for axis in self._axes):
+            raise ValueError("O formato da tabela não corresponde aos eixos da grade.")
+        if any(len(axis) < 2 or np.any(np.diff(axis) <= 0) for axis in self._axes):
+            raise ValueError("Cada eixo deve ter ao menos dois pontos em ordem crescente.")
+
+        # Estruturas auxiliares para a consulta de uma única entrada
+        self._flat = self._table.ravel()
+        self._strides = [stride // self._table.itemsize for stride in self._table.strides]
+        self._axis_lists = [axis.tolist() for axis in self._axes]
+        self._corners = np.array(list(itertools.product((False, True), repeat=len(self._axes))))
+        self._corner_offsets = self._corners @ np.array(self._strides)
+
+    @classmethod
+    def build(cls, system, grid=None, chunk_size=65536):
+        """
+        Amostra a superfície de decisão de um sistema sobre a grade informada.
+
+        :param system: Instância de `VehicleOvertakeSystem`.
+        :param grid: Dicionário com (início, fim, quantidade de pontos) por entrada; as entradas
+                     omitidas usam `DEFAULT_GRID`.
+        :param chunk_size: Quantidade de pontos da grade avaliados por vez.
+        :return: Nova `DecisionLookupTable`.
+        """
+        settings = dict(cls.DEFAULT_GRID)
+        for name, axis in (grid or {}).items():
+            if name not in settings:
+                raise ValueError(f"Entrada desconhecida na grade: {name}")
+            settings[name] = axis
+        axes = {name: np.linspace(*settings[name]) for name in cls.DEFAULT_GRID}
+
+        shape = tuple(len(axis) for axis in axes.values())
+        table = np.empty(int(np.prod(shape)), dtype=np.float32)
+        for start in range(0, table.size, chunk_size):
+            indices = np.unravel_index(np.arange(start, min(start + chunk_size, table.size)), shape)
+            inputs = {name: axis[index] for (name, axis), index in zip(axes.items(), indices)}
+            table[start:start + chunk_size] = system.simulate_batch(inputs)
+        return cls(axes, table.reshape(shape))
+
+    @classmethod
+    def load(cls, path):
+        """
+        Carrega uma tabela salva com `save`.
+
+        :param path: Caminho do arquivo .npz.
+        :return: `DecisionLookupTable` carregada.
+        """
+        with np.load(path) as archive:
+            names = [str(name) for name in archive['names']]
+            axes = {name: archive[f'axis_{name}'] for name in names}
+            return cls(axes, archive['table'])
+
+    def save(self, path):
+        """
+        Salva a tabela e os eixos da grade em um arquivo .npz.
+
+        :param path: Caminho do arquivo de destino.
+        """
+        axes = {f'axis_{name}': axis for name, axis in zip(self._names, self._axes)}
+        np.savez(path, names=np.array(self._names), table=self._table, **axes)
+
+    def lookup(self, inputs, out_of_range='clip'):
+        """
+        Consulta a decisão para uma única entrada.
+
+        :param inputs: Dicionário com um valor por entrada.
+        :param out_of_range: 'clip' limita os valores fora da grade aos seus extremos; 'nan' retorna
+                             NaN, como em `BatchInferenceEngine.compute`.
+        :return: Decisão interpolada (NaN para entradas NaN).
+        """
+        self._check_out_of_range(out_of_range)
+        base = 0
+        fractions = []
+        for name, axis, stride in zip(self._names, self._axis_lists, self._strides):
+            value = float(inputs[name])
+            if math.isnan(value) or (out_of_range == 'nan' and not axis[0] <= value <= axis[-1]):
+                return math.nan
+            value = min(max(value, axis[0]), axis[-1])
+            index = min(bisect.bisect_right(axis, value) - 1, len(axis) - 2)
+            base += index * stride
+            fractions.append((value - axis[index]) / (axis[index + 1] - axis[index]))
+
+        # Peso de cada um dos 2^n vértices da célula: produto de fração (bit 1) ou 1 - fração (bit 0)
+        fractions = np.array(fractions)
+        weights = np.where(self._corners, fractions, 1.0 - fractions).prod(axis=1)
+        return float(weights @ self._flat[base + self._corner_offsets])
+
+    def lookup_batch(self, inputs, chunk_size=65536, out_of_range='clip'):
+        """
+        Consulta a decisão para várias entradas de forma vetorizada.
+
+        :param inputs: DataFrame ou dicionário de arrays com uma coluna por entrada.
+        :param chunk_size: Quantidade de linhas interpoladas por vez.
+        :param out_of_range: 'clip' limita os valores fora da grade aos seus extremos; 'nan' retorna
+                             NaN para essas linhas, como em `BatchInferenceEngine.compute`.
+        :return: Array com a decisão interpolada de cada linha (NaN para entradas NaN).
+        """
+        self._check_out_of_range(out_of_range)
+        columns = [np.atleast_1d(np.asarray(inputs[name], dtype=np.float64)) for name in self._names]
+        size = len(columns[0])
+        output = np.empty(size, dtype=np.float64)
+        for start in range(0, size, chunk_size):
+            chunk = [column[start:start + chunk_size] for column in columns]
+            output[start:start + chunk_size] = self._interpolate(chunk, out_of_range)
+        return output
+
+    @staticmethod
+    def _check_out_of_range(out_of_range):
+        if out_of_range not in ('clip', 'nan'):
+            raise ValueError("Opção inválida para 'out_of_range'. Escolha 'clip' ou 'nan'.")
+
+    def _interpolate(self, columns, out_of_range):
+        base = np.zeros(len(columns[0]), dtype=np.int64)
+        invalid = np.zeros(len(columns[0]), dtype=bool)
+        fractions = []
+        for values, axis, stride in zip(columns, self._axes, self._strides):
+            invalid |= np.isnan(values)
+            if out_of_range == 'nan':
+                invalid |= (values < axis[0]) | (values > axis[-1])
+            values = np.clip(np.nan_to_num(values, nan=axis[0]), axis[0], axis[-1])
+            index = np.clip(np.searchsorted(axis, values, side='right') - 1, 0, len(axis) - 2)
+            base += index * stride
+            fractions.append((stride, (values - axis[index]) / (axis[index + 1] - axis[index])))
+
+        result = np.zeros(len(base), dtype=np.float64)
+        for corner in itertools.product((0, 1), repeat=len(fractions)):
+            weight = np.ones(len(base), dtype=np.float64)
+            offset = base.copy()
+            for bit, (stride, fraction) in zip(corner, fractions):
+                if bit:
+                    weight *= fraction
+                    offset += stride
+                else:
+                    weight *= 1.0 - fraction
+            result += weight * self._flat[offset]
+        result[invalid] = np.nan
+        return result
+
+    def error_report(self, system, csv_paths):
+        """
+        Compara a tabela com o resultado exato do sistema nebuloso em arquivos CSV.
+
+        A referência é sempre o motor em lote exato com o centroide amostrado do skfuzzy, mesmo que o
+        sistema esteja com o modo de tabela ou a defuzzificação analítica ativos.
+
+        :param system: Instância de `VehicleOvertakeSystem` usada como referência.
+        :param csv_paths: Lista de caminhos de CSV em qualquer formato aceito por `TestDataGenerator`.
+        :return: Dicionário com linhas, erro máximo e erro médio por arquivo e no total.
+        """
+        # Importado aqui para que os workers que apenas consultam a tabela não carreguem pandas
+        from src.data_generator import TestDataGenerator
+
+        report = {}
+        errors = []
+        for path in csv_paths:
+            data = TestDataGenerator(csv_path=path).load_and_process_data()
+            error = np.abs(self.lookup_batch(data) - system._batch_engine.compute(data))
+            errors.append(error)
+            report[str(path)] = {'rows': len(error), 'max_error': float(np.max(error)), 'mean_error': float(np.mean(error))}
+
+        error = np.concatenate(errors)
+        report['total'] = {'rows': len(error), 'max_error': float(np.max(error)), 'mean_error': float(np.mean(error))}
+        return report
+
+    @property
+    def input_names(self):
+        return list(self._names)
+
+    @property
+    def table(self):
+        return self._table
@@ -0,0 +1,266 @@
+import json
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from src.evaluation_metrics import MetricsAccumulator
+from src.fuzzy_config import CompiledRuleBase, DEFAULT_CONFIG, load_config
+
+TUNABLE_SHAPES = ('trimf', 'trapmf')
+
+# Avaliador de cada processo worker, criado uma única vez pelo inicializador do pool
+_worker_scorer = None
+
+
+def _init_worker(*args):
+    global _worker_scorer
+    _worker_scorer = _CandidateScorer(*args)
+
+
+def _score_candidate(candidate):
+    return _worker_scorer.score(candidate)
+
+
+class _CandidateScorer:
+    """
+    Calcula o F1-score de um candidato sobre todo o conjunto de dados em uma única passada
+    vetorizada. A fuzzificação de cada termo fica em cache, indexada pelos seus parâmetros: só os
+    termos alterados em relação aos candidatos anteriores são fuzzificados novamente.
+    """
+
+    def __init__(self, config_path, cache_dir, columns, y_true, threshold, analytical):
+        rule_base = CompiledRuleBase.load(config_path, cache_dir)
+        self._engine = rule_base.to_engine()
+        self._defuzzifier = None
+        if analytical:
+            from src.analytical_defuzzifier import AnalyticalDefuzzifier
+
+            universe, _ = rule_base.variable(rule_base.output_name)
+            self._defuzzifier = AnalyticalDefuzzifier(universe, rule_base.output_shapes.values())
+        self._universes = {name: rule_base.variable(name)[0] for name in rule_base.input_names}
+        self._values = {}
+        self._invalid = np.zeros(len(y_true), dtype=bool)
+        for name, universe in self._universes.items():
+            values = np.asarray(columns[name], dtype=np.float64)
+            self._invalid |= np.isnan(values)
+            self._values[name] = np.clip(values, universe[0], universe[-1])
+        self._base = self._engine.fuzzify(self._values)
+        self._y_true = np.asarray(y_true)
+        self._threshold = threshold
+        self._cache = OrderedDict()
+        self._cache_size = 2 * len(self._base)
+
+    def score(self, candidate):
+        """
+        :param candidate: Dicionário {(variável, termo): (tipo, parâmetros)} com os termos que
+                          diferem da configuração.
+        :return: F1-score no threshold do avaliador.
+        """
+        memberships = dict(self._base)
+        for (name, label), (kind, params) in candidate.items():
+            key = (name, label, kind, tuple(params))
+            membership = self._cache.get(key)
+            if membership is None:
+                from skfuzzy import membership as functions
+
+                universe = self._universes[name]
+                membership = np.interp(self._values[name], universe, getattr(functions, kind)(universe, params))
+                self._cache[key] = membership
+                if len(self._cache) > self._cache_size:
+                    self._cache.popitem(last=False)
+            else:
+                self._cache.move_to_end(key)
+            memberships[(name, label)] = membership
+
+        decisions = self._engine.compute_fuzzified(memberships, self._defuzzifier)
+        decisions[self._invalid] = np.nan
+        accumulator = MetricsAccumulator(threshold=self._threshold, keep_scores=False)
+        accumulator.update(self._y_true, decisions)
+        return accumulator.metrics()[4]
+
+
+class MembershipTuner:
+    """
+    Ajusta os parâmetros das funções de pertinência trimf/trapmf das entradas para maximizar o
+    F1-score (o mesmo de `EvaluationMetrics`) em um conjunto de dados.
+
+    A busca é evolutiva: a cada geração, `population` candidatos são gerados perturbando os
+    parâmetros do melhor candidato até então e avaliados em paralelo em um pool de processos. O
+    passo das perturbações diminui nas gerações sem melhora, e a busca para após `patience`
+    gerações seguidas sem melhora (parada antecipada) ou após `max_generations`. Os parâmetros
+    que coincidem com um extremo do universo na configuração original (os "ombros" como
+    [0, 0, 10, 20]) ficam fixos, e os demais são mantidos em ordem crescente e dentro do universo,
+    podendo inclusive chegar a um extremo e voltar em mutações seguintes.
+    """
+
+    def __init__(self, config_path=None, cache_dir=None, terms=None, workers=None, population=16,
+                 max_generations=50, patience=8, min_delta=1e-4, step=0.1, decay=0.7, threshold=0.5,
+                 analytical=False, seed=None):
+        """
+        :param config_path: Arquivo de configuração com as variáveis e regras (padrão: `config/overtake_system.json`).
+        :param cache_dir: Diretório do cache da configuração compilada.
+        :param terms: Lista de (variável, termo) a ajustar (padrão: todos os termos trimf/trapmf das entradas).
+        :param workers: Quantidade de processos (padrão: número de núcleos); 1 avalia no próprio processo.
+        :param population: Quantidade de candidatos avaliados por geração.
+        :param max_generations: Quantidade máxima de gerações.
+        :param patience: Gerações seguidas sem melhora até a parada antecipada.
+        :param min_delta: Ganho mínimo de F1-score considerado melhora.
+        :param step: Desvio padrão inicial das perturbações, como fração da largura do universo.
+        :param decay: Fator aplicado ao passo a cada geração sem melhora.
+        :param threshold: Threshold da decisão binária usado no F1-score.
+        :param analytical: Se True, usa a defuzzificação analítica.
+        :param seed: Semente do gerador aleatório.
+        """
+        self._config_path = config_path or DEFAULT_CONFIG
+        self._cache_dir = cache_dir
+        self._config = load_config(self._config_path)
+        self._terms = {}
+        for name, variable in self._config['inputs'].items():
+            for label, (kind, params) in variable['terms'].items():
+                if terms is None and kind not in TUNABLE_SHAPES:
+                    continue
+                self._terms[(name, label)] = (kind, [float(value) for value in params])
+        if terms is not None:
+            unknown = [term for term in map(tuple, terms) if term not in self._terms]
+            if unknown:
+                raise ValueError(f"Termos desconhecidos: {unknown}")
+            self._terms = {tuple(term): self._terms[tuple(term)] for term in terms}
+        for (name, label), (kind, _) in self._terms.items():
+            if kind not in TUNABLE_SHAPES:
+                raise ValueError(f"Apenas termos trimf/trapmf podem ser ajustados: {name}.{label} é {kind}.")
+        if not self._terms:
+            raise ValueError("Nenhum termo para ajustar.")
+
+        self._limits = {}
+        for name, variable in self._config['inputs'].items():
+            universe = np.arange(*variable['universe'])
+            self._limits[name] = (float(universe[0]), float(universe[-1]))
+        # Ombros da configuração original, calculados uma única vez: um parâmetro levado a um
+        # extremo por uma mutação continua livre
+        self._fixed = {}
+        for (name, label), (_, values) in self._terms.items():
+            low, high = self._limits[name]
+            values = np.array(values, dtype=np.float64)
+            self._fixed[(name, label)] = (values == low) | (values == high)
+        self._workers = workers or os.cpu_count() or 1
+        self._population = population
+        self._max_generations = max_generations
+        self._patience = patience
+        self._min_delta = min_delta
+        self._step = step
+        self._decay = decay
+        self._threshold = threshold
+        self._analytical = analytical
+        self._rng = np.random.default_rng(seed)
+        self._result = None
+
+    def _mutate(self, params, step):
+        """
+        Perturba os parâmetros de alguns termos (em média um, e ao menos um) do candidato informado.
+        """
+        candidate = dict(params)
+        keys = list(candidate)
+        chosen = [key for key in keys if self._rng.random() < 1 / len(keys)]
+        if not chosen:
+            chosen = [keys[self._rng.integers(len(keys))]]
+        for name, label in chosen:
+            kind, values = candidate[(name, label)]
+            low, high = self._limits[name]
+            values = np.array(values, dtype=np.float64)
+            noise = self._rng.normal(0.0, step * (high - low), len(values))
+            values = np.where(self._fixed[(name, label)], values, np.clip(values + noise, low, high))
+            candidate[(name, label)] = (kind, np.round(np.sort(values), 3).tolist())
+        return candidate
+
+    def _changed(self, params):
+        return {key: value for key, value in params.items() if value != self._terms[key]}
+
+    def tune(self, data, target='target'):
+        """
+        Executa a busca.
+
+        :param data: DataFrame ou dicionário de arrays com as colunas de entrada e o `target`.
+        :param target: Nome da coluna com os valores verdadeiros (0 ou 1).
+        :return: Dicionário com o melhor F1-score (`f1`), o F1-score da configuração original
+                 (`baseline_f1`), os parâmetros ajustados (`params`, {variável: {termo: [tipo, parâmetros]}}),
+                 o histórico por geração, a quantidade de avaliações e de gerações, se houve parada
+                 antecipada e o tempo total em segundos.
+        """
+        columns = {name: np.asarray(data[name], dtype=np.float64) for name in self._config['inputs']}
+        y_true = np.asarray(data[target])
+        initargs = (self._config_path, self._cache_dir, columns, y_true, self._threshold, self._analytical)
+
+        start_time = time.perf_counter()
+        if self._workers == 1:
+            scorer = _CandidateScorer(*initargs)
+            result = self._search(lambda candidates: [scorer.score(candidate) for candidate in candidates])
+        else:
+            with ProcessPoolExecutor(max_workers=self._workers, initializer=_init_worker, initargs=initargs) as executor:
+                result = self._search(lambda candidates: list(executor.map(_score_candidate, candidates)))
+        result['seconds'] = time.perf_counter() - start_time
+        self._result = result
+        return result
+
+    def _search(self, evaluate):
+        best = dict(self._terms)
+        baseline = evaluate([{}])[0]
+        best_score = baseline
+        step = self._step
+        history = []
+        evaluations = 1
+        stale = 0
+        for generation in range(1, self._max_generations + 1):
+            candidates = [self._mutate(best, step) for _ in range(self._population)]
+            scores = evaluate([self._changed(candidate) for candidate in candidates])
+            evaluations += len(candidates)
+
+            index = int(np.argmax(scores))
+            if scores[index] > best_score + self._min_delta:
+                best, best_score = candidates[index], scores[index]
+                stale = 0
+            else:
+                stale += 1
+                step *= self._decay
+            history.append({'generation': generation, 'best_f1': best_score, 'generation_f1': float(scores[index]),
+                            'step': step, 'evaluations': evaluations})
+            if stale >= self._patience:
+                break
+
+        params = {}
+        for (name, label), (kind, values) in best.items():
+            params.setdefault(name, {})[label] = [kind, values]
+        return {
+            'f1': float(best_score),
+            'baseline_f1': float(baseline),
+            'params': params,
+            'history': history,
+            'evaluations': evaluations,
+            'generations': len(history),
+            'stopped_early': stale >= self._patience
+        }
+
+    @property
+    def result(self):
+        """
+        Resultado da última busca, ou None se `tune` ainda não foi executado.
+        """
+        return self._result
+
+    def export_config(self, path, result=None):
+        """
+        Grava uma cópia da configuração com os parâmetros ajustados, que pode ser usada em
+        `VehicleOvertakeSystem(config_path=...)` ou `InferenceModel.from_config`.
+
+        :param path: Arquivo JSON de destino.
+        :param result: Resultado de `tune` (padrão: o da última busca).
+        """
+        result = result or self._result
+        if result is None:
+            raise ValueError("Execute 'tune' antes de exportar a configuração.")
+        config = json.loads(json.dumps(self._config))
+        for name, terms in result['params'].items():
+            for label, shape in terms.items():
+                config['inputs'][name]['terms'][label] = shape
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(config, file, indent=2, ensure_ascii=False)
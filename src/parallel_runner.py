@@ -0,0 +1,158 @@
+import os
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+# Modelo de cada processo worker, recebido uma única vez pelo inicializador do pool. Os workers
+# usam apenas o `InferenceModel` compilado, sem importar o skfuzzy.control, o pandas ou o matplotlib.
+_worker_model = None
+
+
+def _init_worker(model):
+    global _worker_model
+    _worker_model = model
+
+
+def _score_chunk(columns):
+    return _worker_model.simulate_batch(columns)
+
+
+def _score_columnar_range(task):
+    # O worker mapeia o conjunto colunar e lê apenas o seu intervalo de linhas
+    from src.columnar_dataset import open_columnar
+
+    path, start, stop = task
+    _, arrays = open_columnar(path, _worker_model.input_names)
+    return _worker_model.simulate_batch({name: column[start:stop] for name, column in arrays.items()})
+
+
+class ParallelEvaluationRunner:
+    def __init__(self, workers=None, chunk_size=50000, model=None, config_path=None, cache_dir=None, analytical=False):
+        """
+        Executa a simulação de grandes conjuntos de dados em vários processos.
+
+        :param workers: Quantidade de processos (padrão: número de núcleos disponíveis).
+        :param chunk_size: Quantidade de linhas enviadas a cada worker por tarefa.
+        :param model: Modelo enviado aos workers: um `InferenceModel` ou um `VehicleOvertakeSystem`,
+                      exportado com `to_inference_model` (funções de pertinência e defuzzificação atuais).
+                      Se None, o modelo é criado a partir de `config_path`.
+        :param config_path: Arquivo de configuração usado quando `model` não é informado (padrão:
+                            `config/overtake_system.json`), como uma configuração ajustada por `MembershipTuner`.
+        :param cache_dir: Diretório do cache da configuração compilada.
+        :param analytical: Se True, o modelo criado a partir de `config_path` usa a defuzzificação analítica.
+        """
+        self._workers = workers or os.cpu_count() or 1
+        self._chunk_size = chunk_size
+        if model is not None and not hasattr(model, 'input_names'):
+            model = model.to_inference_model()
+        self._model = model
+        self._config = (config_path, cache_dir, analytical)
+        self._last_run = None
+
+    def run(self, data, workers=None):
+        """
+        Divide os dados em blocos, pontua cada bloco em um processo do pool e junta os resultados.
+
+        :param data: DataFrame (ou dicionário de arrays) com as colunas de entrada do sistema.
+        :param workers: Quantidade de processos desta execução (padrão: a definida no construtor).
+        :return: Array com a decisão de cada linha, na ordem original dos dados.
+        """
+        names = self.model.input_names
+        columns = {name: np.asarray(data[name], dtype=np.float64) for name in names}
+        size = len(columns[names[0]])
+        chunks = [
+            {name: column[start:start + self._chunk_size] for name, column in columns.items()}
+            for start in range(0, size, self._chunk_size)
+        ]
+        return self._run_tasks(_score_chunk, chunks, size, workers or self._workers)
+
+    def run_columnar(self, path, workers=None):
+        """
+        Pontua um conjunto de dados colunar (ver `TestDataGenerator.convert_to_columnar`). Os
+        workers recebem apenas o caminho e o intervalo de linhas de cada bloco e mapeiam as colunas
+        do disco, compartilhando as páginas em memória, sem que os dados sejam copiados e enviados
+        pelo processo principal.
+
+        :param path: Diretório do conjunto de dados colunar.
+        :param workers: Quantidade de processos desta execução (padrão: a definida no construtor).
+        :return: Array com a decisão de cada linha, na ordem original dos dados.
+        """
+        from src.columnar_dataset import open_columnar
+
+        manifest, _ = open_columnar(path, self.model.input_names)
+        size = manifest['rows']
+        path = os.path.abspath(path)
+        tasks = [(path, start, min(start + self._chunk_size, size)) for start in range(0, size, self._chunk_size)]
+        return self._run_tasks(_score_columnar_range, tasks, size, workers or self._workers)
+
+    @property
+    def model(self):
+        """
+        `InferenceModel` enviado aos workers, criado na primeira execução quando não foi informado.
+        """
+        if self._model is None:
+            # Modelo da configuração compilada: cada worker mapeia as matrizes do cache em disco
+            from src.inference import InferenceModel
+            config_path, cache_dir, analytical = self._config
+            self._model = InferenceModel.from_config(config_path, cache_dir, analytical=analytical)
+        return self._model
+
+    def _run_tasks(self, function, tasks, size, workers):
+        start_time = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(self.model,)) as executor:
+            # map preserva a ordem dos blocos, independentemente da ordem de conclusão
+            results = list(executor.map(function, tasks))
+        elapsed = time.perf_counter() - start_time
+
+        self._last_run = {
+            'workers': workers,
+            'rows': size,
+            'chunks': len(tasks),
+            'seconds': elapsed,
+            'rows_per_sec': size / elapsed if elapsed > 0 else float('inf')
+        }
+        return np.concatenate(results) if results else np.empty(0, dtype=np.float64)
+
+    def run_csv(self, csv_path, workers=None):
+        """
+        Carrega um CSV com `TestDataGenerator.load_and_process_data` e executa a simulação em paralelo.
+
+        :param csv_path: Caminho do arquivo CSV.
+        :param workers: Quantidade de processos desta execução.
+        :return: Tupla (DataFrame processado, array com as decisões).
+        """
+        from src.data_generator import TestDataGenerator
+
+        data = TestDataGenerator(csv_path=csv_path).load_and_process_data()
+        return data, self.run(data, workers=workers)
+
+    def scaling(self, data, max_workers=None):
+        """
+        Mede a vazão (linhas/s) com 1 até `max_workers` processos e exibe a tabela de escalabilidade.
+
+        Os tempos incluem a criação do pool e o envio do modelo compilado a cada worker.
+
+        :param data: DataFrame (ou dicionário de arrays) com as colunas de entrada do sistema.
+        :param max_workers: Maior quantidade de processos medida (padrão: a definida no construtor).
+        :return: Lista de dicionários com processos, segundos, linhas/s, speedup e eficiência.
+        """
+        report = []
+        for workers in range(1, (max_workers or self._workers) + 1):
+            self.run(data, workers=workers)
+            stats = dict(self._last_run)
+            stats['speedup'] = report[0]['seconds'] / stats['seconds'] if report else 1.0
+            stats['efficiency'] = stats['speedup'] / workers
+            report.append(stats)
+
+        print("Workers | Segundos | Linhas/s | Speedup | Eficiência")
+        for stats in report:
+            print(f"{stats['workers']:7d} | {stats['seconds']:8.2f} | {stats['rows_per_sec']:8.0f} | "
+                  f"{stats['speedup']:7.2f} | {stats['efficiency']:10.2f}")
+        return report
+
+    @property
+    def last_run(self):
+        """
+        Estatísticas da última execução: processos, linhas, blocos, segundos e linhas/s.
+        """
+        return self._last_run
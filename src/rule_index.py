@@ -0,0 +1,194 @@
+import math
+import numpy as np
+
+
+class RuleIndex:
+    """
+    Índice que associa cada região do espaço de entradas às regras que podem ser ativadas nela.
+
+    Em cada variável de entrada, os pontos do universo em que algum termo passa de nulo para
+    positivo (ou o contrário) dividem o universo em regiões elementares: os próprios pontos e os
+    intervalos abertos entre eles. Dentro de uma região, cada termo é sempre nulo ou sempre
+    positivo, de modo que o conjunto de regras com grau de ativação possivelmente maior que zero
+    é fixo. Esse conjunto é pré-calculado para todas as combinações de regiões e guardado como
+    uma máscara de bits por combinação.
+
+    Uma regra é considerada possível quando o seu antecedente pode ser positivo: AND exige todos
+    os termos positivos, OR exige algum deles, e NOT é sempre tratado como possível.
+    Uma regra fora da máscara tem grau de ativação exatamente zero.
+    """
+
+    MAX_RULES = 64
+    # Maior quantidade de combinações de regiões da tabela (8 bytes cada, 32 MB no total)
+    MAX_TABLE_SIZE = 1 << 22
+
+    def __init__(self, antecedents, rules):
+        """
+        :param antecedents: Dicionário {variável: (universo, {termo: pertinência})}.
+        :param rules: Lista com o antecedente compilado de cada regra, como em `BatchInferenceEngine`.
+        """
+        if len(rules) > self.MAX_RULES:
+            raise ValueError(f"O índice de regras suporta no máximo {self.MAX_RULES} regras.")
+        all_boundaries = self._all_boundaries(antecedents)
+        if self._table_size(all_boundaries) > self.MAX_TABLE_SIZE:
+            raise ValueError(f"A tabela do índice de regras excede {self.MAX_TABLE_SIZE} combinações de regiões.")
+        self._rule_count = len(rules)
+        self._limits = {}
+        self._boundaries = {}
+        activity = {}
+        for axis, (name, (universe, terms)) in enumerate(antecedents.items()):
+            boundaries = all_boundaries[name]
+            # Região 2i + 1 é o ponto boundaries[i]; região 2i é o intervalo aberto antes dele
+            representatives = np.empty(2 * len(boundaries) + 1, dtype=np.float64)
+            representatives[1::2] = boundaries
+            representatives[2:-1:2] = (boundaries[:-1] + boundaries[1:]) / 2
+            representatives[0], representatives[-1] = boundaries[0], boundaries[-1]
+
+            shape = [1] * len(antecedents)
+            shape[axis] = len(representatives)
+            for label, mf in terms.items():
+                activity[(name, label)] = (np.interp(representatives, universe, mf) > 0).reshape(shape)
+            self._limits[name] = (universe[0], universe[-1])
+            self._boundaries[name] = boundaries
+
+        self._shape = tuple(2 * len(boundaries) + 1 for boundaries in self._boundaries.values())
+        self._table = np.zeros(self._shape, dtype=np.uint64)
+        for index, antecedent in enumerate(rules):
+            possible = np.broadcast_to(self._possible(antecedent, activity), self._shape)
+            self._table[possible] |= np.uint64(1 << index)
+        self._table = self._table.ravel()
+        self._rules_by_mask = {}
+
+    @classmethod
+    def build(cls, antecedents, rules):
+        """
+        Cria o índice quando ele é viável: com mais de `MAX_RULES` regras, ou com uma tabela maior
+        que `MAX_TABLE_SIZE`, retorna None e todas as regras devem ser avaliadas.
+
+        :param antecedents: Dicionário {variável: (universo, {termo: pertinência})}.
+        :param rules: Lista com o antecedente compilado de cada regra, como em `BatchInferenceEngine`.
+        :return: `RuleIndex` ou None.
+        """
+        if len(rules) > cls.MAX_RULES or cls._table_size(cls._all_boundaries(antecedents)) > cls.MAX_TABLE_SIZE:
+            return None
+        return cls(antecedents, rules)
+
+    @classmethod
+    def _all_boundaries(cls, antecedents):
+        return {name: cls._support_boundaries(universe, terms.values())
+                for name, (universe, terms) in antecedents.items()}
+
+    @staticmethod
+    def _table_size(all_boundaries):
+        # Uma região por ponto e uma por intervalo aberto entre pontos; o produto em inteiros do
+        # Python não transborda
+        return math.prod(2 * len(boundaries) + 1 for boundaries in all_boundaries.values())
+
+    @staticmethod
+    def _support_boundaries(universe, mfs):
+        """
+        Pontos do universo em que algum termo muda entre nulo e positivo, mais os extremos.
+        Como a pertinência é interpolada linearmente, essa mudança só ocorre em pontos amostrados.
+        """
+        boundaries = {universe[0], universe[-1]}
+        for mf in mfs:
+            positive = np.asarray(mf) > 0
+            changes = np.flatnonzero(positive[:-1] != positive[1:])
+            # O ponto nulo de cada transição é o limite do suporte aberto do termo
+            for index in changes:
+                boundaries.add(universe[index + 1] if positive[index] else universe[index])
+        return np.array(sorted(boundaries), dtype=np.float64)
+
+    def _possible(self, node, activity):
+        kind = node[0]
+        if kind == 'term':
+            return activity[(node[1], node[2])]
+        if kind == 'not':
+            return np.True_
+        left = self._possible(node[1], activity)
+        right = self._possible(node[2], activity)
+        return left & right if kind == 'and' else left | right
+
+    @property
+    def rule_count(self):
+        return self._rule_count
+
+    @property
+    def regions(self):
+        """
+        Quantidade de regiões elementares de cada variável de entrada.
+        """
+        return dict(zip(self._boundaries, self._shape))
+
+    def masks(self, inputs):
+        """
+        Máscara de bits das regras possíveis em cada linha (bit i = regra i + 1).
+
+        Os valores são limitados aos universos, como no skfuzzy. Linhas com algum valor NaN
+        recebem máscara vazia.
+
+        :param inputs: DataFrame ou dicionário de arrays (ou escalares) com uma coluna por variável.
+        :return: Array uint64 com a máscara de cada linha.
+        """
+        regions = []
+        invalid = None
+        for name, boundaries in self._boundaries.items():
+            values = np.atleast_1d(np.asarray(inputs[name], dtype=np.float64))
+            missing = np.isnan(values)
+            invalid = missing if invalid is None else invalid | missing
+            values = np.clip(np.where(missing, boundaries[0], values), *self._limits[name])
+            position = np.searchsorted(boundaries, values, side='left')
+            on_boundary = boundaries[np.minimum(position, len(boundaries) - 1)] == values
+            regions.append(2 * position + on_boundary)
+        masks = self._table[np.ravel_multi_index(regions, self._shape)]
+        masks[invalid] = 0
+        return masks
+
+    def rules_for_mask(self, mask):
+        """
+        :param mask: Máscara de bits retornada por `masks`.
+        :return: Tupla com os índices (a partir de 0) das regras da máscara.
+        """
+        mask = int(mask)
+        rules = self._rules_by_mask.get(mask)
+        if rules is None:
+            rules = tuple(index for index in range(self._rule_count) if mask >> index & 1)
+            self._rules_by_mask[mask] = rules
+        return rules
+
+    def active_rules(self, inputs):
+        """
+        Regras que podem ser ativadas por uma única entrada.
+
+        :param inputs: Dicionário com um valor por variável de entrada.
+        :return: Tupla com os índices (a partir de 0) das regras possíveis.
+        """
+        return self.rules_for_mask(self.masks(inputs)[0])
+
+    def savings(self, inputs):
+        """
+        Mede quantas regras o índice evita avaliar em um conjunto de entradas.
+
+        :param inputs: DataFrame ou dicionário de arrays com uma coluna por variável.
+        :return: Dicionário com linhas, total de regras, média/mínimo/máximo de regras avaliadas por
+                 linha, média de regras evitadas, fração evitada, histograma da quantidade de
+                 regras avaliadas e quantidade de máscaras distintas.
+        """
+        masks = self.masks(inputs)
+        counts = np.zeros(len(masks), dtype=np.int64)
+        for index in range(self._rule_count):
+            counts += (masks >> np.uint64(index)) & np.uint64(1) == 1
+        if len(counts) == 0:
+            raise ValueError("Nenhuma entrada informada.")
+        histogram = np.bincount(counts, minlength=self._rule_count + 1)
+        return {
+            'rows': len(counts),
+            'rules': self._rule_count,
+            'mean_evaluated': float(counts.mean()),
+            'min_evaluated': int(counts.min()),
+            'max_evaluated': int(counts.max()),
+            'mean_skipped': float(self._rule_count - counts.mean()),
+            'skipped_fraction': float(1 - counts.mean() / self._rule_count) if self._rule_count else 0.0,
+            'histogram': {count: int(rows) for count, rows in enumerate(histogram) if rows},
+            'distinct_masks': int(len(np.unique(masks)))
+        }
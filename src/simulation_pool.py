@@ -0,0 +1,198 @@
+import copy
+import threading
+import skfuzzy
+from skfuzzy import control as ctrl
+from skfuzzy.control.controlsystem import CrispValueCalculator
+from skfuzzy.control.exceptions import NoTermMembershipsError
+
+# Versões do scikit-fuzzy em que as etapas internas de `ControlSystemSimulation.compute` usadas
+# por `fuzzify`, `compute_rule`, `aggregate` e `clear` foram validadas
+VALIDATED_SKFUZZY_VERSIONS = ('0.5.0',)
+
+
+class SimulationPool:
+    """
+    Mantém uma `ControlSystemSimulation` reutilizável por thread para um mesmo sistema de controle.
+
+    No skfuzzy o estado de uma simulação fica guardado nos próprios antecedentes e termos
+    (por exemplo, o valor de entrada corrente de cada variável), portanto duas threads não
+    podem compartilhar o mesmo grafo de regras. Cada thread recebe, no primeiro uso, uma cópia
+    do sistema já compilado e passa a reutilizá-la em todas as chamadas seguintes.
+
+    A ordem de cálculo das regras também é guardada por simulação: no skfuzzy, cada acesso a
+    `ControlSystem.rules` recalcula essa ordem compondo os grafos das regras com o networkx,
+    o que custa mais do que a própria avaliação das regras. Como essa ordem não é a da lista de
+    regras, as cópias das regras também são guardadas na ordem original, mapeadas pela identidade
+    das regras originais.
+
+    Todo o acesso a atributos e classes internos do skfuzzy fica nesta classe. Avaliar apenas
+    algumas regras (`fuzzify`, `compute_rule` e `aggregate`) só é possível quando
+    `partial_evaluation` é True, isto é, com uma versão do skfuzzy em `VALIDATED_SKFUZZY_VERSIONS`;
+    nas demais versões, use `compute`, que chama apenas a API pública.
+    """
+
+    partial_evaluation = skfuzzy.__version__ in VALIDATED_SKFUZZY_VERSIONS
+
+    def __init__(self, control_system, rules):
+        """
+        :param control_system: Sistema de controle (`ctrl.ControlSystem`) compilado uma única vez.
+        :param rules: Regras do sistema de controle, na ordem em que são indexadas (como em `create_rules()`).
+        """
+        self._control_system = control_system
+        self._rules = list(rules)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._simulations = []
+
+    def get(self):
+        """
+        Retorna a simulação da thread atual, criando-a na primeira chamada.
+
+        :return: `ctrl.ControlSystemSimulation` exclusiva da thread atual.
+        """
+        simulation = getattr(self._local, 'simulation', None)
+        if simulation is None:
+            with self._lock:
+                # O memo do deepcopy associa cada regra original (por id) à sua cópia
+                memo = {}
+                control_system = copy.deepcopy(self._control_system, memo)
+                # cache=False limpa o estado interno ao final de cada execução
+                simulation = ctrl.ControlSystemSimulation(control_system, cache=False)
+                self._simulations.append(simulation)
+            self._local.simulation = simulation
+            self._local.structure = (
+                list(control_system.antecedents),
+                list(control_system.rules),
+                list(control_system.consequents)
+            )
+            self._local.indexed_rules = [memo[id(rule)] for rule in self._rules]
+        return simulation
+
+    def structure(self):
+        """
+        Antecedentes, regras (na ordem de cálculo) e consequentes da simulação da thread atual,
+        calculados uma única vez na criação da simulação.
+
+        :return: Tupla (antecedentes, regras, consequentes).
+        """
+        self.get()
+        return self._local.structure
+
+    def indexed_rules(self):
+        """
+        Regras da simulação da thread atual na ordem original (a de `rules` no construtor), para
+        acesso pelos índices de `RuleIndex`.
+
+        :return: Lista de regras (`ctrl.Rule`).
+        """
+        self.get()
+        return self._local.indexed_rules
+
+    def compute(self):
+        """
+        Executa `ControlSystemSimulation.compute` com todas as regras na simulação da thread atual.
+
+        :return: Dicionário {saída: valor}.
+        """
+        simulation = self.get()
+        simulation.compute()
+        return simulation.output
+
+    def fuzzify(self):
+        """
+        Primeira etapa de `ControlSystemSimulation.compute` na simulação da thread atual: calcula a
+        pertinência das entradas já definidas e limpa os termos dos consequentes.
+        """
+        simulation = self.get()
+        antecedents, _, consequents = self._local.structure
+        simulation.input._update_to_current()
+        for antecedent in antecedents:
+            if antecedent.input[simulation] is None:
+                raise ValueError("All antecedents must have input values!")
+            CrispValueCalculator(antecedent, simulation).fuzz(antecedent.input[simulation])
+        for consequent in consequents:
+            for term in consequent.terms.values():
+                term.membership_value[simulation] = None
+
+    def compute_rule(self, index):
+        """
+        Avalia uma regra na simulação da thread atual, depois de `fuzzify`.
+
+        :param index: Índice da regra em `rules` (construtor), como em `RuleIndex.active_rules`.
+        :return: Grau de ativação da regra.
+        """
+        simulation = self.get()
+        rule = self._local.indexed_rules[index]
+        simulation.compute_rule(rule)
+        return rule.aggregate_firing[simulation]
+
+    def output_cuts(self):
+        """
+        Nível de corte de cada termo do primeiro consequente depois das regras avaliadas (0 para
+        os termos não atingidos), na ordem dos termos.
+
+        :return: Lista de floats.
+        """
+        simulation = self.get()
+        output = self._local.structure[2][0]
+        cuts = [term.membership_value[simulation] for term in output.terms.values()]
+        return [0.0 if cut is None else float(cut) for cut in cuts]
+
+    def aggregate(self):
+        """
+        Saída agregada do primeiro consequente no seu universo, depois das regras avaliadas.
+
+        :return: Tupla (universo, pertinência agregada).
+        """
+        simulation = self.get()
+        output = self._local.structure[2][0]
+        universe, output_mf, term_mfs = CrispValueCalculator(output, simulation).find_memberships()
+        if len(term_mfs) == 0:
+            raise NoTermMembershipsError(output)
+        return universe, output_mf
+
+    def clear(self):
+        """
+        Limpa o estado da execução na simulação da thread atual, como `ControlSystemSimulation.reset`,
+        mas usando a ordem das regras já calculada.
+        """
+        simulation = self.get()
+        if not self.partial_evaluation:
+            simulation.reset()
+            return
+        antecedents, rules, consequents = self._local.structure
+        for rule in rules:
+            rule.aggregate_firing.clear()
+            for weighted_term in rule.consequent:
+                weighted_term.activation.clear()
+        for consequent in consequents:
+            consequent.output.clear()
+            self._clear_terms(consequent)
+        for antecedent in antecedents:
+            antecedent.input.clear()
+            self._clear_terms(antecedent)
+        simulation._calculated = []
+        simulation._run = 0
+
+    @staticmethod
+    def _clear_terms(variable):
+        for term in variable.terms.values():
+            term.membership_value.clear()
+            term.cuts.clear()
+
+    def reset(self):
+        """
+        Limpa o estado de todas as simulações já criadas. Deve ser chamado apenas quando
+        nenhuma simulação estiver em andamento.
+        """
+        with self._lock:
+            for simulation in self._simulations:
+                simulation.reset()
+
+    @property
+    def size(self):
+        """
+        Quantidade de simulações criadas (uma por thread que já utilizou o pool).
+        """
+        with self._lock:
+            return len(self._simulations)
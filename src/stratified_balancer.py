@@ -0,0 +1,170 @@
+import numpy as np
+import pandas as pd
+
+
+class StratifiedBalancer:
+    """
+    Balanceamento das classes do `target` em duas passadas sobre blocos de dados, sem manter o
+    conjunto de entrada em memória.
+
+    A primeira passada conta as linhas de cada classe. Na segunda:
+
+    - undersample: cada classe é reduzida à contagem da classe minoritária por amostragem de
+      reservatório. Cada linha recebe uma chave aleatória, e cada classe guarda apenas as linhas
+      com as menores chaves vistas até o momento (uma amostra uniforme, sem reposição);
+    - oversample: cada classe é completada até a contagem da classe majoritária. As repetições de
+      cada linha são sorteadas por índice após a contagem, com reposição, e as linhas são
+      replicadas ao passar.
+
+    A memória usada é limitada ao tamanho do conjunto balanceado mais um bloco. As linhas saem na
+    ordem original (as réplicas logo após a linha original), com as colunas de entrada seguidas
+    pelo `target`, como em `TestDataGenerator.balance_data`.
+    """
+
+    METHODS = ('undersample', 'oversample')
+
+    def __init__(self, method='undersample', seed=None, target='target'):
+        """
+        :param method: "undersample" ou "oversample".
+        :param seed: Semente do gerador aleatório; a mesma semente gera o mesmo resultado,
+                     independentemente do tamanho dos blocos.
+        :param target: Nome da coluna das classes.
+        """
+        if method not in self.METHODS:
+            raise ValueError("Método inválido. Escolha 'undersample' ou 'oversample'.")
+        self._method = method
+        self._seed = seed
+        self._target = target
+        self._counts = None
+
+    @property
+    def counts(self):
+        """
+        Quantidade de linhas de cada classe, contada na primeira passada (None antes dela).
+        """
+        return self._counts
+
+    def count(self, chunks):
+        """
+        Primeira passada: conta as linhas de cada classe.
+
+        :param chunks: Iterável de DataFrames com a coluna `target`.
+        :return: Dicionário {classe: quantidade}, em ordem crescente de classe.
+        """
+        counts = {}
+        for chunk in chunks:
+            if self._target not in chunk.columns:
+                raise ValueError(f"Os dados não têm a coluna '{self._target}' para balancear.")
+            classes, sizes = np.unique(chunk[self._target].to_numpy(), return_counts=True)
+            for label, size in zip(classes.tolist(), sizes.tolist()):
+                counts[label] = counts.get(label, 0) + size
+        if not counts:
+            raise ValueError("Nenhuma linha para balancear.")
+        self._counts = dict(sorted(counts.items()))
+        return self._counts
+
+    def resample(self, chunks):
+        """
+        Segunda passada: gera o conjunto balanceado a partir das contagens de `count`. Os blocos
+        devem ser os mesmos da primeira passada, na mesma ordem.
+
+        :param chunks: Iterável de DataFrames com a coluna `target`.
+        :return: DataFrame balanceado.
+        """
+        if self._counts is None:
+            raise ValueError("Conte as classes com 'count' antes de reamostrar.")
+        rng = np.random.default_rng(self._seed)
+        if self._method == 'undersample':
+            return self._undersample(chunks, rng)
+        return self._oversample(chunks, rng)
+
+    def balance(self, make_chunks):
+        """
+        Executa as duas passadas.
+
+        :param make_chunks: Função sem argumentos que retorna um novo iterável de blocos a cada chamada.
+        :return: DataFrame balanceado.
+        """
+        self.count(make_chunks())
+        return self.resample(make_chunks())
+
+    def _undersample(self, chunks, rng):
+        size = min(self._counts.values())
+        # Reservatório de cada classe: (posições originais, chaves, {coluna: valores})
+        reservoirs = {}
+        offset = 0
+        for chunk in chunks:
+            keys = rng.random(len(chunk))
+            labels = chunk[self._target].to_numpy()
+            for label in np.unique(labels).tolist():
+                rows = np.flatnonzero(labels == label)
+                if label in reservoirs and len(reservoirs[label][0]) == size:
+                    # Reservatório cheio: só entram as linhas com chave menor que a maior guardada
+                    rows = rows[keys[rows] < reservoirs[label][1].max()]
+                    if len(rows) == 0:
+                        continue
+                positions, candidate_keys = rows + offset, keys[rows]
+                values = {name: chunk[name].to_numpy()[rows] for name in chunk.columns}
+                if label in reservoirs:
+                    kept_positions, kept_keys, kept = reservoirs[label]
+                    positions = np.concatenate([kept_positions, positions])
+                    candidate_keys = np.concatenate([kept_keys, candidate_keys])
+                    values = {name: np.concatenate([kept[name], column]) for name, column in values.items()}
+                if len(positions) > size:
+                    # Mantém as `size` menores chaves: amostra uniforme das linhas vistas até aqui
+                    keep = np.sort(np.argpartition(candidate_keys, size - 1)[:size])
+                    positions, candidate_keys = positions[keep], candidate_keys[keep]
+                    values = {name: column[keep] for name, column in values.items()}
+                reservoirs[label] = (positions, candidate_keys, values)
+            offset += len(chunk)
+        self._check_rows(offset)
+
+        order = np.argsort(np.concatenate([reservoir[0] for reservoir in reservoirs.values()]), kind='stable')
+        names = next(iter(reservoirs.values()))[2]
+        columns = {name: np.concatenate([reservoir[2][name] for reservoir in reservoirs.values()])[order] for name in names}
+        return self._finish(pd.DataFrame(columns, copy=False))
+
+    def _oversample(self, chunks, rng):
+        size = max(self._counts.values())
+        # Quantas réplicas extras cada linha recebe, pela sua posição dentro da classe
+        extras = {label: np.bincount(rng.integers(0, count, size - count), minlength=count)
+                  for label, count in self._counts.items()}
+        seen = dict.fromkeys(self._counts, 0)
+        # O tamanho do resultado é conhecido após a contagem: as colunas são alocadas uma única vez,
+        # com o tipo do primeiro bloco, e promovidas apenas se um bloco seguinte exigir
+        total = size * len(self._counts)
+        columns = None
+        filled = 0
+        rows_read = 0
+        for chunk in chunks:
+            labels = chunk[self._target].to_numpy()
+            repeats = np.ones(len(chunk), dtype=np.int64)
+            for label in np.unique(labels).tolist():
+                rows = np.flatnonzero(labels == label)
+                repeats[rows] += extras[label][seen[label]:seen[label] + len(rows)]
+                seen[label] += len(rows)
+            index = np.repeat(np.arange(len(chunk)), repeats)
+            if columns is None:
+                columns = {name: np.empty(total, dtype=chunk[name].to_numpy().dtype) for name in chunk.columns}
+            for name, column in columns.items():
+                values = chunk[name].to_numpy()[index]
+                dtype = np.result_type(column.dtype, values.dtype)
+                if dtype != column.dtype:
+                    # Bloco com um tipo mais amplo que os anteriores (por exemplo, float após blocos
+                    # só com inteiros): a coluna é promovida, copiando o que já foi preenchido
+                    widened = np.empty(total, dtype=dtype)
+                    widened[:filled] = column[:filled]
+                    columns[name] = column = widened
+                column[filled:filled + len(index)] = values
+            filled += len(index)
+            rows_read += len(chunk)
+        self._check_rows(rows_read)
+        return self._finish(pd.DataFrame(columns, copy=False))
+
+    def _check_rows(self, rows):
+        if rows != sum(self._counts.values()):
+            raise ValueError("Os blocos da segunda passada não correspondem aos da contagem.")
+
+    def _finish(self, frame):
+        columns = [column for column in frame.columns if column != self._target] + [self._target]
+        return frame[columns].reset_index(drop=True)
@@ -0,0 +1,48 @@
+import time
+from src.data_generator import TestDataGenerator
+
+
+class StreamingInferencePipeline:
+    def __init__(self, system, chunk_size=100000, out_of_range='clip'):
+        """
+        Pipeline de inferência em blocos: lê, processa, pontua e grava um bloco de cada vez,
+        de modo que o pico de memória depende apenas do tamanho do bloco, e não do arquivo.
+
+        :param system: Instância de `VehicleOvertakeSystem` usada para pontuar os blocos.
+        :param chunk_size: Quantidade de linhas por bloco.
+        :param out_of_range: Tratamento de valores fora do universo, repassado a `simulate_batch`.
+        """
+        self._system = system
+        self._chunk_size = chunk_size
+        self._out_of_range = out_of_range
+
+    def run(self, csv_path, output_path, include_inputs=True):
+        """
+        Pontua um arquivo CSV em blocos e acrescenta as decisões ao arquivo de saída a cada bloco.
+
+        :param csv_path: Caminho do CSV de entrada, em qualquer formato aceito por `TestDataGenerator`.
+        :param output_path: Caminho do CSV de saída (sobrescrito).
+        :param include_inputs: Se True, grava as colunas processadas junto com a decisão;
+                               caso contrário, grava apenas a coluna 'overtake_decision'.
+        :return: Dicionário com linhas, blocos, segundos e linhas/s.
+        """
+        generator = TestDataGenerator(csv_path=csv_path)
+        rows = 0
+        chunks = 0
+        start_time = time.perf_counter()
+
+        for chunk in generator.iter_processed_chunks(chunk_size=self._chunk_size):
+            decisions = self._system.simulate_batch(chunk, out_of_range=self._out_of_range)
+            output = chunk if include_inputs else chunk.iloc[:, :0]
+            output = output.assign(overtake_decision=decisions)
+            output.to_csv(output_path, mode='w' if chunks == 0 else 'a', header=chunks == 0, index=False)
+            rows += len(chunk)
+            chunks += 1
+
+        elapsed = time.perf_counter() - start_time
+        return {
+            'rows': rows,
+            'chunks': chunks,
+            'seconds': elapsed,
+            'rows_per_sec': rows / elapsed if elapsed > 0 else float('inf')
+        }
@@ -0,0 +1,223 @@
+import time
+import numpy as np
+
+
+class TrafficScenarioSimulator:
+    """
+    Simulação em passos de tempo de um trecho de rodovia com muitos veículos, para testes de carga
+    do controlador de ultrapassagem.
+
+    O trecho é um anel de `vehicles * spacing` metros com a faixa de tráfego (faixa 0) e a faixa
+    de ultrapassagem, usada também pelo tráfego em sentido contrário (faixa 1). Todos os veículos
+    são arrays do NumPy (posição, velocidade, velocidade desejada, faixa e tempo restante de
+    ultrapassagem), e o trecho tem zonas de proibição de ultrapassagem e uma neblina que se desloca
+    ao longo do tempo. A cada passo:
+
+    - as entradas do controlador são calculadas para todos os veículos da faixa 0: distância e
+      velocidade relativa até o veículo da frente, permissão da zona, ocupação da faixa 1 à frente
+      (`road`) e visibilidade no ponto;
+    - as decisões são calculadas de uma só vez com `simulate_batch`;
+    - os veículos com decisão favorável passam para a faixa 1 por `overtake_time` segundos, e os
+      demais seguem o veículo da frente, mantendo o intervalo de tempo `headway`.
+    """
+
+    VEHICLE_LENGTH = 5.0
+
+    def __init__(self, vehicles, system=None, spacing=25.0, dt=0.5, seed=None, cell=10.0, lookahead=100.0,
+                 oncoming_ratio=0.2, headway=1.5, overtake_time=6.0, threshold=0.5):
+        """
+        :param vehicles: Quantidade de veículos no sentido simulado.
+        :param system: Controlador com o método `simulate_batch`, como `VehicleOvertakeSystem` (padrão)
+                       ou `InferenceModel`.
+        :param spacing: Comprimento do trecho por veículo (em metros), que define a densidade do tráfego.
+        :param dt: Duração de cada passo (em segundos).
+        :param seed: Semente do gerador aleatório.
+        :param cell: Tamanho das células (em metros) das zonas e da ocupação da faixa 1.
+        :param lookahead: Distância à frente (em metros) considerada na ocupação da faixa 1.
+        :param oncoming_ratio: Veículos em sentido contrário por veículo simulado.
+        :param headway: Intervalo de tempo mínimo (em segundos) até o veículo da frente.
+        :param overtake_time: Duração de uma ultrapassagem (em segundos).
+        :param threshold: Decisão mínima para iniciar uma ultrapassagem.
+        """
+        if vehicles < 1:
+            raise ValueError("A simulação requer ao menos um veículo.")
+        if system is None:
+            from src.vehicle_over_system import VehicleOvertakeSystem
+            system = VehicleOvertakeSystem()
+        self._system = system
+        self._rng = np.random.default_rng(seed)
+        self._dt = dt
+        self._cell = cell
+        self._headway = headway
+        self._overtake_time = overtake_time
+        self._threshold = threshold
+        self._length = vehicles * spacing
+        self._cells = int(np.ceil(self._length / cell))
+        self._window = min(max(1, int(round(lookahead / cell))), self._cells)
+        self._time = 0.0
+
+        rng = self._rng
+        self.position = np.sort(rng.uniform(0, self._length, vehicles))
+        self.desired_speed = rng.uniform(15, 35, vehicles)  # m/s
+        self.speed = self.desired_speed * rng.uniform(0.6, 1.0, vehicles)
+        self.lane = np.zeros(vehicles, dtype=np.uint8)
+        self.overtake_left = np.zeros(vehicles, dtype=np.float64)
+
+        # Tráfego em sentido contrário na faixa 1
+        oncoming = max(1, int(round(vehicles * oncoming_ratio)))
+        self.oncoming_position = rng.uniform(0, self._length, oncoming)
+        self.oncoming_speed = rng.uniform(15, 30, oncoming)
+
+        # Zonas de proibição de ultrapassagem: trechos de 5 a 30 células, permitidos em 70% dos casos
+        runs = rng.integers(5, 31, self._cells // 5 + 1)
+        allowed = rng.random(len(runs)) < 0.7
+        zone_permission = np.where(allowed, rng.uniform(0.6, 1.0, len(runs)), rng.uniform(0.0, 0.3, len(runs)))
+        self._permission = np.repeat(zone_permission, runs)[:self._cells]
+
+        # Neblina: faixas de baixa visibilidade com ~2 km de comprimento que se deslocam a 2 m/s
+        self._fog_phase = rng.uniform(0, 2 * np.pi)
+
+        self._stats = self._empty_stats()
+
+    def _empty_stats(self):
+        return {'ticks': 0, 'decisions': 0, 'overtakes': 0, 'seconds': 0.0, 'inference_seconds': 0.0}
+
+    def _visibility(self, position):
+        return np.clip(0.7 + 0.45 * np.sin(2 * np.pi * (position - 2.0 * self._time) / 2000.0 + self._fog_phase), 0.0, 1.0)
+
+    def _lane_occupancy(self):
+        """
+        Quantidade de células ocupadas na faixa 1 em cada janela de `lookahead` metros à frente de
+        cada célula, considerando o tráfego em sentido contrário e os veículos ultrapassando.
+        """
+        occupied = np.zeros(self._cells, dtype=np.int64)
+        overtaking = self.position[self.lane == 1]
+        for positions in (self.oncoming_position, overtaking):
+            occupied[(positions // self._cell).astype(np.int64) % self._cells] = 1
+        # Somas acumuladas sobre o anel estendido: janela [célula, célula + window)
+        extended = np.concatenate(([0], np.cumsum(np.concatenate((occupied, occupied[:self._window])))))
+        starts = np.arange(self._cells)
+        return extended[starts + self._window] - extended[starts]
+
+    def controller_inputs(self):
+        """
+        Entradas do controlador para os veículos da faixa de tráfego.
+
+        :return: Tupla (índices dos veículos, dicionário com as colunas de entrada, distância até o
+                 veículo da frente em metros).
+        """
+        travelling = np.flatnonzero(self.lane == 0)
+        order = travelling[np.argsort(self.position[travelling], kind='stable')]
+        position = self.position[order]
+        speed = self.speed[order]
+        if len(order) > 1:
+            leader = np.roll(np.arange(len(order)), -1)
+            gap = (position[leader] - position) % self._length - self.VEHICLE_LENGTH
+            relative_speed = speed - speed[leader]
+        else:
+            gap = np.full(len(order), self._length - self.VEHICLE_LENGTH)
+            relative_speed = np.zeros(len(order))
+        gap = np.maximum(gap, 0.0)
+
+        cells = (position // self._cell).astype(np.int64) % self._cells
+        occupancy = self._lane_occupancy()[cells]
+        inputs = {
+            'distance': np.minimum(gap, 50.0),
+            'relative_speed': relative_speed,
+            'permission': self._permission[cells],
+            'road': 1.0 - occupancy / self._window,
+            'visibility': self._visibility(position)
+        }
+        return order, inputs, gap
+
+    def step(self):
+        """
+        Avança a simulação em um passo: calcula as entradas, as decisões em lote e o movimento.
+
+        :return: Quantidade de decisões calculadas no passo.
+        """
+        start_time = time.perf_counter()
+        order, inputs, gap = self.controller_inputs()
+
+        inference_start = time.perf_counter()
+        decisions = self._system.simulate_batch(inputs) if len(order) else np.empty(0)
+        inference_seconds = time.perf_counter() - inference_start
+
+        # Inicia as ultrapassagens: só há o que ultrapassar com um veículo a até 50 metros
+        start = (decisions >= self._threshold) & (gap < 50.0)
+        overtaking = order[start]
+        self.lane[overtaking] = 1
+        self.overtake_left[overtaking] = self._overtake_time
+
+        # Faixa 0: segue o veículo da frente, respeitando o intervalo de tempo mínimo
+        following = order[~start]
+        target = np.minimum(self.desired_speed[following], gap[~start] / self._headway)
+        change = np.clip(target - self.speed[following], -6.0 * self._dt, 2.0 * self._dt)
+        self.speed[following] = np.maximum(self.speed[following] + change, 0.0)
+
+        # Faixa 1: acelera até 10% acima da velocidade desejada e volta à faixa 0 ao final
+        passing = self.lane == 1
+        boosted = np.minimum(self.speed[passing] + 2.0 * self._dt, 1.1 * self.desired_speed[passing])
+        self.speed[passing] = boosted
+        self.overtake_left[passing] -= self._dt
+        self.lane[passing & (self.overtake_left <= 0)] = 0
+
+        self.position = (self.position + self.speed * self._dt) % self._length
+        self.oncoming_position = (self.oncoming_position - self.oncoming_speed * self._dt) % self._length
+        self._time += self._dt
+
+        self._stats['ticks'] += 1
+        self._stats['decisions'] += len(order)
+        self._stats['overtakes'] += len(overtaking)
+        self._stats['inference_seconds'] += inference_seconds
+        self._stats['seconds'] += time.perf_counter() - start_time
+        return len(order)
+
+    def run(self, ticks):
+        """
+        Executa `ticks` passos e mede a vazão sustentada.
+
+        :param ticks: Quantidade de passos.
+        :return: Estatísticas da execução (ver `stats`).
+        """
+        self._stats = self._empty_stats()
+        for _ in range(ticks):
+            self.step()
+        return self.stats
+
+    @property
+    def stats(self):
+        """
+        Estatísticas desde o último `run`: veículos, passos, decisões, ultrapassagens iniciadas,
+        segundos totais e de inferência, decisões/s (total e só da inferência) e velocidade média atual.
+        """
+        stats = dict(self._stats)
+        stats['vehicles'] = len(self.position)
+        stats['decisions_per_sec'] = stats['decisions'] / stats['seconds'] if stats['seconds'] > 0 else 0.0
+        stats['inference_decisions_per_sec'] = (stats['decisions'] / stats['inference_seconds']
+                                                if stats['inference_seconds'] > 0 else 0.0)
+        stats['mean_speed'] = float(self.speed.mean())
+        return stats
+
+    @classmethod
+    def scaling(cls, sizes=(10, 100, 1000, 10000, 100000), ticks=20, system=None, seed=None, **options):
+        """
+        Mede as decisões/s sustentadas com quantidades crescentes de veículos e exibe a tabela.
+
+        :param sizes: Quantidades de veículos medidas.
+        :param ticks: Passos simulados em cada quantidade.
+        :param system: Controlador compartilhado pelas simulações (padrão: `VehicleOvertakeSystem`).
+        :param seed: Semente do gerador aleatório.
+        :param options: Demais parâmetros de `TrafficScenarioSimulator`.
+        :return: Lista com as estatísticas de cada quantidade de veículos.
+        """
+        if system is None:
+            from src.vehicle_over_system import VehicleOvertakeSystem
+            system = VehicleOvertakeSystem()
+        report = [cls(vehicles, system=system, seed=seed, **options).run(ticks) for vehicles in sizes]
+
+        print("Veículos | Passos | Decisões | Segundos | Decisões/s | Inferência (decisões/s) | Ultrapassagens")
+        for stats in report:
+            print(f"{stats['vehicles']:8d} | {stats['ticks']:6d} | {stats['decisions']:8d} | {stats['seconds']:8.2f} | "
+                  f"{stats['decisions_per_sec']:10.0f} | {stats['inference_decisions_per_sec']:23.0f} | {stats['overtakes']:14d}")
+        return report
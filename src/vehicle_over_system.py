@@ -1,162 +1,360 @@
+import logging
+import time
 import numpy as np
 import skfuzzy as fuzz
 from skfuzzy import control as ctrl
+from skfuzzy.defuzzify import defuzz
 from src.linguistic_variable import LinguisticVariable
+from src.fuzzy_config import CompiledRuleBase
+from src.batch_inference import BatchInferenceEngine
+from src.analytical_defuzzifier import AnalyticalDefuzzifier
+from src.simulation_pool import SimulationPool
+from src.decision_cache import DecisionCache
+from src.inference_profiler import InferenceProfiler
+from src.inference import InferenceModel
+
+logger = logging.getLogger(__name__)
+
 
 class VehicleOvertakeSystem:
-    def __init__(self):
-        # Ajustando o intervalo de distância para até 50 metros
-        self.distance = LinguisticVariable('distance', np.arange(0, 51, 1), {
-            'pequena': fuzz.trapmf(np.arange(0, 51, 1), [0, 0, 10, 20]),
-            'media': fuzz.trimf(np.arange(0, 51, 1), [15, 25, 35]),
-            'grande': fuzz.trapmf(np.arange(0, 51, 1), [30, 40, 50, 50])
-        })
-
-        # Ajustando o intervalo de velocidade relativa para até 56 m/s
-        self.relative_speed = LinguisticVariable('relative_speed', np.arange(0, 57, 1), {
-            'baixa': fuzz.trapmf(np.arange(0, 57, 1), [0, 0, 10, 20]),
-            'media': fuzz.trimf(np.arange(0, 57, 1), [15, 30, 45]),
-            'alta': fuzz.trapmf(np.arange(0, 57, 1), [40, 50, 56, 56])
-        })
-
-            
-        # Visibilidade: função de pertinência com transição suave
-        self.visibility = LinguisticVariable('visibility', np.arange(0, 1.1, 0.1), {
-            'ruim': fuzz.trapmf(np.arange(0, 1.1, 0.1), [0, 0, 0.3, 0.5]),  # Transição suave de ruim para boa
-            'boa': fuzz.trapmf(np.arange(0, 1.1, 0.1), [0.4, 0.6, 1, 1])    # Sobreposição entre 0.4 e 0.6
-        })
-
-        # Permissão: função de pertinência com transição suave
-        self.permission = LinguisticVariable('permission', np.arange(0, 1.1, 0.1), {
-            'nao_permitido': fuzz.trapmf(np.arange(0, 1.1, 0.1), [0, 0, 0.3, 0.5]),  # Transição suave de não permitido para permitido
-            'permitido': fuzz.trapmf(np.arange(0, 1.1, 0.1), [0.4, 0.6, 1, 1])      # Sobreposição entre 0.4 e 0.6
-        })
-        self.road = LinguisticVariable('road', np.arange(0, 1.1, 0.1), {
-            'obstruida': fuzz.trapmf(np.arange(0, 1.1, 0.1), [0, 0, 0.3, 0.5]),  # Transição suave de obstruída para livre
-            'livre': fuzz.trapmf(np.arange(0, 1.1, 0.1), [0.4, 0.6, 1, 1])      # Sobreposição entre 0.4 e 0.6
-        })
-
-
-        # Mantendo o mesmo intervalo para a variável de saída (decisão de ultrapassagem)
-        self.overtake_decision = LinguisticVariable('overtake_decision', np.arange(0, 1.1, 0.1), {
-            'nao': fuzz.trimf(np.arange(0, 1.1, 0.1), [0, 0, 0.5]),
-            'sim': fuzz.trimf(np.arange(0, 1.1, 0.1), [0.51, 1, 1])
-        })
+    def __init__(self, config_path=None, cache_dir=None):
+        """
+        Cria as variáveis linguísticas e as regras a partir do arquivo de configuração.
 
-    def create_rules(self):
-         # 1. Se a distância é pequena e a velocidade relativa é alta, e a permissão, pista e visibilidade são favoráveis, então deve ultrapassar
-        rule1 = ctrl.Rule(
-            self.distance.variable['pequena'] & self.relative_speed.variable['alta'] &
-            self.permission.variable['permitido'] & self.road.variable['livre'] &
-            self.visibility.variable['boa'], self.overtake_decision.variable['sim']
-        )
+        :param config_path: Arquivo JSON/YAML com as variáveis, termos e regras
+                            (padrão: `config/overtake_system.json`).
+        :param cache_dir: Diretório do cache da configuração compilada (padrão: `.compiled` ao lado
+                          do arquivo de configuração).
+        """
+        self._rule_base = CompiledRuleBase.load(config_path, cache_dir)
 
-        # 2. Se a distância é pequena e a velocidade relativa é média, e a permissão, pista e visibilidade são favoráveis, então deve ultrapassar
-        rule2 = ctrl.Rule(
-            self.distance.variable['pequena'] & self.relative_speed.variable['media'] &
-            self.permission.variable['permitido'] & self.road.variable['livre'] &
-            self.visibility.variable['boa'], self.overtake_decision.variable['sim']
-        )
+        # Uma variável linguística por entrada, acessível como atributo (self.distance, self.road, ...)
+        self._variables = {}
+        for name in self._rule_base.input_names:
+            universe, terms = self._rule_base.variable(name)
+            self._add_variable(LinguisticVariable(name, universe, terms, output=False))
 
-        # 3. Se a distância é média e a velocidade relativa é alta, e a permissão, pista e visibilidade são favoráveis, então deve ultrapassar
-        rule3 = ctrl.Rule(
-            self.distance.variable['media'] & self.relative_speed.variable['alta'] &
-            self.permission.variable['permitido'] & self.road.variable['livre'] &
-            self.visibility.variable['boa'], self.overtake_decision.variable['sim']
-        )
+        # Variável de saída (decisão de ultrapassagem)
+        universe, terms = self._rule_base.variable(self._rule_base.output_name)
+        self._output = LinguisticVariable(self._rule_base.output_name, universe, terms, output=True)
+        self._add_variable(self._output)
 
-        # 4. Se a distância é média e a velocidade relativa é média, e a permissão, pista e visibilidade são favoráveis, então deve ultrapassar
-        rule4 = ctrl.Rule(
-            self.distance.variable['media'] & self.relative_speed.variable['media'] &
-            self.permission.variable['permitido'] & self.road.variable['livre'] &
-            self.visibility.variable['boa'], self.overtake_decision.variable['sim']
-        )
+        self._lookup_table = None
+        self._analytical = False
+        self._cache = None
+        self._profiler = None
+        self.recompile()
 
-        # 5. Se a distância é grande ou a velocidade relativa é baixa ou a pista está obstruída, não deve ultrapassar
-        rule5 = ctrl.Rule(
-            self.distance.variable['grande'] | self.relative_speed.variable['baixa'] |
-            self.road.variable['obstruida'], self.overtake_decision.variable['nao']
-        )
+    def _add_variable(self, variable):
+        """
+        Registra uma variável linguística e a expõe como atributo. Os nomes vêm do arquivo de
+        configuração e, por isso, não podem começar com '_' nem coincidir com um atributo ou
+        método do sistema (ou com outra variável).
+        """
+        if variable.name.startswith('_') or variable.name in dir(self):
+            raise ValueError(f"Nome de variável inválido na configuração: '{variable.name}' "
+                             f"coincide com um atributo de VehicleOvertakeSystem.")
+        self._variables[variable.name] = variable
+        setattr(self, variable.name, variable)
+        variable.add_listener(self.recompile)
 
-        # 6. Se a visibilidade é ruim, não deve ultrapassar, independentemente das outras condições
-        rule6 = ctrl.Rule(
-            self.visibility.variable['ruim'], self.overtake_decision.variable['nao']
-        )
+    def recompile(self):
+        """
+        Compila a base de regras e as funções de pertinência atuais.
 
-        # 7. Se a permissão para ultrapassar é negada, não deve ultrapassar
-        rule7 = ctrl.Rule(
-            self.permission.variable['nao_permitido'], self.overtake_decision.variable['nao']
+        É chamado na criação da instância e a cada `set_term` das variáveis (inclusive via
+        `set_membership_function`); deve ser chamado manualmente apenas após alterar as regras ou
+        os objetos do skfuzzy diretamente. Invalida o cache de decisões e,
+        se a instrumentação estiver ativa, recomeça a contagem com um novo profiler.
+        """
+        rules = self.create_rules()
+        self._rule_descriptions = [str(rule) for rule in rules]
+        self._simulation_pool = SimulationPool(ctrl.ControlSystem(rules), rules)
+        self._batch_engine = BatchInferenceEngine(
+            [self._variables[name] for name in self._rule_base.input_names],
+            self._output,
+            rules
         )
+        self._defuzzifier = self._build_defuzzifier() if self._analytical else None
+        if self._cache is not None:
+            self._cache.clear()
+        if self._profiler is not None:
+            self._profiler = InferenceProfiler(self._rule_descriptions)
 
-        # 8. Se a pista está obstruída, não deve ultrapassar
-        rule8 = ctrl.Rule(
-            self.road.variable['obstruida'], self.overtake_decision.variable['nao']
-        )
+    def _build_defuzzifier(self):
+        """
+        Cria o `AnalyticalDefuzzifier` a partir dos formatos dos termos de saída definidos na
+        configuração, conferindo que os termos de saída atuais são exatamente esses formatos
+        amostrados no universo.
+        """
+        universe = self._output.universe
+        output_shapes = self._rule_base.output_shapes
+        shapes = []
+        for label, mf in self._output.terms.items():
+            kind, params = output_shapes.get(label, (None, None))
+            if kind not in AnalyticalDefuzzifier.SHAPES or not np.allclose(getattr(fuzz, kind)(universe, params), mf):
+                raise ValueError(f"O termo de saída '{label}' não corresponde à configuração; a defuzzificação "
+                                 f"analítica requer termos trimf/trapmf com parâmetros conhecidos.")
+            shapes.append((kind, params))
+        return AnalyticalDefuzzifier(universe, shapes)
 
-        # 9. Se a distância é pequena e a velocidade relativa é baixa, e a permissão é dada, deve ultrapassar
-        rule9 = ctrl.Rule(
-            self.distance.variable['pequena'] & self.relative_speed.variable['baixa'] &
-            self.permission.variable['permitido'] & self.road.variable['livre'] &
-            self.visibility.variable['boa'], self.overtake_decision.variable['sim']
-        )
+    def set_membership_function(self, variable_name, term_name, mf):
+        """
+        Substitui a função de pertinência de um termo e recompila o sistema.
 
-        # 10. Se a distância é grande e a velocidade relativa é alta, não deve ultrapassar
-        rule10 = ctrl.Rule(
-            self.distance.variable['grande'] & self.relative_speed.variable['alta'],
-            self.overtake_decision.variable['nao']
-        )
+        :param variable_name: Nome da variável linguística (por exemplo, 'distance').
+        :param term_name: Nome do termo (por exemplo, 'pequena').
+        :param mf: Valores da nova função de pertinência sobre o universo da variável.
+        """
+        self._variables[variable_name].set_term(term_name, mf)
 
-        # 11. Se a distância é média e a velocidade relativa é alta, e a pista e visibilidade são favoráveis, deve ultrapassar
-        rule11 = ctrl.Rule(
-            self.distance.variable['media'] & self.relative_speed.variable['alta'] &
-            self.road.variable['livre'] & self.visibility.variable['boa'],
-            self.overtake_decision.variable['sim']
-        )
+    def create_rules(self):
+        """
+        Cria as regras do skfuzzy a partir da base de regras da configuração, usando os termos
+        atuais das variáveis linguísticas.
 
-        # 12. Se a distância é grande e a velocidade relativa é média, e a pista está livre, não deve ultrapassar
-        rule12 = ctrl.Rule(
-            self.distance.variable['grande'] & self.relative_speed.variable['media'] &
-            self.road.variable['livre'], self.overtake_decision.variable['nao']
-        )
+        :return: Lista de regras (`ctrl.Rule`), na ordem do arquivo de configuração.
+        """
+        labels = list(self._output.terms)
+        rules = []
+        for antecedent, consequents in self._rule_base.rules():
+            terms = []
+            for term_index, weight in consequents:
+                term = self._output.variable[labels[term_index]]
+                terms.append(term if weight == 1 else term % weight)
+            rules.append(ctrl.Rule(self._rule_antecedent(antecedent), terms))
+        return rules
 
-        # 13. Se a velocidade é muito alta, mas a permissão é dada e a visibilidade é boa, deve ultrapassar
-        rule13 = ctrl.Rule(
-            self.relative_speed.variable['alta'] & self.permission.variable['permitido'] &
-            self.visibility.variable['boa'], self.overtake_decision.variable['sim']
-        )
+    def _rule_antecedent(self, node):
+        """
+        Converte um antecedente da base de regras (ver `CompiledRuleBase.rules`) em termos do skfuzzy.
+        """
+        kind = node[0]
+        if kind == 'term':
+            return self._variables[node[1]].variable[node[2]]
+        if kind == 'not':
+            return ~self._rule_antecedent(node[1])
+        left = self._rule_antecedent(node[1])
+        right = self._rule_antecedent(node[2])
+        return left & right if kind == 'and' else left | right
 
-        # 14. Se a velocidade é baixa e a visibilidade é ruim, não deve ultrapassar
-        rule14 = ctrl.Rule(
-            self.relative_speed.variable['baixa'] & self.visibility.variable['ruim'],
-            self.overtake_decision.variable['nao']
-        )
+    def simulate(self, inputs):
+        """
+        Executa a simulação para uma única entrada.
 
-        # 15. Se a pista está obstruída ou a permissão para ultrapassar é negada, não deve ultrapassar
-        rule15 = ctrl.Rule(
-            self.road.variable['obstruida'] | self.permission.variable['nao_permitido'],
-            self.overtake_decision.variable['nao']
-        )
+        Reutiliza o sistema de controle compilado na criação da instância e uma simulação
+        exclusiva da thread atual, podendo ser chamado concorrentemente por várias threads.
+        Apenas as regras que podem ser ativadas na região das entradas (`rule_index`) são avaliadas.
+        Com o modo de tabela ativo (`use_lookup_table`), a decisão é interpolada na tabela; com o
+        cache ativo (`enable_cache`), as entradas são quantizadas e as decisões repetidas reaproveitadas.
 
-        # Retorna todas as regras criadas
-        return [rule1, rule2, rule3, rule4, rule5, rule6, rule7, rule8, rule9, rule10, rule11, rule12, rule13, rule14, rule15]
+        :param inputs: Dicionário com 'distance', 'relative_speed', 'permission', 'road' e 'visibility'.
+        :return: Decisão de ultrapassagem.
+        """
+        if self._lookup_table is not None:
+            return self._lookup_table.lookup(inputs)
 
-    def simulate(self, inputs):
+        if self._cache is not None:
+            key, quantized = self._cache.quantize(inputs)
+            if key is None:
+                # Entradas NaN ou infinitas não passam pelo cache
+                return self._simulate(inputs)
+            found, decision = self._cache.get(key)
+            if not found:
+                decision = self._simulate(quantized)
+                self._cache.put(key, decision)
+            return decision
+
+        return self._simulate(inputs)
+
+    def _simulate(self, inputs):
+        overtake_sim = self._simulation_pool.get()
         try:
-            # Cria o sistema de controle e a simulação
-            rules = self.create_rules()
-            overtake_ctrl = ctrl.ControlSystem(rules)
-            overtake_sim = ctrl.ControlSystemSimulation(overtake_ctrl)
             # Passa as entradas
-            overtake_sim.input['distance'] = inputs['distance']
-            overtake_sim.input['relative_speed'] = inputs['relative_speed']
-            overtake_sim.input['permission'] = inputs['permission']
-            overtake_sim.input['road'] = inputs['road']
-            overtake_sim.input['visibility'] = inputs['visibility']
-
-            # Realiza a computação
-            overtake_sim.compute()
-            return overtake_sim.output['overtake_decision']
+            for name in self._rule_base.input_names:
+                overtake_sim.input[name] = inputs[name]
+
+            rule_index = self._batch_engine.rule_index
+            if not self._simulation_pool.partial_evaluation:
+                # Versão do skfuzzy não validada: apenas a API pública, com todas as regras
+                return self._simulation_pool.compute()[self._output.name]
+            if rule_index is None:
+                return self._compute_rules(range(len(self._rule_descriptions)))
+
+            # Apenas as regras que podem ser ativadas nesta região das entradas são avaliadas
+            active_rules = rule_index.active_rules(inputs)
+            if not active_rules:
+                # Sem regras possíveis (por exemplo, entradas NaN): computação completa do skfuzzy
+                return self._simulation_pool.compute()[self._output.name]
+            return self._compute_rules(active_rules)
         except ValueError as e:
-            print(f"Erro na simulação: {e}")
-            print(inputs)
-            return 10
\ No newline at end of file
+            # Mesmo resultado do motor em lote para entradas sem decisão possível
+            logger.warning("Erro na simulação: %s (entradas: %s)", e, inputs)
+            return np.nan
+        finally:
+            # Descarta o estado da execução para que a simulação possa ser reutilizada
+            self._simulation_pool.clear()
+
+    def _compute_rules(self, active_rules):
+        """
+        Executa as mesmas etapas de `ControlSystemSimulation.compute`, mas avaliando apenas as regras
+        informadas; as demais têm grau de ativação nulo e não alteram o resultado. Com a
+        instrumentação ativa, mede o tempo de cada etapa e registra a ativação de cada regra;
+        desativada, nenhum tempo é medido e nenhuma ativação é coletada.
+
+        :param active_rules: Índices das regras que podem ser ativadas, como em `RuleIndex.active_rules`,
+                             na ordem de `create_rules`.
+        :return: Decisão de ultrapassagem.
+        """
+        pool = self._simulation_pool
+        profiler = self._profiler
+
+        if profiler is None:
+            pool.fuzzify()
+            for index in active_rules:
+                pool.compute_rule(index)
+            return self._defuzzify(self._aggregate())
+
+        start_time = time.perf_counter()
+        pool.fuzzify()
+        fuzzified = time.perf_counter()
+        firings = [0.0] * len(self._rule_descriptions)
+        for index in active_rules:
+            firings[index] = pool.compute_rule(index)
+        evaluated = time.perf_counter()
+        aggregated_output = self._aggregate()
+        aggregated = time.perf_counter()
+        decision = self._defuzzify(aggregated_output)
+        profiler.record({
+            'fuzzification': fuzzified - start_time,
+            'rule_evaluation': evaluated - fuzzified,
+            'aggregation': aggregated - evaluated,
+            'defuzzification': time.perf_counter() - aggregated
+        }, firings)
+        return decision
+
+    def _aggregate(self):
+        """
+        Níveis de corte dos termos de saída (defuzzificação analítica) ou a saída agregada no universo.
+        """
+        if self._defuzzifier is not None:
+            return self._simulation_pool.output_cuts()
+        return self._simulation_pool.aggregate()
+
+    def _defuzzify(self, aggregated):
+        if self._defuzzifier is not None:
+            return self._defuzzifier.centroid_single(aggregated)
+        universe, output_mf = aggregated
+        if not output_mf.any():
+            # Nenhuma regra ativada: área nula, como no motor em lote
+            return np.nan
+        return defuzz(universe, output_mf, self._output.variable.defuzzify_method)
+
+    def simulate_batch(self, inputs, out_of_range='clip'):
+        """
+        Executa a simulação para várias entradas de uma só vez, de forma vetorizada.
+
+        O resultado coincide com `simulate` linha a linha, com tolerância absoluta de
+        `BatchInferenceEngine.TOLERANCE`. Com o modo de tabela ativo (`use_lookup_table`), as
+        decisões são interpoladas na tabela, e `out_of_range` vale para os extremos da grade.
+
+        :param inputs: DataFrame ou dicionário de arrays com as colunas 'distance', 'relative_speed',
+                       'permission', 'road' e 'visibility'.
+        :param out_of_range: 'clip' limita valores fora do universo aos seus extremos (padrão);
+                             'nan' retorna NaN para as linhas com algum valor fora do universo.
+        :return: Array do NumPy com a decisão de ultrapassagem de cada linha.
+        """
+        if self._lookup_table is not None:
+            return self._lookup_table.lookup_batch(inputs, out_of_range=out_of_range)
+        return self._batch_engine.compute(inputs, out_of_range=out_of_range, profiler=self._profiler,
+                                          defuzzifier=self._defuzzifier)
+
+    def to_inference_model(self):
+        """
+        Exporta o sistema compilado (funções de pertinência, regras e defuzzificação atuais) como um
+        `InferenceModel`, que pode ser salvo e carregado em workers sem importar o skfuzzy.control.
+        O modo de tabela e o cache não fazem parte do modelo.
+
+        :return: `InferenceModel`.
+        """
+        return InferenceModel(self._batch_engine, self._defuzzifier)
+
+    @property
+    def rule_index(self):
+        """
+        `RuleIndex` com as regras que podem ser ativadas em cada região das entradas. O método
+        `savings` mede quantas regras deixam de ser avaliadas em um conjunto de dados.
+        """
+        return self._batch_engine.rule_index
+
+    def use_analytical_defuzzification(self, enabled=True):
+        """
+        Ativa a defuzzificação analítica em `simulate` e `simulate_batch`: o centroide é calculado
+        em forma fechada sobre os termos de saída contínuos (formatos da configuração), sem depender da
+        resolução do universo. Como o skfuzzy usa as funções amostradas no universo de passo 0.1,
+        as decisões mudam levemente (o termo 'sim' amostrado começa em 0.5, e não em 0.51).
+
+        :param enabled: True ativa; False volta ao centroide amostrado do skfuzzy.
+        """
+        self._analytical = enabled
+        self._defuzzifier = self._build_defuzzifier() if enabled else None
+        if self._cache is not None:
+            self._cache.clear()
+
+    def use_lookup_table(self, table):
+        """
+        Ativa o modo de tabela pré-calculada: `simulate` e `simulate_batch` passam a responder por
+        interpolação multilinear na tabela, em vez de avaliar o sistema nebuloso.
+
+        :param table: `DecisionLookupTable` construída com `DecisionLookupTable.build(self)` ou
+                      carregada do disco; None desativa o modo e volta à avaliação exata.
+        """
+        self._lookup_table = table
+
+    def enable_cache(self, max_size=100000, step=0.01):
+        """
+        Ativa o cache LRU de decisões na frente de `simulate`.
+
+        :param max_size: Quantidade máxima de decisões armazenadas.
+        :param step: Passo de quantização das entradas usado na chave do cache.
+        :return: O `DecisionCache` criado, que expõe os contadores em `stats`.
+        """
+        self._cache = DecisionCache(self._batch_engine.input_names, max_size=max_size, step=step)
+        return self._cache
+
+    def disable_cache(self):
+        """
+        Desativa o cache de decisões.
+        """
+        self._cache = None
+
+    @property
+    def cache_stats(self):
+        """
+        Contadores do cache de decisões, ou None se o cache estiver desativado.
+        """
+        return self._cache.stats if self._cache is not None else None
+
+    def enable_profiling(self):
+        """
+        Ativa a instrumentação de `simulate` e `simulate_batch`: tempo de fuzzificação, avaliação das
+        regras, agregação e defuzzificação, e frequência e intensidade de ativação de cada regra.
+        Desativada, a instrumentação não tem custo além de uma verificação por chamada.
+
+        :return: O `InferenceProfiler` criado, que exporta os dados com `snapshot()` ou `to_json()`.
+        """
+        self._profiler = InferenceProfiler(self._rule_descriptions)
+        return self._profiler
+
+    def disable_profiling(self):
+        """
+        Desativa a instrumentação.
+        """
+        self._profiler = None
+
+    @property
+    def profile_stats(self):
+        """
+        Retrato da instrumentação, ou None se ela estiver desativada.
+        """
+        return self._profiler.snapshot() if self._profiler is not None else None
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+from skfuzzy import control as ctrl
+from src.vehicle_over_system import VehicleOvertakeSystem
+
+INPUT_COLUMNS = ['distance', 'relative_speed', 'permission', 'road', 'visibility']
+
+
+@pytest.fixture(scope='session')
+def cache_dir(tmp_path_factory):
+    """
+    Cache da configuração compilada compartilhado pelos testes, fora de `config/.compiled`.
+    """
+    return str(tmp_path_factory.mktemp('compiled'))
+
+
+@pytest.fixture
+def system(cache_dir):
+    return VehicleOvertakeSystem(cache_dir=cache_dir)
+
+
+@pytest.fixture(scope='session')
+def skfuzzy_reference(cache_dir):
+    """
+    Decisão de referência: `ControlSystemSimulation.compute` do skfuzzy, sem nenhum caminho rápido.
+
+    :return: Função que recebe um dicionário de arrays (ou DataFrame) e retorna a decisão de cada linha.
+    """
+    rules = VehicleOvertakeSystem(cache_dir=cache_dir).create_rules()
+    simulation = ctrl.ControlSystemSimulation(ctrl.ControlSystem(rules))
+
+    def decide(inputs):
+        columns = {name: np.asarray(inputs[name], dtype=np.float64) for name in INPUT_COLUMNS}
+        decisions = []
+        for row in range(len(columns[INPUT_COLUMNS[0]])):
+            for name in INPUT_COLUMNS:
+                simulation.input[name] = columns[name][row]
+            simulation.compute()
+            decisions.append(simulation.output['overtake_decision'])
+        return np.array(decisions)
+
+    return decide
+
+
+@pytest.fixture
+def fis_data():
+    from src import data_generator
+
+    return data_generator.TestDataGenerator(quantity=2000, seed=7).generate_data_for_fis()
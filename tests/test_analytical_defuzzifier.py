@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+import skfuzzy as fuzz
+from conftest import INPUT_COLUMNS
+from src.analytical_defuzzifier import AnalyticalDefuzzifier
+
+SHAPES = [('trapmf', [0, 0, 0.2, 0.45]), ('trimf', [0.3, 0.5, 0.7]), ('trimf', [0.51, 1, 1])]
+
+
+@pytest.fixture
+def cuts():
+    rng = np.random.default_rng(3)
+    cuts = rng.random((len(SHAPES), 200))
+    cuts[:, rng.random(200) < 0.2] *= rng.random(len(SHAPES))[:, np.newaxis] < 0.5  # alguns termos inativos
+    return cuts
+
+
+def test_centroid_matches_fine_universe(cuts):
+    defuzzifier = AnalyticalDefuzzifier(np.arange(0, 1.01, 0.1), SHAPES)
+    # Com o universo muito fino o centroide amostrado do skfuzzy converge para o contínuo
+    fine = np.linspace(0, 1, 20001)
+    terms = [getattr(fuzz, kind)(fine, params) for kind, params in SHAPES]
+
+    expected = []
+    for row in range(cuts.shape[1]):
+        aggregated = np.zeros_like(fine)
+        for term, cut in zip(terms, cuts[:, row]):
+            np.fmax(aggregated, np.fmin(term, cut), out=aggregated)
+        expected.append(fuzz.defuzz(fine, aggregated, 'centroid') if aggregated.any() else np.nan)
+
+    np.testing.assert_allclose(defuzzifier.centroid(cuts), expected, atol=1e-5)
+
+
+def test_single_matches_vectorized(cuts):
+    defuzzifier = AnalyticalDefuzzifier(np.arange(0, 1.01, 0.1), SHAPES)
+
+    single = [defuzzifier.centroid_single(cuts[:, row]) for row in range(cuts.shape[1])]
+
+    np.testing.assert_allclose(single, defuzzifier.centroid(cuts), atol=1e-12)
+    assert np.isnan(defuzzifier.centroid_single([0, 0, 0]))
+
+
+def test_system_close_to_skfuzzy(system, skfuzzy_reference, fis_data):
+    sample = fis_data[INPUT_COLUMNS].head(150)
+    expected = skfuzzy_reference(sample)
+
+    system.use_analytical_defuzzification()
+
+    # A diferença vem apenas da amostragem do universo de saída pelo skfuzzy
+    np.testing.assert_allclose(system.simulate_batch(sample), expected, atol=5e-3)
+    single = [system.simulate(row) for row in sample.head(20).to_dict('records')]
+    np.testing.assert_allclose(single, expected[:20], atol=5e-3)
+
+
+@pytest.mark.parametrize('shape', [('gaussmf', [0.5, 0.1]), ('trimf', [0.5, 0.2, 1]), ('trapmf', [0, 1, 1])])
+def test_rejects_unsupported_terms(shape):
+    with pytest.raises(ValueError):
+        AnalyticalDefuzzifier(np.arange(0, 1.01, 0.1), [shape])
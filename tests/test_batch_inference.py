@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def random_inputs():
+    # Valores sem arredondamento, inclusive fora dos universos
+    rng = np.random.default_rng(2)
+    size = 500
+    return {'distance': rng.uniform(-5, 55, size), 'relative_speed': rng.uniform(-5, 60, size),
+            'permission': rng.uniform(-0.1, 1.1, size), 'road': rng.random(size), 'visibility': rng.random(size)}
+
+
+LIMITS = {'distance': (0, 50), 'relative_speed': (0, 56), 'permission': (0, 1), 'road': (0, 1), 'visibility': (0, 1)}
+
+
+def test_batch_matches_skfuzzy(system, skfuzzy_reference, random_inputs):
+    sample = {name: values[:60] for name, values in random_inputs.items()}
+    expected = skfuzzy_reference({name: np.clip(values, *LIMITS[name]) for name, values in sample.items()})
+    inside = np.logical_and.reduce([(values >= LIMITS[name][0]) & (values <= LIMITS[name][1])
+                                    for name, values in sample.items()])
+
+    np.testing.assert_allclose(system.simulate_batch(sample), expected, atol=1e-9)
+    strict = system.simulate_batch(sample, out_of_range='nan')
+    assert np.isnan(strict[~inside]).all()
+    np.testing.assert_allclose(strict[inside], expected[inside], atol=1e-9)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 65536])
+def test_chunked_entry_points_match_compute(system, random_inputs, chunk_size):
+    engine = system._batch_engine
+    expected = engine.compute(random_inputs)
+
+    memberships = engine.fuzzify(random_inputs, chunk_size=chunk_size)
+
+    assert set(memberships) == set(engine.fuzzify(random_inputs))
+    for key, values in engine.fuzzify(random_inputs).items():
+        np.testing.assert_array_equal(memberships[key], values)
+    np.testing.assert_allclose(engine.compute_fuzzified(memberships, chunk_size=chunk_size), expected, atol=1e-12)
+    np.testing.assert_allclose(engine.compute(random_inputs, chunk_size=chunk_size), expected, atol=1e-12)
+
+
+def test_nan_rows(system, random_inputs):
+    random_inputs['road'][[3, 10]] = np.nan
+
+    decisions = system.simulate_batch(random_inputs)
+
+    assert np.isnan(decisions[[3, 10]]).all()
+    assert np.isfinite(np.delete(decisions, [3, 10])).all()
@@ -0,0 +1,28 @@
+import pandas as pd
+import pytest
+from src.benchmark_suite import BenchmarkSuite
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    # Poucas linhas dos CSVs de referência, para que a referência do skfuzzy seja rápida
+    pd.read_csv('data/dados_de_teste_nao_balanceados_menor.csv').head(60).to_csv(tmp_path / 'data.csv', index=False)
+    return str(tmp_path)
+
+
+def test_fast_paths_match_skfuzzy(data_dir):
+    checks = BenchmarkSuite(sizes=(100,), repeat=1, data_dir=data_dir).check_fast_paths()
+
+    assert set(checks) == set(BenchmarkSuite.TOLERANCES)
+    assert {name: check['passed'] for name, check in checks.items()} == dict.fromkeys(checks, True)
+
+
+def test_compare_reports_regressions():
+    baseline = {'benchmarks': {'simulate_batch_1000': {'seconds': 1.0}, 'evaluate_1000': {'seconds': 1.0}}}
+    results = {'benchmarks': {'simulate_batch_1000': {'seconds': 1.5}, 'evaluate_1000': {'seconds': 1.1},
+                              'inference_model_1000': {'seconds': 9.0}}}
+
+    regressions = BenchmarkSuite.compare(results, baseline, threshold=0.2)
+
+    assert [regression['benchmark'] for regression in regressions] == ['simulate_batch_1000']
+    assert regressions[0]['change'] == pytest.approx(0.5)
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src import data_generator
+from src.columnar_dataset import open_columnar, write_columnar
+
+
+def chunks_of(frame, size):
+    return (frame.iloc[start:start + size] for start in range(0, len(frame), size))
+
+
+def test_round_trip_keeps_decisions(system, skfuzzy_reference, fis_data, tmp_path):
+    csv_path = tmp_path / 'dados.csv'
+    fis_data.to_csv(csv_path, index=False)
+    generator = data_generator.TestDataGenerator(csv_path=csv_path)
+    expected = generator.load_and_process_data()
+
+    manifest = generator.convert_to_columnar(tmp_path / 'colunar', chunk_size=300)
+    loaded = data_generator.TestDataGenerator().load_columnar(tmp_path / 'colunar')
+
+    assert manifest['rows'] == len(fis_data)
+    assert list(loaded.columns) == list(expected.columns)
+    assert loaded['target'].dtype == np.uint8
+    np.testing.assert_allclose(loaded.drop(columns='target'), expected.drop(columns='target'), atol=1e-5)
+    np.testing.assert_array_equal(loaded['target'], expected['target'])
+    decisions = system.simulate_batch(loaded)
+    np.testing.assert_allclose(decisions, system.simulate_batch(expected), atol=1e-5)
+    np.testing.assert_allclose(decisions[:20], skfuzzy_reference(loaded.iloc[:20]), atol=1e-9)
+
+
+def test_wide_integers_and_timestamps_keep_their_values(tmp_path):
+    frame = pd.DataFrame({
+        'current_timestamp': np.array([1_700_000_000_123, 2**40 + 5, 7], dtype=np.int64),
+        'next_timestamp': np.array([1_700_000_000.125, 1_700_000_001.5, 2.25]),
+        'count': np.array([1, 2, 2**40 + 5], dtype=np.int64),
+        'small': np.array([1, 2, 3], dtype=np.int64)
+    })
+
+    manifest = write_columnar(chunks_of(frame, 2), tmp_path / 'colunar')
+    _, arrays = open_columnar(tmp_path / 'colunar')
+
+    assert manifest['columns'] == {'current_timestamp': '<i8', 'next_timestamp': '<f8', 'count': '<i8', 'small': '<i4'}
+    for name, column in frame.items():
+        np.testing.assert_array_equal(arrays[name], column.to_numpy())
+
+
+def test_invalid_target_and_columns_are_rejected(tmp_path):
+    with pytest.raises(ValueError, match='uint8'):
+        write_columnar([pd.DataFrame({'target': [0, 300]})], tmp_path / 'a')
+    with pytest.raises(ValueError, match='mesmas colunas'):
+        write_columnar([pd.DataFrame({'a': [1.0]}), pd.DataFrame({'b': [1.0]})], tmp_path / 'b')
+    with pytest.raises(KeyError):
+        write_columnar([pd.DataFrame({'a': [1.0]})], tmp_path / 'c')
+        open_columnar(tmp_path / 'c', ['b'])
+    assert not (tmp_path / 'a').exists()
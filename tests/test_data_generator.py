@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src import data_generator
+
+GENERATORS = ['generate_data_for_fis', 'generate_complete_vehicle_data', 'generate_simple_vehicle_data']
+
+
+@pytest.mark.parametrize('method', GENERATORS)
+def test_seed_reproducible(method):
+    first = getattr(data_generator.TestDataGenerator(quantity=500, seed=3), method)()
+    second = getattr(data_generator.TestDataGenerator(quantity=500, seed=3), method)()
+    other = getattr(data_generator.TestDataGenerator(quantity=500, seed=4), method)()
+
+    pd.testing.assert_frame_equal(first, second)
+    assert not first.equals(other)
+
+
+def test_fis_data_ranges_and_target():
+    data = data_generator.TestDataGenerator(quantity=5000, seed=0).generate_data_for_fis()
+
+    assert data['distance'].between(1, 50).all() and data['relative_speed'].between(1, 56).all()
+    assert data[['permission', 'road', 'visibility']].stack().between(0, 1).all()
+    assert data['target'].dtype == np.int8 and set(data['target']) == {0, 1}
+    # O target só é 1 com permissão, pista e visibilidade favoráveis (antes do arredondamento)
+    assert (data.loc[data['target'] == 1, ['permission', 'road', 'visibility']] >= 0.5).all().all()
+
+
+def test_complete_vehicle_timestamps():
+    data = data_generator.TestDataGenerator(quantity=1000, seed=0).generate_complete_vehicle_data()
+    step = data['next_timestamp'] - data['current_timestamp']
+
+    assert step.between(1, 5).all()
+    np.testing.assert_allclose(data['relative_speed'], data['speed'] - data['front_speed'], atol=0.02)
+
+
+def test_safe_distance_matches_row_wise():
+    rng = np.random.default_rng(9)
+    distance = np.round(rng.uniform(1, 50, 3000), 2)
+    speed_kmh = np.round(rng.uniform(10, 30, 3000), 2) * 3.6
+    # Valores exatamente sobre a distância segura e metades da última casa
+    distance[:3], speed_kmh[:3] = [12.5, 10.0, 0.125], [40.0, 32.0, 0.4]
+    generator = data_generator.TestDataGenerator()
+
+    expected = [generator._calculate_front_vehicle_speed_from_safe_distance(d, s) for d, s in zip(distance, speed_kmh)]
+
+    np.testing.assert_array_equal(data_generator.TestDataGenerator._front_vehicle_speed_from_safe_distance(distance, speed_kmh), expected)
+
+
+@pytest.mark.parametrize('method', GENERATORS)
+def test_processed_csv(tmp_path, method):
+    generated = getattr(data_generator.TestDataGenerator(quantity=1000, seed=2), method)()
+    path = tmp_path / 'data.csv'
+    generated.to_csv(path, index=False)
+
+    data = data_generator.TestDataGenerator(csv_path=str(path)).load_and_process_data()
+
+    assert {'distance', 'relative_speed', 'permission', 'road', 'visibility'} <= set(data.columns)
+    if method == 'generate_complete_vehicle_data':
+        front_speed = (generated['initial_distance'] - generated['final_distance']) / (generated['next_timestamp'] - generated['current_timestamp'])
+        np.testing.assert_allclose(data['relative_speed'], generated['speed'] - front_speed, atol=1e-5)
+        np.testing.assert_allclose(data['distance'], generated['final_distance'], atol=1e-5)
+    elif method == 'generate_simple_vehicle_data':
+        speed = data['speed'].to_numpy()
+        front_speed = np.where(data['distance'] < 5 * speed * 3.6 / 16, data['distance'] * 16 / 5, speed * 3.6)
+        np.testing.assert_allclose(data['relative_speed'], speed - front_speed / 3.6, atol=0.01)
+    else:
+        np.testing.assert_allclose(data[generated.columns], generated, atol=1e-5)
+    chunks = pd.concat(data_generator.TestDataGenerator(csv_path=str(path)).iter_processed_chunks(chunk_size=300), ignore_index=True)
+    pd.testing.assert_frame_equal(chunks, data)
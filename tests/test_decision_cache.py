@@ -0,0 +1,70 @@
+import math
+import numpy as np
+import pytest
+import skfuzzy as fuzz
+from src.decision_cache import DecisionCache
+from src.vehicle_over_system import VehicleOvertakeSystem
+from conftest import INPUT_COLUMNS
+
+
+def test_cached_decisions_match_skfuzzy(system, skfuzzy_reference, fis_data):
+    # Os dados têm 2 casas decimais: quantizar no passo 0.01 só remove o erro de representação
+    rows = fis_data.iloc[:30].to_dict('records')
+    uncached = [system.simulate(row) for row in rows]
+    system.enable_cache(step=0.01)
+
+    first = [system.simulate(row) for row in rows]
+    second = [system.simulate(row) for row in rows]
+
+    np.testing.assert_allclose(first, skfuzzy_reference(fis_data.iloc[:30]), atol=1e-6)
+    np.testing.assert_allclose(first, uncached, atol=1e-6)
+    assert first == second
+    assert system.cache_stats['hits'] == 30
+    assert system.cache_stats['misses'] == 30
+
+
+@pytest.mark.parametrize('value', [math.nan, math.inf, -math.inf])
+def test_non_finite_inputs_bypass_cache(system, value):
+    row = {'distance': 10.0, 'relative_speed': 30.0, 'permission': 1.0, 'road': 1.0, 'visibility': 1.0}
+    row['distance'] = value
+    expected = system.simulate(row)
+    system.enable_cache()
+
+    decision = system.simulate(row)
+
+    assert decision == expected or (math.isnan(decision) and math.isnan(expected))
+    assert system.cache_stats['size'] == 0
+
+
+def test_lru_eviction_and_invalidation():
+    cache = DecisionCache(INPUT_COLUMNS, max_size=2, step=0.5)
+    keys = [cache.quantize(dict.fromkeys(INPUT_COLUMNS, value))[0] for value in (1.0, 2.0, 3.0)]
+    cache.put(keys[0], 0.1)
+    cache.put(keys[1], 0.2)
+    cache.get(keys[0])
+    cache.put(keys[2], 0.3)
+
+    assert cache.get(keys[1]) == (False, None)
+    assert cache.get(keys[0]) == (True, 0.1)
+    cache.clear()
+    assert cache.stats['size'] == 0
+    assert cache.stats['evictions'] == 1
+    assert cache.stats['invalidations'] == 1
+    assert cache.quantize(dict.fromkeys(INPUT_COLUMNS, 1.24))[0] == cache.quantize(dict.fromkeys(INPUT_COLUMNS, 0.76))[0]
+
+
+def test_set_term_invalidates_cache(system, cache_dir):
+    row = {'distance': 15.0, 'relative_speed': 30.0, 'permission': 1.0, 'road': 1.0, 'visibility': 1.0}
+    mf = fuzz.trapmf(system.distance.universe, [0, 0, 8, 18])
+    system.enable_cache()
+    stale = system.simulate(row)
+
+    system.distance.set_term('pequena', mf)
+    reference = VehicleOvertakeSystem(cache_dir=cache_dir)
+    reference.set_membership_function('distance', 'pequena', mf)
+
+    assert system.simulate(row) == pytest.approx(reference.simulate(row))
+    assert system.simulate(row) != pytest.approx(stale)
+    assert system.cache_stats['invalidations'] == 1
+    with pytest.raises(TypeError):
+        system.distance.terms['pequena'] = mf
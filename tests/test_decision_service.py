@@ -0,0 +1,89 @@
+import asyncio
+import numpy as np
+import pytest
+from src.decision_service import LoadGenerator, OvertakeDecisionService
+
+FRAMES = [
+    {'vehicle_id': 1, 'current_timestamp': 0, 'next_timestamp': 2, 'initial_distance': 40.0, 'final_distance': 30.0,
+     'speed': 25.0, 'permission': 0.9, 'road': 0.8, 'visibility': 0.7},
+    {'vehicle_id': 2, 'current_timestamp': 0, 'next_timestamp': 1, 'initial_distance': 12.0, 'final_distance': 10.0,
+     'speed': 8.0, 'permission': 0.2, 'road': 0.5, 'visibility': 0.4},
+    # Sem 'current_timestamp' e 'initial_distance': usa a última observação do veículo 1 (t=2, 30 m)
+    {'vehicle_id': 1, 'next_timestamp': 4, 'final_distance': 26.0, 'speed': 22.0, 'permission': 0.6,
+     'road': 0.9, 'visibility': 0.9}
+]
+
+
+def decide(service, frames):
+    async def run():
+        await service.start()
+        try:
+            return await asyncio.gather(*(service.submit(frame) for frame in frames))
+        finally:
+            await service.stop()
+
+    return asyncio.run(run())
+
+
+def test_decisions_match_skfuzzy(system, skfuzzy_reference):
+    expected = skfuzzy_reference({
+        'distance': [30.0, 10.0, 26.0],
+        'relative_speed': [25.0 - 5.0, 8.0 - 2.0, 22.0 - 2.0],
+        'permission': [0.9, 0.2, 0.6], 'road': [0.8, 0.5, 0.9], 'visibility': [0.7, 0.4, 0.9]
+    })
+    service = OvertakeDecisionService(system, max_batch_size=2)
+
+    decisions = decide(service, FRAMES)
+
+    np.testing.assert_allclose(decisions, expected, atol=1e-9)
+    assert service.stats['frames'] == 3 and service.stats['batches'] == 2
+    assert service.stats['tracked_vehicles'] == 2
+
+
+def test_load_generator(system):
+    service = OvertakeDecisionService(system)
+
+    async def run():
+        await service.start()
+        try:
+            return await LoadGenerator(vehicles=5, frames=200, seed=1).run(service)
+        finally:
+            await service.stop()
+
+    result = asyncio.run(run())
+
+    assert result['frames'] == 200 and result['service']['frames'] == 200
+    assert result['service']['tracked_vehicles'] == 5
+
+
+def test_submit_before_start(system):
+    with pytest.raises(RuntimeError):
+        asyncio.run(OvertakeDecisionService(system).submit(FRAMES[0]))
+
+
+def test_late_frames_keep_the_newest_track(system):
+    service = OvertakeDecisionService(system)
+    service._build_inputs([FRAMES[0]])
+    late = dict(FRAMES[2], next_timestamp=1, final_distance=35.0)
+
+    service._build_inputs([late])
+    inputs = service._build_inputs([FRAMES[2]])
+
+    # Continua usando a observação de t=2 e 30 m: (30 - 26) / (4 - 2) = 2 m/s
+    assert inputs['relative_speed'][0] == pytest.approx(22.0 - 2.0)
+
+
+def test_tracks_are_capped_and_expire(system, monkeypatch):
+    service = OvertakeDecisionService(system, max_tracks=2, track_ttl=10.0)
+    clock = [0.0]
+    monkeypatch.setattr('src.decision_service.time.monotonic', lambda: clock[0])
+    frames = [dict(FRAMES[0], vehicle_id=vehicle) for vehicle in range(3)]
+
+    service._build_inputs(frames)
+    assert list(service._tracks) == [1, 2]
+
+    clock[0] = 5.0
+    service._build_inputs([dict(FRAMES[0], vehicle_id=2, next_timestamp=3)])
+    clock[0] = 12.0
+    service._build_inputs([])
+    assert list(service._tracks) == [2]
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+from sklearn.metrics import accuracy_score, confusion_matrix, f1_score, precision_score, recall_score
+from src.evaluation_metrics import EvaluationMetrics, MetricsAccumulator
+
+
+@pytest.fixture
+def labelled():
+    rng = np.random.default_rng(4)
+    y_true = rng.integers(0, 2, 1000)
+    y_pred = np.clip(y_true * 0.3 + rng.random(1000) * 0.7, 0, 1)
+    y_pred[:5] = np.nan
+    return y_true, y_pred
+
+
+def test_blocks_match_sklearn(labelled):
+    y_true, y_pred = labelled
+    binary = np.nan_to_num(y_pred, nan=0.0) >= 0.5
+    accumulator = MetricsAccumulator()
+    for start in range(0, len(y_true), 128):
+        accumulator.update(y_true[start:start + 128], y_pred[start:start + 128])
+
+    cm, accuracy, precision, recall, f1 = accumulator.metrics()
+
+    np.testing.assert_array_equal(cm, confusion_matrix(y_true, binary))
+    assert accuracy == pytest.approx(accuracy_score(y_true, binary))
+    assert precision == pytest.approx(precision_score(y_true, binary))
+    assert recall == pytest.approx(recall_score(y_true, binary))
+    assert f1 == pytest.approx(f1_score(y_true, binary))
+
+
+def test_threshold_sweep_matches_fixed_thresholds(labelled):
+    y_true, y_pred = labelled
+    sweep = EvaluationMetrics(y_true, y_pred).threshold_sweep()
+
+    for index in (0, len(sweep['thresholds']) // 2, len(sweep['thresholds']) - 1):
+        accumulator = MetricsAccumulator(threshold=sweep['thresholds'][index], keep_scores=False)
+        accumulator.update(y_true, y_pred)
+        assert sweep['f1'][index] == pytest.approx(accumulator.metrics()[4])
+        assert sweep['accuracy'][index] == pytest.approx(accumulator.metrics()[1])
+
+
+@pytest.mark.parametrize('y_true', [[0, 1, 2], [0, 1, -1], [0.0, 0.5, 1.0], [0.0, np.nan, 1.0]])
+def test_invalid_labels_are_rejected(y_true):
+    with pytest.raises(ValueError, match='0 e 1'):
+        MetricsAccumulator().update(y_true, [0.2, 0.4, 0.9])
+
+
+def test_boolean_labels_are_accepted():
+    accumulator = MetricsAccumulator()
+    accumulator.update(np.array([True, False]), [0.9, 0.1])
+
+    np.testing.assert_array_equal(accumulator.confusion_matrix(), [[1, 0], [0, 1]])
+
+
+def test_plot_does_not_block_by_default(labelled, monkeypatch, tmp_path):
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    calls = []
+    monkeypatch.setattr(plt, 'show', lambda **kwargs: calls.append(kwargs))
+    evaluation = EvaluationMetrics(*labelled)
+
+    evaluation.evaluate()
+    evaluation.evaluate(save_path=tmp_path / 'cm.png')
+    plt.close('all')
+
+    assert calls == [{'block': False}]
+    assert (tmp_path / 'cm.png').exists()
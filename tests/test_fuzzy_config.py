@@ -0,0 +1,70 @@
+import json
+import numpy as np
+import pytest
+from src.fuzzy_config import CompiledRuleBase, DEFAULT_CONFIG, load_config
+from src.inference import InferenceModel
+from src.vehicle_over_system import VehicleOvertakeSystem
+
+
+def write_config(path, **output):
+    config = load_config(DEFAULT_CONFIG)
+    config['output'].update(output)
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(config, file)
+    return str(path)
+
+
+def test_compiled_system_matches_skfuzzy(system, skfuzzy_reference, fis_data):
+    sample = fis_data.iloc[:40]
+    np.testing.assert_allclose(system.simulate_batch(sample), skfuzzy_reference(sample), atol=1e-9)
+
+
+def test_cache_is_reused(tmp_path):
+    first = CompiledRuleBase.load(cache_dir=str(tmp_path))
+    second = CompiledRuleBase.load(cache_dir=str(tmp_path))
+
+    assert first.config_id == second.config_id
+    assert [entry.name for entry in tmp_path.iterdir()] == [first.config_id]
+    assert isinstance(second.arrays['rule_terms'], np.memmap)
+
+
+@pytest.mark.parametrize('loader', [
+    lambda path, cache: VehicleOvertakeSystem(path, cache),
+    lambda path, cache: InferenceModel.from_config(path, cache),
+    lambda path, cache: CompiledRuleBase.load(path, cache)
+])
+def test_non_centroid_defuzzification_is_rejected(loader, tmp_path):
+    config_path = write_config(tmp_path / 'mom.json', defuzzify='mom')
+
+    with pytest.raises(ValueError, match='centroid'):
+        loader(config_path, str(tmp_path / 'cache'))
+
+
+@pytest.mark.parametrize('condition, message', [
+    ({'all': [{'road': 'livre'}, {'not': {'road': 'livre'}}]}, 'repetido'),
+    ({'any': [{'road': 'livre'}, {'road': 'livre'}]}, 'repetido'),
+    ({'all': [{'road': 'livre'}, {'any': [{'visibility': 'boa'}, {'permission': 'permitido'}]}]}, 'não suportada'),
+    ({'all': [{'road': 'livre'}], 'any': [{'visibility': 'boa'}]}, 'não suportada'),
+    ({'not': {'all': [{'road': 'livre'}]}}, 'não suportada')
+])
+def test_invalid_rule_conditions_are_rejected(condition, message, tmp_path):
+    config = load_config(DEFAULT_CONFIG)
+    config['rules'][0]['if'] = condition
+    config_path = tmp_path / 'regras.json'
+    config_path.write_text(json.dumps(config), encoding='utf-8')
+
+    with pytest.raises(ValueError, match=message):
+        CompiledRuleBase.load(str(config_path), str(tmp_path / 'cache'))
+
+
+@pytest.mark.parametrize('name', ['simulate', 'recompile', '_cache', 'overtake_decision'])
+def test_variable_names_cannot_shadow_the_system(name, tmp_path):
+    config = load_config(DEFAULT_CONFIG)
+    config['inputs'] = {(name if variable == 'road' else variable): value for variable, value in config['inputs'].items()}
+    for rule in config['rules']:
+        rule['if'] = json.loads(json.dumps(rule['if']).replace('"road"', json.dumps(name)))
+    config_path = tmp_path / 'nomes.json'
+    config_path.write_text(json.dumps(config), encoding='utf-8')
+
+    with pytest.raises(ValueError, match='atributo'):
+        VehicleOvertakeSystem(str(config_path), str(tmp_path / 'cache'))
@@ -0,0 +1,40 @@
+import pickle
+import subprocess
+import sys
+import numpy as np
+from conftest import INPUT_COLUMNS
+from src.inference import InferenceModel
+
+
+def test_from_config_matches_skfuzzy(cache_dir, skfuzzy_reference, fis_data):
+    sample = fis_data[INPUT_COLUMNS].head(150)
+    model = InferenceModel.from_config(cache_dir=cache_dir)
+
+    expected = skfuzzy_reference(sample)
+
+    np.testing.assert_allclose(model.simulate_batch(sample), expected, atol=1e-9)
+    assert model.simulate(sample.iloc[0].to_dict()) == model.simulate_batch(sample.head(1))[0]
+
+
+def test_pickle_save_and_load(system, cache_dir, fis_data, tmp_path):
+    sample = fis_data[INPUT_COLUMNS]
+    model = InferenceModel.from_config(cache_dir=cache_dir)
+    expected = model.simulate_batch(sample)
+
+    # O modelo da configuração é serializado só pela referência; o salvo leva as matrizes
+    assert len(pickle.dumps(model)) < 1000
+    np.testing.assert_array_equal(pickle.loads(pickle.dumps(model)).simulate_batch(sample), expected)
+    model.save(tmp_path / 'model.pkl')
+    np.testing.assert_array_equal(InferenceModel.load(tmp_path / 'model.pkl').simulate_batch(sample), expected)
+    np.testing.assert_array_equal(system.to_inference_model().simulate_batch(sample), expected)
+
+
+def test_loading_skips_heavy_imports(cache_dir):
+    InferenceModel.from_config(cache_dir=cache_dir)  # garante o cache compilado
+    code = ("import sys; from src.inference import InferenceModel; "
+            f"InferenceModel.from_config(cache_dir={cache_dir!r}).simulate({{name: 0.5 for name in {INPUT_COLUMNS!r}}}); "
+            "print(sorted({'skfuzzy.control', 'pandas', 'matplotlib'} & set(sys.modules)))")
+
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip() == '[]'
@@ -0,0 +1,49 @@
+import numpy as np
+from src.inference_profiler import InferenceProfiler
+
+
+def test_profiling_does_not_change_decisions(system, skfuzzy_reference, fis_data):
+    sample = fis_data.iloc[:30]
+    rows = sample.to_dict('records')
+    expected = skfuzzy_reference(sample)
+    assert system.profile_stats is None
+
+    system.enable_profiling()
+    profiled = [system.simulate(row) for row in rows]
+    system.disable_profiling()
+    plain = [system.simulate(row) for row in rows]
+
+    np.testing.assert_allclose(profiled, expected, atol=1e-9)
+    assert profiled == plain
+    assert system.profile_stats is None
+
+
+def test_single_and_batch_firings_agree(system, fis_data):
+    sample = fis_data.iloc[:200]
+    single = system.enable_profiling()
+    for row in sample.to_dict('records'):
+        system.simulate(row)
+    single_stats = single.snapshot()
+
+    batch = system.enable_profiling()
+    system.simulate_batch(sample)
+    batch_stats = batch.snapshot()
+
+    assert single_stats['calls'] == 200 and batch_stats['calls'] == 1
+    assert single_stats['rows'] == batch_stats['rows'] == 200
+    for single_rule, batch_rule in zip(single_stats['rules'], batch_stats['rules']):
+        assert single_rule['fired'] == batch_rule['fired']
+        assert np.isclose(single_rule['max_strength'], batch_rule['max_strength'])
+    assert all(stage['seconds'] >= 0 for stage in batch_stats['stages'].values())
+
+
+def test_record_and_reset():
+    profiler = InferenceProfiler(['r1', 'r2'])
+    profiler.record({'fuzzification': 1.0}, [np.array([0.0, 0.5]), np.array([np.nan, 1.0])], rows=2)
+
+    snapshot = profiler.snapshot()
+    assert [rule['fired'] for rule in snapshot['rules']] == [1, 1]
+    assert snapshot['rules'][0]['mean_strength'] == 0.5
+    assert snapshot['dominant_stage'] == 'fuzzification'
+    profiler.reset()
+    assert profiler.snapshot()['never_fired'] == [1, 2]
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+from src.lookup_table import DecisionLookupTable
+
+# Grade reduzida para manter os testes rápidos
+GRID = {'distance': (0, 50, 11), 'relative_speed': (0, 56, 8), 'permission': (0, 1, 3), 'road': (0, 1, 3), 'visibility': (0, 1, 3)}
+
+
+@pytest.fixture
+def table(system):
+    return DecisionLookupTable.build(system, grid=GRID)
+
+
+def test_grid_points_match_skfuzzy(table, skfuzzy_reference):
+    axes = [np.linspace(*GRID[name]) for name in table.input_names]
+    rng = np.random.default_rng(0)
+    points = {name: axis[rng.integers(0, len(axis), 20)] for name, axis in zip(table.input_names, axes)}
+
+    np.testing.assert_allclose(table.lookup_batch(points), skfuzzy_reference(points), atol=1e-6)
+
+
+def test_single_lookup_matches_batch(table):
+    rng = np.random.default_rng(1)
+    rows = {'distance': rng.uniform(-5, 55, 200), 'relative_speed': rng.uniform(0, 60, 200),
+            'permission': rng.random(200), 'road': rng.random(200), 'visibility': rng.random(200)}
+    rows['distance'][0] = np.nan
+
+    single = [table.lookup({name: values[row] for name, values in rows.items()}) for row in range(200)]
+
+    np.testing.assert_allclose(single, table.lookup_batch(rows), atol=1e-12)
+    assert np.isnan(single[0])
+
+
+def test_out_of_range_nan_matches_batch_engine(system, table):
+    rng = np.random.default_rng(2)
+    rows = {'distance': rng.uniform(-5, 55, 200), 'relative_speed': rng.uniform(-4, 60, 200),
+            'permission': rng.random(200), 'road': rng.random(200), 'visibility': rng.random(200)}
+    expected = np.isnan(system.simulate_batch(rows, out_of_range='nan'))
+
+    batch = table.lookup_batch(rows, out_of_range='nan')
+    single = [table.lookup({name: values[row] for name, values in rows.items()}, out_of_range='nan')
+              for row in range(200)]
+
+    assert expected.any()
+    np.testing.assert_array_equal(np.isnan(batch), expected)
+    np.testing.assert_allclose(single, batch, atol=1e-12)
+    np.testing.assert_allclose(batch[~expected], table.lookup_batch(rows)[~expected])
+    system.use_lookup_table(table)
+    np.testing.assert_array_equal(system.simulate_batch(rows, out_of_range='nan'), batch)
+    with pytest.raises(ValueError):
+        table.lookup_batch(rows, out_of_range='wrap')
+
+
+def test_save_and_load(table, tmp_path):
+    path = tmp_path / 'tabela.npz'
+    table.save(path)
+    loaded = DecisionLookupTable.load(path)
+
+    assert loaded.input_names == table.input_names
+    np.testing.assert_array_equal(loaded.table, table.table)
+
+
+def test_error_report_uses_exact_reference(system, table, fis_data, tmp_path):
+    csv_path = tmp_path / 'dados.csv'
+    fis_data.to_csv(csv_path, index=False)
+    expected = np.abs(table.lookup_batch(fis_data) - system.simulate_batch(fis_data)).max()
+
+    system.use_lookup_table(table)
+    system.use_analytical_defuzzification()
+    report = table.error_report(system, [csv_path])
+
+    assert report['total']['rows'] == len(fis_data)
+    assert report['total']['max_error'] > 0
+    assert report['total']['max_error'] == pytest.approx(expected, abs=1e-6)
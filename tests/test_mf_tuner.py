@@ -0,0 +1,61 @@
+import json
+import numpy as np
+import pytest
+from conftest import INPUT_COLUMNS
+from src.evaluation_metrics import EvaluationMetrics
+from src.mf_tuner import MembershipTuner
+from src.vehicle_over_system import VehicleOvertakeSystem
+
+OPTIONS = {'population': 4, 'max_generations': 3, 'patience': 2, 'seed': 1}
+
+
+@pytest.fixture
+def data(fis_data):
+    return fis_data.head(400)
+
+
+def f1_score(data, decisions):
+    return EvaluationMetrics(data['target'], decisions).evaluate(plot=False)[4]
+
+
+def test_baseline_and_exported_config(cache_dir, skfuzzy_reference, data, tmp_path):
+    tuner = MembershipTuner(cache_dir=cache_dir, workers=1, **OPTIONS)
+
+    result = tuner.tune(data)
+    tuner.export_config(tmp_path / 'tuned.json')
+
+    assert result['baseline_f1'] == pytest.approx(f1_score(data, skfuzzy_reference(data[INPUT_COLUMNS])))
+    assert result['f1'] >= result['baseline_f1']
+    assert result['evaluations'] == 1 + OPTIONS['population'] * result['generations']
+    config = json.loads((tmp_path / 'tuned.json').read_text(encoding='utf-8'))
+    for name, terms in result['params'].items():
+        for label, shape in terms.items():
+            assert config['inputs'][name]['terms'][label] == shape
+    # A configuração exportada reproduz o F1-score encontrado na busca
+    tuned = VehicleOvertakeSystem(config_path=str(tmp_path / 'tuned.json'), cache_dir=cache_dir)
+    assert f1_score(data, tuned.simulate_batch(data[INPUT_COLUMNS])) == pytest.approx(result['f1'])
+
+
+def test_parallel_matches_serial(cache_dir, data):
+    serial = MembershipTuner(cache_dir=cache_dir, workers=1, **OPTIONS).tune(data)
+    parallel = MembershipTuner(cache_dir=cache_dir, workers=2, **OPTIONS).tune(data)
+
+    for key in ('f1', 'baseline_f1', 'params', 'history', 'evaluations'):
+        assert parallel[key] == serial[key]
+
+
+def test_rejects_unknown_terms(cache_dir):
+    with pytest.raises(ValueError):
+        MembershipTuner(cache_dir=cache_dir, terms=[('distance', 'inexistente')])
+
+
+def test_only_original_shoulders_stay_fixed(cache_dir):
+    tuner = MembershipTuner(cache_dir=cache_dir, terms=[('distance', 'pequena'), ('distance', 'media')], seed=2)
+    # 'media' ([15, 25, 35]) com o primeiro vértice levado ao extremo por uma mutação anterior
+    params = {('distance', 'pequena'): ('trapmf', [0.0, 0.0, 10.0, 20.0]),
+              ('distance', 'media'): ('trimf', [0.0, 25.0, 35.0])}
+
+    mutations = [tuner._mutate(params, 0.2) for _ in range(50)]
+
+    assert all(mutation[('distance', 'pequena')][1][:2] == [0.0, 0.0] for mutation in mutations)
+    assert any(mutation[('distance', 'media')][1][0] > 0 for mutation in mutations)
@@ -0,0 +1,37 @@
+import json
+import numpy as np
+from src.fuzzy_config import DEFAULT_CONFIG, load_config
+from src.parallel_runner import ParallelEvaluationRunner
+from src.vehicle_over_system import VehicleOvertakeSystem
+
+
+def test_default_model_matches_system(system, fis_data, cache_dir):
+    runner = ParallelEvaluationRunner(workers=2, chunk_size=500, cache_dir=cache_dir)
+
+    np.testing.assert_allclose(runner.run(fis_data), system.simulate_batch(fis_data), atol=1e-9)
+    assert runner.last_run['chunks'] == 4
+
+
+def test_custom_config_reaches_workers(fis_data, tmp_path):
+    config = load_config(DEFAULT_CONFIG)
+    config['inputs']['distance']['terms']['pequena'] = ['trapmf', [0, 0, 15, 30]]
+    config_path = tmp_path / 'ajustada.json'
+    config_path.write_text(json.dumps(config), encoding='utf-8')
+    cache_dir = str(tmp_path / 'cache')
+    expected = VehicleOvertakeSystem(str(config_path), cache_dir).simulate_batch(fis_data)
+
+    runner = ParallelEvaluationRunner(workers=2, chunk_size=500, config_path=str(config_path), cache_dir=cache_dir)
+
+    np.testing.assert_allclose(runner.run(fis_data), expected, atol=1e-9)
+    assert not np.allclose(expected, VehicleOvertakeSystem(cache_dir=cache_dir).simulate_batch(fis_data))
+
+
+def test_analytical_and_system_models(system, fis_data, cache_dir):
+    system.use_analytical_defuzzification()
+    expected = system.simulate_batch(fis_data)
+
+    by_config = ParallelEvaluationRunner(workers=2, chunk_size=500, cache_dir=cache_dir, analytical=True)
+    by_system = ParallelEvaluationRunner(workers=2, chunk_size=500, model=system)
+
+    np.testing.assert_allclose(by_config.run(fis_data), expected, atol=1e-9)
+    np.testing.assert_allclose(by_system.run(fis_data), expected, atol=1e-9)
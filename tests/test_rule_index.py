@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+from skfuzzy import control as ctrl
+from conftest import INPUT_COLUMNS
+from src.rule_index import RuleIndex
+
+
+@pytest.fixture
+def rows():
+    # Inclui valores exatamente sobre os vértices dos termos, onde as ativações valem zero
+    rng = np.random.default_rng(4)
+    rows = {'distance': rng.uniform(0, 50, 150), 'relative_speed': rng.uniform(0, 56, 150),
+            'permission': rng.random(150), 'road': rng.random(150), 'visibility': rng.random(150)}
+    for name in INPUT_COLUMNS:
+        rows[name][:30] = np.round(rows[name][:30], 0 if name in ('distance', 'relative_speed') else 1)
+    return rows
+
+
+def test_active_rules_cover_skfuzzy_firings(system, rows):
+    rules = system.create_rules()
+    simulation = ctrl.ControlSystemSimulation(ctrl.ControlSystem(rules))
+    index = system.rule_index
+
+    for row in range(150):
+        inputs = {name: values[row] for name, values in rows.items()}
+        for name, value in inputs.items():
+            simulation.input[name] = value
+        simulation.compute()
+        fired = {position for position, rule in enumerate(rules) if rule.aggregate_firing[simulation] > 0}
+
+        assert fired <= set(index.active_rules(inputs))
+
+
+def test_indexed_simulate_matches_skfuzzy(system, skfuzzy_reference, rows):
+    single = [system.simulate({name: values[row] for name, values in rows.items()}) for row in range(150)]
+
+    np.testing.assert_allclose(single, skfuzzy_reference(rows), atol=1e-9)
+
+
+def test_savings(system, rows):
+    savings = system.rule_index.savings(rows)
+
+    assert savings['rows'] == 150
+    assert savings['rules'] == len(system.create_rules())
+    assert 0 < savings['min_evaluated'] <= savings['mean_evaluated'] <= savings['max_evaluated'] <= savings['rules']
+    assert sum(savings['histogram'].values()) == 150
+    assert savings['skipped_fraction'] == pytest.approx(1 - savings['mean_evaluated'] / savings['rules'])
+
+
+@pytest.mark.parametrize('limit', ['MAX_RULES', 'MAX_TABLE_SIZE'])
+def test_without_index_every_rule_is_evaluated(system, skfuzzy_reference, rows, monkeypatch, limit):
+    monkeypatch.setattr(RuleIndex, limit, 10)
+    system.recompile()
+
+    assert system.rule_index is None
+    single = [system.simulate({name: values[row] for name, values in rows.items()}) for row in range(150)]
+    np.testing.assert_allclose(single, skfuzzy_reference(rows), atol=1e-9)
+    np.testing.assert_allclose(system.simulate_batch(rows), single, atol=1e-9)
@@ -0,0 +1,62 @@
+import logging
+import math
+import threading
+import numpy as np
+from skfuzzy import control as ctrl
+from src.simulation_pool import SimulationPool
+
+
+def test_indexed_rules_follow_the_given_order(system):
+    rules = system.create_rules()
+    reordered = rules[::-1]
+
+    pool = SimulationPool(ctrl.ControlSystem(rules), reordered)
+
+    indexed = pool.indexed_rules()
+    assert [str(rule) for rule in indexed] == [str(rule) for rule in reordered]
+    assert not set(map(id, indexed)) & set(map(id, rules))
+    _, computation_order, _ = pool.structure()
+    assert {id(rule) for rule in computation_order} == {id(rule) for rule in indexed}
+
+
+def test_simulate_matches_skfuzzy_across_threads(system, skfuzzy_reference, fis_data):
+    sample = fis_data.iloc[:40]
+    rows = sample.to_dict('records')
+    expected = skfuzzy_reference(sample)
+    results = {}
+
+    def worker(offset):
+        results[offset] = [system.simulate(row) for row in rows[offset:] + rows[:offset]]
+
+    threads = [threading.Thread(target=worker, args=(offset,)) for offset in (0, 13, 27)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for offset, decisions in results.items():
+        np.testing.assert_allclose(decisions, np.roll(expected, -offset), atol=1e-9)
+    assert system._simulation_pool.size == 3
+
+
+def test_unvalidated_skfuzzy_uses_public_compute(system, skfuzzy_reference, fis_data, monkeypatch):
+    sample = fis_data.iloc[:40]
+    monkeypatch.setattr(SimulationPool, 'partial_evaluation', False)
+    monkeypatch.setattr(SimulationPool, 'fuzzify', None)
+
+    decisions = [system.simulate(row) for row in sample.to_dict('records')]
+
+    np.testing.assert_allclose(decisions, skfuzzy_reference(sample), atol=1e-9)
+
+
+def test_simulation_error_returns_nan_and_logs(system, fis_data, monkeypatch, caplog):
+    def fail(pool):
+        raise ValueError("sistema esparso")
+
+    monkeypatch.setattr(SimulationPool, 'fuzzify', fail)
+
+    with caplog.at_level(logging.WARNING, logger='src.vehicle_over_system'):
+        decision = system.simulate(fis_data.iloc[0].to_dict())
+
+    assert math.isnan(decision)
+    assert 'sistema esparso' in caplog.text
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.stratified_balancer import StratifiedBalancer
+
+
+@pytest.fixture
+def dataset():
+    rng = np.random.default_rng(5)
+    size = 3000
+    return pd.DataFrame({'target': (rng.random(size) < 0.2).astype(int), 'distance': rng.uniform(0, 50, size),
+                         'road': rng.random(size), 'row': np.arange(size)})
+
+
+def chunked(data, chunk_size):
+    return lambda: (data.iloc[start:start + chunk_size] for start in range(0, len(data), chunk_size))
+
+
+@pytest.mark.parametrize('method', StratifiedBalancer.METHODS)
+def test_counts_match_imblearn(dataset, method):
+    from imblearn.over_sampling import RandomOverSampler
+    from imblearn.under_sampling import RandomUnderSampler
+
+    sampler = RandomUnderSampler(random_state=0) if method == 'undersample' else RandomOverSampler(random_state=0)
+    _, expected = sampler.fit_resample(dataset.drop(columns='target'), dataset['target'])
+
+    balanced = StratifiedBalancer(method, seed=0).balance(chunked(dataset, 700))
+
+    assert balanced['target'].value_counts().to_dict() == expected.value_counts().to_dict()
+    assert list(balanced.columns) == ['distance', 'road', 'row', 'target']
+    # Apenas linhas da origem, sem alterar os valores
+    pd.testing.assert_frame_equal(balanced[dataset.columns], dataset.iloc[balanced['row']].reset_index(drop=True))
+    if method == 'undersample':
+        assert balanced['row'].is_unique
+    else:
+        assert set(balanced['row']) == set(dataset['row'])
+
+
+@pytest.mark.parametrize('method', StratifiedBalancer.METHODS)
+def test_same_seed_independent_of_chunk_size(dataset, method):
+    whole = StratifiedBalancer(method, seed=11).balance(chunked(dataset, len(dataset)))
+
+    for chunk_size in (1, 97, 1000):
+        pd.testing.assert_frame_equal(StratifiedBalancer(method, seed=11).balance(chunked(dataset, chunk_size)), whole)
+
+
+def test_rejects_different_second_pass(dataset):
+    balancer = StratifiedBalancer(seed=0)
+    balancer.count(chunked(dataset, 500)())
+
+    with pytest.raises(ValueError):
+        balancer.resample(chunked(dataset.head(2000), 500)())
+
+
+@pytest.mark.parametrize('method', StratifiedBalancer.METHODS)
+def test_generator_streaming_balance(method):
+    from src import data_generator
+
+    generator = data_generator.TestDataGenerator(quantity=2000, seed=7)
+    generator.generate_data_for_fis()
+
+    streaming = generator.balance_data(method, streaming=True, chunk_size=300)
+    expected = generator.balance_data(method)
+
+    assert list(streaming.columns) == list(expected.columns)
+    assert streaming['target'].value_counts().to_dict() == expected['target'].value_counts().to_dict()
+
+
+@pytest.mark.parametrize('method', StratifiedBalancer.METHODS)
+def test_column_types_are_promoted_across_chunks(dataset, method):
+    # Blocos lidos separadamente: o primeiro só tem distâncias inteiras (int64), os demais float64
+    chunks = [dataset.iloc[start:start + 700] for start in range(0, len(dataset), 700)]
+    chunks[0] = chunks[0].assign(distance=chunks[0]['distance'].round().astype('int64'))
+
+    balanced = StratifiedBalancer(method, seed=0).balance(lambda: iter(chunks))
+
+    expected = pd.concat(chunks)['distance'].astype('float64').to_numpy()
+    assert balanced['distance'].dtype == np.float64
+    np.testing.assert_array_equal(balanced['distance'].to_numpy(), expected[balanced['row'].to_numpy()])
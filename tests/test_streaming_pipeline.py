@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src import data_generator
+from src.streaming_pipeline import StreamingInferencePipeline
+from conftest import INPUT_COLUMNS
+
+
+@pytest.mark.parametrize('schema', ['generate_complete_vehicle_data', 'generate_simple_vehicle_data', 'generate_data_for_fis'])
+def test_pipeline_scores_every_schema(schema, system, skfuzzy_reference, tmp_path):
+    csv_path = tmp_path / 'entrada.csv'
+    output_path = tmp_path / 'saida.csv'
+    generator = data_generator.TestDataGenerator(quantity=1000, seed=3)
+    getattr(generator, schema)().to_csv(csv_path, index=False)
+
+    stats = StreamingInferencePipeline(system, chunk_size=300).run(csv_path, output_path)
+
+    assert stats['rows'] == 1000
+    assert stats['chunks'] == 4
+    output = pd.read_csv(output_path)
+    assert set(INPUT_COLUMNS) <= set(output.columns)
+    expected = data_generator.TestDataGenerator(csv_path=csv_path).load_and_process_data()
+    np.testing.assert_allclose(output['overtake_decision'], system.simulate_batch(expected), atol=1e-9)
+    sample = output.iloc[::50]
+    np.testing.assert_allclose(sample['overtake_decision'], skfuzzy_reference(sample), atol=1e-9)
+
+
+def test_timestamp_schema_uses_final_distance(tmp_path):
+    csv_path = tmp_path / 'entrada.csv'
+    data = data_generator.TestDataGenerator(quantity=100, seed=5).generate_complete_vehicle_data()
+    data.to_csv(csv_path, index=False)
+
+    processed = data_generator.TestDataGenerator(csv_path=csv_path).load_and_process_data()
+
+    np.testing.assert_allclose(processed['distance'], data['final_distance'], atol=1e-5)
+    assert not {'initial_distance', 'final_distance', 'current_timestamp', 'next_timestamp'} & set(processed.columns)
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+from src.inference import InferenceModel
+from src.traffic_simulator import TrafficScenarioSimulator
+
+
+@pytest.fixture(scope='module')
+def model(cache_dir):
+    return InferenceModel.from_config(cache_dir=cache_dir)
+
+
+def test_same_seed_same_run(model):
+    first = TrafficScenarioSimulator(200, system=model, seed=6)
+    second = TrafficScenarioSimulator(200, system=model, seed=6)
+
+    first.run(15)
+    second.run(15)
+
+    np.testing.assert_array_equal(first.position, second.position)
+    np.testing.assert_array_equal(first.lane, second.lane)
+    assert first.stats['overtakes'] == second.stats['overtakes']
+
+
+def test_decisions_come_from_the_controller(system, skfuzzy_reference, model):
+    simulator = TrafficScenarioSimulator(60, system=model, seed=2)
+    _, inputs, gap = simulator.controller_inputs()
+
+    assert inputs['distance'].min() >= 0 and inputs['distance'].max() <= 50
+    assert ((inputs['road'] >= 0) & (inputs['road'] <= 1)).all()
+    np.testing.assert_allclose(model.simulate_batch(inputs), skfuzzy_reference(inputs), atol=1e-9)
+    np.testing.assert_allclose(system.simulate_batch(inputs), skfuzzy_reference(inputs), atol=1e-9)
+
+
+@pytest.mark.parametrize('vehicles', [1, 2, 3])
+def test_tiny_ring(model, vehicles):
+    stats = TrafficScenarioSimulator(vehicles, system=model, seed=0).run(10)
+
+    assert stats['ticks'] == 10 and stats['vehicles'] == vehicles
+    assert stats['decisions'] <= 10 * vehicles